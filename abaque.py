@@ -0,0 +1,67 @@
+"""
+Abaques EasyCMIR en ligne de commande (sans interface graphique)
+
+Exemples :
+    python abaque.py -o abaques
+    python abaque.py -o abaques --materiau plomb --epaisseurs 0:10:50 --workers 0
+    python abaque.py -o impression --isotopes Cobalt-60 Césium-137 --activites 1e9,1e10,1e11 \\
+        --distances 1,2,5,10,20,50,100 --materiau beton --epaisseurs 0,10,20 --format csv pdf
+
+Les axes sont des listes (« 1, 2, 5 ») ou des plages « min:max:nombre »,
+géométriques pour les activités (Bq) et les distances (m), linéaires pour
+les épaisseurs (cm). Un fichier par isotope est écrit dans le dossier de sortie.
+"""
+
+import sys
+import os
+import argparse
+import multiprocessing
+import time
+
+# Ajout du chemin racine au PYTHONPATH
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.core.perimeter import PUBLIC_LIMIT_USVH
+from src.utils.abacus import WRITERS, AbacusGrid, parse_axis, run_abacus
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Abaques EasyCMIR (débit de dose et périmètre public)")
+    parser.add_argument("-o", "--sortie", required=True, help="Dossier de sortie des abaques")
+    parser.add_argument("--isotopes", nargs="+", help="Isotopes du catalogue (par défaut tous)")
+    parser.add_argument("--activites", default="1e6:1e12:100", help="Activités en Bq (défaut 1e6:1e12:100)")
+    parser.add_argument("--distances", default="0.5:1000:100", help="Distances en m (défaut 0.5:1000:100)")
+    parser.add_argument("--materiau", help="Clé du matériau d'écran (plomb, acier, beton...), sans écran par défaut")
+    parser.add_argument("--epaisseurs", default="0:10:50", help="Épaisseurs d'écran en cm (défaut 0:10:50)")
+    parser.add_argument("--limite", type=float, default=PUBLIC_LIMIT_USVH,
+                        help=f"Débit du périmètre en µSv/h (défaut {PUBLIC_LIMIT_USVH})")
+    parser.add_argument("--format", nargs="+", choices=sorted(WRITERS), default=["csv"],
+                        help="Formats écrits (défaut csv)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Nombre de processus de calcul (0 : tous les cœurs)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Point d'entrée du calcul d'abaques ; retourne le code de sortie"""
+    args = parse_arguments(argv)
+    start = time.perf_counter()
+    try:
+        grid = AbacusGrid(parse_axis(args.activites, log=True), parse_axis(args.distances, log=True),
+                          parse_axis(args.epaisseurs), args.materiau, args.limite)
+        summary = run_abacus(grid, args.sortie, args.isotopes, args.format, args.workers)
+    except (ValueError, RuntimeError, OSError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 2
+
+    print(f"{summary.isotopes} isotopes, {summary.values} débits calculés en {time.perf_counter() - start:.1f} s"
+          f" - {len(summary.files)} fichiers dans {args.sortie}", file=sys.stderr)
+    if summary.skipped:
+        print(f"Sans émission gamma, ignorés : {', '.join(summary.skipped)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    # Nécessaire aux pools de processus dans l'exécutable Windows
+    multiprocessing.freeze_support()
+    sys.exit(main())
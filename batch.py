@@ -0,0 +1,78 @@
+"""
+Calcul par lot EasyCMIR en ligne de commande (sans interface graphique)
+
+Exemples :
+    python batch.py tables.csv -o tables_resultats.csv
+    python batch.py historique.jsonl -o audit.jsonl --workers 4
+    python batch.py - --format csv --calcul tmr < colis.csv > colis_tmr.csv
+
+Chaque ligne indique son calcul dans la colonne « calcul » (decroissance,
+ded1m, distance, perimetre, ecran, tmr) ou reçoit celui de --calcul.
+"""
+
+import sys
+import os
+import argparse
+import multiprocessing
+import time
+
+# Ajout du chemin racine au PYTHONPATH
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.batch import CALCULATIONS, DEFAULT_CHUNK_SIZE, format_of, run_batch
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Calcul par lot EasyCMIR (CSV ou JSON Lines)")
+    parser.add_argument("entree", help="Fichier d'entrée CSV, JSONL ou tableau JSON (« - » pour l'entrée standard)")
+    parser.add_argument("-o", "--sortie", default="-", help="Fichier de sortie (par défaut la sortie standard)")
+    parser.add_argument("--format", choices=("csv", "jsonl"),
+                        help="Format d'entrée et de sortie (par défaut selon l'extension)")
+    parser.add_argument("--calcul", choices=sorted(CALCULATIONS),
+                        help="Calcul des lignes sans colonne « calcul »")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Nombre de processus de calcul (0 : tous les cœurs)")
+    parser.add_argument("--bloc", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Lignes calculées par bloc (défaut {DEFAULT_CHUNK_SIZE})")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Point d'entrée du calcul par lot ; retourne le code de sortie"""
+    args = parse_arguments(argv)
+    input_format = args.format or (format_of(args.entree) if args.entree != "-" else "csv")
+
+    if args.entree != "-" and args.sortie != "-" and os.path.abspath(args.entree) == os.path.abspath(args.sortie):
+        print("Erreur : le fichier de sortie doit être différent du fichier d'entrée", file=sys.stderr)
+        return 2
+    try:
+        source = (open(args.entree, 'r', encoding='utf-8-sig', newline='') if args.entree != "-"
+                  else sys.stdin)
+        target = (open(args.sortie, 'w', encoding='utf-8', newline='') if args.sortie != "-"
+                  else sys.stdout)
+    except OSError as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    try:
+        summary = run_batch(source, target, input_format, args.calcul, max(args.bloc, 1), args.workers)
+    except (ValueError, OSError) as e:
+        print(f"Erreur : {e}", file=sys.stderr)
+        return 2
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    counts = ", ".join(f"{name}: {count}" for name, count in sorted(summary.counts.items()))
+    print(f"{summary.records} lignes traitées en {time.perf_counter() - start:.1f} s"
+          f" ({counts or 'aucun calcul'}) - {summary.errors} erreurs", file=sys.stderr)
+    return 1 if summary.errors else 0
+
+
+if __name__ == "__main__":
+    # Nécessaire aux pools de processus dans l'exécutable Windows
+    multiprocessing.freeze_support()
+    sys.exit(main())
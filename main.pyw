@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 from time import sleep
 
 # Ajout du chemin racine au PYTHONPATH
@@ -66,4 +67,6 @@ def main():
     return app.exec()
 
 if __name__ == "__main__":
+    # Nécessaire aux pools de processus dans l'exécutable Windows
+    multiprocessing.freeze_support()
     sys.exit(main())
\ No newline at end of file
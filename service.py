@@ -0,0 +1,57 @@
+"""
+Service de calcul local EasyCMIR (HTTP/JSON, sans interface graphique)
+
+Exemples :
+    python service.py
+    python service.py --port 8765 --workers 4
+
+    curl -d '{"calcul": "perimetre", "ded1m": "250 µSv/h"}' http://127.0.0.1:8765/calcul
+"""
+
+import sys
+import os
+import argparse
+import multiprocessing
+
+# Ajout du chemin racine au PYTHONPATH
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.service import CalculationServer, DEFAULT_HOST, DEFAULT_PORT
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description="Service de calcul local EasyCMIR (HTTP/JSON)")
+    parser.add_argument("--hote", default=DEFAULT_HOST,
+                        help=f"Adresse d'écoute (défaut {DEFAULT_HOST}, accessible depuis ce poste uniquement)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port d'écoute (défaut {DEFAULT_PORT})")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processus de calcul pour les gros lots (0 : tous les cœurs)")
+    parser.add_argument("--verbose", action="store_true", help="Journalise chaque requête")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Point d'entrée du service ; retourne le code de sortie"""
+    args = parse_arguments(argv)
+    workers = args.workers or os.cpu_count() or 1
+    try:
+        server = CalculationServer((args.hote, args.port), workers=workers, verbose=args.verbose)
+    except OSError as e:
+        print(f"Erreur : impossible d'écouter sur {args.hote}:{args.port} ({e})", file=sys.stderr)
+        return 2
+
+    host, port = server.server_address[:2]
+    print(f"Service de calcul EasyCMIR sur http://{host}:{port} ({workers} processus) - Ctrl+C pour arrêter",
+          file=sys.stderr)
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    # Nécessaire aux pools de processus dans l'exécutable Windows
+    multiprocessing.freeze_support()
+    sys.exit(main())
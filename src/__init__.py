@@ -1,10 +1,20 @@
-from .utils.database import load_isotopes, save_to_history
-from .utils.widgets import (
-    ClearingDoubleSpinBox,
-    ClearingSpinBox,
-    ClearingLineEdit
-)
-from .utils.config_manager import config_manager
+from importlib import import_module
+
+# Raccourcis chargés à la demande : importer src.core ne doit pas charger Qt
+_LAZY_ATTRIBUTES = {
+    'load_isotopes': '.utils.database',
+    'save_to_history': '.utils.database',
+    'ClearingDoubleSpinBox': '.utils.widgets',
+    'ClearingSpinBox': '.utils.widgets',
+    'ClearingLineEdit': '.utils.widgets',
+    'config_manager': '.utils.config_manager',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        return getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __author__ = "Judicaël Mougin - SDIS 71"
 __license__ = "GPL 3 or Later"
@@ -12,6 +22,7 @@ __email__ = "jmougin@sdis71.fr"
 
 # Constantes globales (maintenant dynamiques via config_manager)
 def get_isotopes_file():
+    from .utils.config_manager import config_manager
     return config_manager.get_isotopes_path()
 
 HISTORY_DB_FILE = "../data/historique.txt"
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+Noyau de calcul d'EasyCMIR, indépendant de l'interface Qt.
+
+Décroissance, DED à 1 m, constante gamma, table des isotopes en colonnes,
+écrans, distance, sources étendues, périmètre public, panache gaussien,
+classification TMR et conversion d'unités.
+Les modules ne dépendent que de la bibliothèque standard et de NumPy : ils
+s'importent sans PySide6 et leurs fonctions (définies au niveau module) se
+transmettent à un pool de processus.
+"""
+
+from .decay import decay_constant, activity_at, time_to_activity
+from .ded import (
+    DED1M_FACTOR, GAMMA_CONVERSION_FACTOR, gamma_sum, ded1m, gamma_constant,
+    activity_from_dose_rate
+)
+from .distance import dose_rate_at, distance_for_dose_rate
+from .geometry import (
+    GEOMETRIES, line_dose_rate, disc_dose_rate, rectangle_dose_rate, geometry_dose_rate,
+    tabulated_dose_rate, extended_dose_rate_at
+)
+from .library import USAGE_CODES, IsotopeTable
+from .perimeter import PUBLIC_LIMIT_USVH, public_perimeter
+from .plume import (
+    STABILITY_CLASSES, dispersion_coefficients, ground_concentration, cloud_dose_rate
+)
+from .shielding import line_weights, transmission, required_thickness
+from .tmr import CATEGORIES, transport_index, classify, category_of, classify_manifest
+from .units import UnitRegistry, unit_registry
+
+__all__ = [
+    'decay_constant',
+    'activity_at',
+    'time_to_activity',
+    'DED1M_FACTOR',
+    'GAMMA_CONVERSION_FACTOR',
+    'gamma_sum',
+    'ded1m',
+    'gamma_constant',
+    'activity_from_dose_rate',
+    'dose_rate_at',
+    'distance_for_dose_rate',
+    'GEOMETRIES',
+    'line_dose_rate',
+    'disc_dose_rate',
+    'rectangle_dose_rate',
+    'geometry_dose_rate',
+    'tabulated_dose_rate',
+    'extended_dose_rate_at',
+    'USAGE_CODES',
+    'IsotopeTable',
+    'PUBLIC_LIMIT_USVH',
+    'public_perimeter',
+    'STABILITY_CLASSES',
+    'dispersion_coefficients',
+    'ground_concentration',
+    'cloud_dose_rate',
+    'line_weights',
+    'transmission',
+    'required_thickness',
+    'CATEGORIES',
+    'transport_index',
+    'classify',
+    'category_of',
+    'classify_manifest',
+    'UnitRegistry',
+    'unit_registry'
+]
@@ -0,0 +1,27 @@
+"""
+Décroissance radioactive pour EasyCMIR
+A(t) = A0 e^(-λt) avec λ = ln(2) / T. Les fonctions acceptent des scalaires
+ou des tableaux NumPy (périodes et temps en secondes) ; une période nulle
+désigne un isotope stable (pas de décroissance).
+"""
+
+import numpy as np
+
+
+def decay_constant(half_life):
+    """Constante de décroissance λ (s⁻¹) ; 0 pour une période nulle (isotope stable)"""
+    half_life = np.asarray(half_life, dtype=float)
+    with np.errstate(divide='ignore'):
+        return np.where(half_life > 0, np.log(2) / half_life, 0.0)[()]
+
+
+def activity_at(initial_activity, half_life, elapsed):
+    """Activité après ``elapsed`` secondes (même unité que ``initial_activity``)"""
+    return np.asarray(initial_activity, dtype=float) * np.exp(-decay_constant(half_life) * np.asarray(elapsed, dtype=float))
+
+
+def time_to_activity(initial_activity, half_life, target_activity):
+    """Temps (s) nécessaire pour que l'activité descende à ``target_activity``"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.log(np.asarray(initial_activity, dtype=float) / target_activity) / decay_constant(half_life)
+
@@ -0,0 +1,42 @@
+"""
+Débit de dose à 1 m et constante gamma pour EasyCMIR
+Formule générique DED 1m (mSv/h) = 1.3e-10 × A (Bq) × Σ(E × Q%) / 100 et
+constante gamma empirique Γ = 1.4e-3 × Σ(E × I%) en (µSv·h⁻¹)/(MBq·m⁻²).
+Énergies (MeV) et intensités (%) sont indexées par raie sur le dernier axe.
+"""
+
+import numpy as np
+
+# Facteur de la formule générique DED 1m (mSv/h) = 1.3e-10 × A (Bq) × Σ(E × Q)
+DED1M_FACTOR = 1.3e-10
+# Facteur empirique de la constante gamma (µSv·h⁻¹)/(MBq·m⁻²) = 1.4e-3 × Σ(E × I%)
+# (calibré sur le cobalt 60 : Γ = 0.35)
+GAMMA_CONVERSION_FACTOR = 1.4e-3
+
+
+def gamma_sum(energies, intensities):
+    """Σ(E × I%) : seules les raies d'énergie et d'intensité positives comptent"""
+    energies = np.asarray(energies, dtype=float)
+    intensities = np.asarray(intensities, dtype=float)
+    return np.where((energies > 0) & (intensities > 0), energies * intensities, 0.0).sum(axis=-1)
+
+
+def ded1m(activity_bq, energies, intensities):
+    """DED à 1 m (mSv/h) d'une source de ``activity_bq`` Bq"""
+    return DED1M_FACTOR * np.asarray(activity_bq, dtype=float) * (gamma_sum(energies, intensities) / 100)
+
+
+def gamma_constant(energies, intensities):
+    """Constante gamma (µSv·h⁻¹)/(MBq·m⁻²)"""
+    return GAMMA_CONVERSION_FACTOR * gamma_sum(energies, intensities)
+
+
+def activity_from_dose_rate(dose_rate_usvh, distance, gamma):
+    """Activité (Bq) donnant ``dose_rate_usvh`` µSv/h à ``distance`` m ; NaN sans émission gamma.
+
+    A (MBq) = D (µSv/h) × d² / Γ.
+    """
+    gamma = np.asarray(gamma, dtype=float)
+    dose_rate_1m = np.asarray(dose_rate_usvh, dtype=float) * np.asarray(distance, dtype=float) ** 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (np.where(gamma > 0, dose_rate_1m / gamma, np.nan) * 1e6)[()]
@@ -0,0 +1,18 @@
+"""
+Loi de l'inverse du carré de la distance pour EasyCMIR
+Ḋ2 = Ḋ1 × (d1 / d2)² pour une source ponctuelle ; fonctions vectorisées.
+"""
+
+import numpy as np
+
+
+def dose_rate_at(dose_rate, distance, new_distance):
+    """Débit à ``new_distance`` connaissant ``dose_rate`` à ``distance`` (même unité)"""
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        return np.asarray(dose_rate, dtype=float) * np.square(distance) / np.square(new_distance)
+
+
+def distance_for_dose_rate(dose_rate, distance, target_dose_rate):
+    """Distance à laquelle le débit descend à ``target_dose_rate`` (même unité que ``dose_rate``)"""
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        return np.asarray(distance, dtype=float) * np.sqrt(np.asarray(dose_rate, dtype=float) / target_dose_rate)
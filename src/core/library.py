@@ -0,0 +1,82 @@
+"""
+Bibliothèque d'isotopes en colonnes NumPy pour EasyCMIR
+Construite à partir d'une liste d'enregistrements isotopes (nom, activité
+massique, période, énergies, intensités, usage), elle évalue d'un bloc le DED
+à 1 m, la constante gamma et la décroissance de tous les isotopes, ainsi que
+la table « et si » d'une source non identifiée.
+"""
+
+import numpy as np
+from .decay import decay_constant, activity_at
+from .ded import DED1M_FACTOR, GAMMA_CONVERSION_FACTOR, gamma_sum, activity_from_dose_rate
+
+# Codes numériques des types d'usage pour la table en colonnes
+USAGE_CODES = {"N/A": 0, "Med": 1, "Ind": 2, "Mil": 3}
+
+
+class IsotopeTable:
+    """Version en colonnes NumPy de la bibliothèque d'isotopes.
+
+    Chaque attribut est un tableau indexé comme ``names`` ; les énergies et
+    intensités sont des tableaux (n, 3) pour les raies E1..E3 / Q1..Q3.
+    """
+
+    def __init__(self, isotopes):
+        self.names = np.array([iso.name for iso in isotopes], dtype=object)
+        self.index = {iso.name: i for i, iso in enumerate(isotopes)}
+        self.specific_activity = np.array([iso.specific_activity for iso in isotopes], dtype=float)  # Bq/g
+        self.half_life = np.array([iso.half_life for iso in isotopes], dtype=float)  # s
+        self.energies = np.array([iso.energies for iso in isotopes], dtype=float).reshape(-1, 3)  # MeV
+        self.intensities = np.array([iso.intensities for iso in isotopes], dtype=float).reshape(-1, 3)  # %
+        self.usage_code = np.array([USAGE_CODES.get(iso.usage, 0) for iso in isotopes], dtype=np.int8)
+
+        # Constante de décroissance λ = ln(2)/T (0 pour les isotopes stables, T = 0)
+        self.decay_constant = decay_constant(self.half_life)
+        # Σ(E × Q%) par isotope
+        self.gamma_sum = gamma_sum(self.energies, self.intensities)
+
+    def __len__(self):
+        return len(self.names)
+
+    def ded1m(self, activity_bq):
+        """DED à 1m (mSv/h) de tous les isotopes pour une ou plusieurs activités (Bq).
+
+        ``activity_bq`` est un scalaire ou un tableau broadcastable sur (n,) ;
+        un tableau (k, 1) donne une table (k, n).
+        """
+        return DED1M_FACTOR * np.asarray(activity_bq, dtype=float) * (self.gamma_sum / 100)
+
+    def gamma_constants(self):
+        """Constante gamma (µSv·h⁻¹)/(MBq·m⁻²) de tous les isotopes."""
+        return GAMMA_CONVERSION_FACTOR * self.gamma_sum
+
+    def decayed_activity(self, activity_bq, elapsed_seconds):
+        """Activité (Bq) après ``elapsed_seconds`` pour tous les isotopes.
+
+        Les deux arguments sont broadcastables sur (n,) ; un temps (k, 1)
+        donne une table (k, n).
+        """
+        return activity_at(activity_bq, self.half_life, elapsed_seconds)
+
+    def what_if(self, dose_rate_usvh, distance_m=1.0, elapsed_seconds=0.0):
+        """Table « et si » pour une source non identifiée.
+
+        À partir d'un débit de dose mesuré à une distance donnée, calcule pour
+        chaque isotope l'activité correspondante (Bq), son DED à 1m (mSv/h) et
+        l'activité restante après ``elapsed_seconds``. Les isotopes sans
+        émission gamma exploitable donnent NaN.
+        """
+        gamma = self.gamma_constants()
+        activity_bq = activity_from_dose_rate(dose_rate_usvh, distance_m, gamma)
+
+        table = np.empty(len(self), dtype=[
+            ('name', object), ('usage_code', np.int8), ('gamma_constant', float),
+            ('activity_bq', float), ('ded1m_msvh', float), ('decayed_activity_bq', float)
+        ])
+        table['name'] = self.names
+        table['usage_code'] = self.usage_code
+        table['gamma_constant'] = gamma
+        table['activity_bq'] = activity_bq
+        table['ded1m_msvh'] = self.ded1m(activity_bq)
+        table['decayed_activity_bq'] = self.decayed_activity(activity_bq, elapsed_seconds)
+        return table
@@ -0,0 +1,15 @@
+"""
+Périmètre de sécurité public pour EasyCMIR
+Distance à laquelle le débit de dose d'une source ponctuelle descend à la
+limite publique (2.5 µSv/h) : d = √(DED 1m / limite).
+"""
+
+from .distance import distance_for_dose_rate
+
+# Débit de dose de la limite publique en µSv/h
+PUBLIC_LIMIT_USVH = 2.5
+
+
+def public_perimeter(ded1m_usvh, limit=PUBLIC_LIMIT_USVH):
+    """Rayon (m) du périmètre public pour un DED à 1 m en µSv/h"""
+    return distance_for_dose_rate(ded1m_usvh, 1.0, limit)
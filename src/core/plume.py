@@ -0,0 +1,131 @@
+"""
+Panache gaussien pour EasyCMIR
+Concentration dans l'air au niveau du sol (Bq/m³) d'un rejet continu, selon
+le modèle gaussien avec réflexion au sol :
+
+    C(x, y, 0) = Q / (π u σy σz) × exp(-y² / 2σy²) × exp(-H² / 2σz²)
+
+avec Q le débit de rejet (Bq/s), u la vitesse du vent (m/s), H la hauteur de
+rejet (m), x la distance sous le vent et y la distance transverse. σy et σz
+suivent les formules de Briggs (terrain ouvert) pour les classes de stabilité
+de Pasquill-Gifford A à F. Le débit de dose d'immersion dans le nuage est
+estimé par l'approximation du nuage semi-infini (majorante près du rejet).
+
+La géométrie (distances sous le vent et transverses, σy, σz) ne dépend que de
+la grille, de la direction du vent et de la classe de stabilité : elle est
+gardée en cache, et changer le débit, la vitesse du vent, la hauteur ou les
+instants d'évaluation ne coûte que quelques opérations par maille.
+"""
+
+from functools import lru_cache
+import numpy as np
+
+STABILITY_CLASSES = ("A", "B", "C", "D", "E", "F")
+STABILITY_LABELS = {
+    "A": "A - Très instable",
+    "B": "B - Instable",
+    "C": "C - Légèrement instable",
+    "D": "D - Neutre",
+    "E": "E - Légèrement stable",
+    "F": "F - Stable"
+}
+
+# Briggs, terrain ouvert : σy = a x (1 + b x)^-0.5 ; σz = c x (1 + d x)^e
+BRIGGS_RURAL = {
+    "A": (0.22, 0.0001, 0.20, 0.0, 0.0),
+    "B": (0.16, 0.0001, 0.12, 0.0, 0.0),
+    "C": (0.11, 0.0001, 0.08, 0.0002, -0.5),
+    "D": (0.08, 0.0001, 0.06, 0.0015, -0.5),
+    "E": (0.06, 0.0001, 0.03, 0.0003, -1.0),
+    "F": (0.04, 0.0001, 0.016, 0.0003, -1.0)
+}
+
+# En deçà de cette distance sous le vent (m), σy et σz sont ceux de cette distance
+MIN_DOWNWIND = 1.0
+# Nuage semi-infini : Ḋ (µSv/h) = 0,5 × E (MeV) × 1,602e-13 J/MeV / ρair × C (Bq/m³) × 3600 × 1e6
+AIR_DENSITY = 1.293
+CLOUD_DOSE_FACTOR = 0.5 * 1.602e-13 / AIR_DENSITY * 3600 * 1e6
+# Nombre de grilles gardées en cache (2 tableaux de ny × nx flottants chacune)
+GEOMETRY_CACHE_SIZE = 4
+
+
+def dispersion_coefficients(stability, downwind):
+    """σy et σz (m) à la distance ``downwind`` (m) pour une classe de Pasquill-Gifford"""
+    a, b, c, d, e = BRIGGS_RURAL[stability]
+    x = np.maximum(np.asarray(downwind, dtype=float), MIN_DOWNWIND)
+    sigma_y = a * x / np.sqrt(1 + b * x)
+    sigma_z = c * x * (1 + d * x) ** e if d else c * x
+    return sigma_y, sigma_z
+
+
+def wind_axes(x, y, wind_direction):
+    """Distances sous le vent et transverses (m) d'un vent venant de ``wind_direction``.
+
+    Direction météorologique en degrés, comptée depuis le nord dans le sens
+    horaire (270 = vent d'ouest, panache vers l'est) ; x vers l'est, y vers le nord.
+    """
+    angle = np.radians(wind_direction)
+    ex, ey = -np.sin(angle), -np.cos(angle)
+    return x * ex + y * ey, y * ex - x * ey
+
+
+@lru_cache(maxsize=GEOMETRY_CACHE_SIZE)
+def _plume_geometry(extent, shape, wind_direction, stability):
+    """Facteurs du panache sur une grille, indépendants du débit, du vent et de la hauteur.
+
+    Retourne (xs, ys, distance sous le vent, exp(-y²/2σy²) / (π σy σz), 1 / 2σz²),
+    nuls en amont de la source. Les tableaux sont en lecture seule (partagés par le cache).
+    """
+    xmin, xmax, ymin, ymax = extent
+    ny, nx = shape
+    xs = np.linspace(xmin, xmax, nx)
+    ys = np.linspace(ymin, ymax, ny)
+    downwind, crosswind = wind_axes(xs[None, :], ys[:, None], wind_direction)
+    sigma_y, sigma_z = dispersion_coefficients(stability, downwind)
+    factor = np.exp(-crosswind * crosswind / (2 * sigma_y * sigma_y)) / (np.pi * sigma_y * sigma_z)
+    factor[downwind <= 0] = 0.0
+    height_term = 1.0 / (2 * sigma_z * sigma_z)
+    for array in (xs, ys, downwind, factor, height_term):
+        array.setflags(write=False)
+    return xs, ys, downwind, factor, height_term
+
+
+def ground_concentration(release_rate, wind_speed, stability, release_height, extent, shape,
+                         wind_direction=270.0, times=None, half_life=0.0, release_duration=np.inf):
+    """Concentration dans l'air au sol (Bq/m³) sur une grille régulière.
+
+    ``extent`` = (xmin, xmax, ymin, ymax) en m autour du point de rejet,
+    ``shape`` = (ny, nx), ``release_rate`` en Bq/s, ``wind_speed`` en m/s,
+    ``release_height`` en m. Avec ``times`` (s depuis le début du rejet),
+    retourne un tableau (instants, ny, nx) : le panache n'occupe que les
+    distances atteintes, x ≤ u t, et déjà quittées par la fin d'un rejet de
+    durée ``release_duration`` (s), x ≥ u (t - durée) ; tous les instants sont
+    évalués en une seule opération. ``half_life`` (s) applique la décroissance
+    pendant le transport. Retourne (xs, ys, concentrations).
+    """
+    if wind_speed <= 0:
+        raise ValueError("La vitesse du vent doit être strictement positive")
+    xs, ys, downwind, factor, height_term = _plume_geometry(
+        tuple(float(v) for v in extent), tuple(shape), float(wind_direction), stability)
+
+    concentration = (release_rate / wind_speed) * factor
+    if release_height:
+        concentration = concentration * np.exp(-(release_height * release_height) * height_term)
+    travel_time = downwind / wind_speed
+    if half_life > 0:
+        concentration = concentration * np.exp(-np.log(2) / half_life * np.maximum(travel_time, 0.0))
+    if times is None:
+        return xs, ys, concentration
+
+    times = np.asarray(times, dtype=float).reshape(-1, 1, 1)
+    reached = (travel_time <= times) & (travel_time >= times - release_duration)
+    return xs, ys, np.where(reached, concentration, 0.0)
+
+
+def cloud_dose_rate(concentration, mean_energy):
+    """Débit de dose d'immersion (µSv/h) dans un nuage semi-infini.
+
+    ``mean_energy`` = énergie gamma émise par désintégration (MeV), soit
+    Σ(E × I%) / 100 (voir ``ded.gamma_sum``).
+    """
+    return CLOUD_DOSE_FACTOR * np.asarray(mean_energy, dtype=float) * concentration
@@ -0,0 +1,161 @@
+"""
+Calculs d'atténuation par écran pour EasyCMIR
+Transmission multi-raies (faisceau étroit ou large avec facteurs d'accumulation
+G-P) et recherche de l'épaisseur d'écran nécessaire par Newton sécurisé
+(encadrement + bissection).
+"""
+
+import numpy as np
+
+# Au-delà de 40 libres parcours moyens les paramètres G-P ne sont plus validés :
+# le facteur d'accumulation y est figé
+GP_MAX_MFP = 40.0
+
+
+def line_weights(energies, intensities):
+    """Part de chaque raie gamma dans le débit de dose (somme = 1).
+
+    La contribution d'une raie est proportionnelle à E × I ; les raies
+    d'énergie ou d'intensité nulle ont un poids nul.
+    """
+    energies = np.asarray(energies, dtype=float)
+    intensities = np.asarray(intensities, dtype=float)
+    contributions = np.where((energies > 0) & (intensities > 0), energies * intensities, 0.0)
+    total = contributions.sum()
+    return contributions / total if total > 0 else contributions
+
+
+def gp_buildup(mfp, b, c, a, xk, d):
+    """Facteur d'accumulation G-P (progression géométrique, ANSI/ANS-6.4.3).
+
+    K(x) = c x^a + d (tanh(x/Xk - 2) - tanh(-2)) / (1 - tanh(-2))
+    B(x) = 1 + (b - 1)(K^x - 1)/(K - 1), ou 1 + (b - 1) x si K = 1.
+    ``mfp`` est un tableau (..., m) de libres parcours moyens, les paramètres
+    des tableaux (m,) diffusés sur le dernier axe.
+    """
+    x = np.clip(np.asarray(mfp, dtype=float), 0.0, GP_MAX_MFP)
+    tanh_2 = np.tanh(-2.0)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        k = c * x ** a + d * (np.tanh(x / xk - 2.0) - tanh_2) / (1.0 - tanh_2)
+        k = np.maximum(k, 1e-6)
+        near_one = np.abs(k - 1.0) < 1e-6
+        geometric = (k ** x - 1.0) / np.where(near_one, 1.0, k - 1.0)
+        buildup = 1.0 + (b - 1.0) * np.where(near_one, x, geometric)
+    return np.where(x > 0, buildup, 1.0)
+
+
+def transmission(thickness, mu, weights, buildup=None):
+    """Transmission Σ wi Bi e^(-μi x) pour une ou plusieurs épaisseurs x (cm).
+
+    ``mu`` (cm⁻¹) et ``weights`` sont indexés par raie ; ``thickness`` peut être
+    un tableau quelconque, le résultat a la même forme. ``buildup`` est une
+    fonction des libres parcours moyens (..., raies) donnant les facteurs
+    d'accumulation (faisceau large) ; sans elle, Bi = 1 (faisceau étroit).
+    """
+    thickness = np.asarray(thickness, dtype=float)
+    mfp = np.multiply.outer(thickness, mu)
+    factors = np.exp(-mfp)
+    if buildup is not None:
+        factors *= buildup(mfp)
+    return factors @ weights
+
+
+def required_thickness(target_transmission, mu, weights, max_thickness=None, tolerance=1e-4, max_iterations=100,
+                       buildup=None):
+    """Épaisseur (cm) pour laquelle la transmission atteint la valeur cible.
+
+    La transmission est décroissante et convexe : la racine est encadrée par
+    ln(1/T)/μmax et ln(1/T)/μmin, puis atteinte par Newton avec repli sur la
+    bissection. ``tolerance`` est en cm (1e-4 cm = 1 µm). Retourne None si la
+    cible est inatteignable ou au-delà de ``max_thickness``.
+
+    Avec ``buildup`` (voir ``transmission``), la solution du faisceau étroit
+    sert de borne basse et la racine du faisceau large est cherchée sur
+    log T par fausse position (variante Illinois).
+    """
+    mu = np.asarray(mu, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    if buildup is not None:
+        return _broad_beam_thickness(target_transmission, mu, weights, buildup, max_thickness,
+                                     tolerance, max_iterations)
+    active = weights > 0
+    mu, weights = mu[active], weights[active]
+
+    if target_transmission >= 1 or len(weights) == 0:
+        return 0.0
+    if target_transmission <= 0 or np.any(mu <= 0):
+        return None
+
+    log_ratio = np.log(1 / target_transmission)
+    low = log_ratio / mu.max()
+    high = log_ratio / mu.min()
+    if max_thickness is not None and low > max_thickness:
+        return None
+
+    x = low
+    for _ in range(max_iterations):
+        terms = weights * np.exp(-mu * x)
+        f = terms.sum() - target_transmission
+        if f > 0:
+            low = x
+        else:
+            high = x
+        # Pas de Newton : f'(x) = -Σ μi wi e^(-μi x)
+        new_x = x + f / (mu * terms).sum()
+        # Repli sur la bissection si Newton sort de l'encadrement
+        if not low <= new_x <= high:
+            new_x = (low + high) / 2
+        converged = abs(new_x - x) < tolerance
+        x = new_x
+        if converged:
+            break
+
+    if max_thickness is not None and x > max_thickness:
+        return None
+    return float(x)
+
+
+def _broad_beam_thickness(target_transmission, mu, weights, buildup, max_thickness, tolerance, max_iterations):
+    """Épaisseur (cm) atteignant la transmission cible en faisceau large"""
+    low = required_thickness(target_transmission, mu, weights, max_thickness, tolerance, max_iterations)
+    if low is None or low == 0:
+        return low
+
+    def excess(x):
+        # log T(x) - log cible, décroissante en x
+        return float(np.log(transmission(x, mu, weights, buildup)) - np.log(target_transmission))
+
+    f_low = excess(low)
+    if f_low <= 0:
+        return low
+
+    # Recherche d'une borne haute par doublements successifs
+    limit = max_thickness if max_thickness is not None else 1e4
+    high = low
+    f_high = f_low
+    while f_high > 0:
+        if high >= limit:
+            return None
+        high = min(2 * high, limit)
+        f_high = excess(high)
+        if f_high > 0:
+            low, f_low = high, f_high
+
+    side = 0
+    x = high
+    for _ in range(max_iterations):
+        x = (low * f_high - high * f_low) / (f_high - f_low)
+        fx = excess(x)
+        if fx > 0:
+            low, f_low = x, fx
+            if side == 1:
+                f_high /= 2
+            side = 1
+        else:
+            high, f_high = x, fx
+            if side == -1:
+                f_low /= 2
+            side = -1
+        if high - low < tolerance:
+            break
+    return float(x)
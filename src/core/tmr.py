@@ -0,0 +1,163 @@
+"""
+Classification TMR des colis pour EasyCMIR
+Catégorie d'étiquette (I, II, III, EX) et indice de transport à partir des
+débits de dose au contact et à 1 m, calculés par masques NumPy sur des
+tableaux de colis. Les manifestes CSV sont lus et annotés par blocs, sans
+charger tout le fichier en mémoire.
+"""
+
+import csv
+from dataclasses import dataclass, field
+from typing import Dict, List
+import numpy as np
+from .units import unit_registry
+
+# Catégories dans l'ordre des codes numériques (N/A : hors critères)
+CATEGORIES = ("I", "II", "III", "EX", "N/A")
+INVALID = "INVALIDE"
+
+# En-têtes reconnus (en minuscules) pour chaque colonne du manifeste
+ID_HEADERS = ("id", "identifiant", "colis", "numero", "numéro", "reference", "référence")
+CONTACT_HEADERS = ("contact", "ded_contact", "ded contact", "debit_contact", "débit contact")
+ONE_METER_HEADERS = ("1m", "1 m", "ded_1m", "ded 1m", "ded1m", "debit_1m", "débit 1m")
+
+
+def transport_index(dose_rate_1m):
+    """Indice de transport : débit à 1 m (µSv/h) / 10, arrondi au centième"""
+    return np.round(np.asarray(dose_rate_1m, dtype=float) / 10, 2)
+
+
+def classify(contact, dose_rate_1m) -> np.ndarray:
+    """Codes de catégorie (indices de CATEGORIES) pour des tableaux de débits en µSv/h.
+
+    Même règles que le calcul colis par colis :
+    I : contact < 5 et 1 m nul ; II : 5 ≤ contact ≤ 500 et 0 < 1 m ≤ 10 ;
+    III : 500 < contact ≤ 2000 et 10 < 1 m ≤ 100 ; EX : 2000 < contact ≤ 10000.
+    """
+    contact = np.asarray(contact, dtype=float)
+    one_meter = np.asarray(dose_rate_1m, dtype=float)
+    conditions = [
+        (contact < 5) & (one_meter == 0),
+        (contact >= 5) & (contact <= 500) & (one_meter > 0) & (one_meter <= 10),
+        (contact > 500) & (contact <= 2000) & (one_meter > 10) & (one_meter <= 100),
+        (contact > 2000) & (contact <= 10000),
+    ]
+    return np.select(conditions, [0, 1, 2, 3], default=4).astype(np.int8)
+
+
+@dataclass
+class ManifestSummary:
+    """Bilan d'un manifeste traité"""
+    packages: int = 0
+    counts: Dict[str, int] = field(default_factory=lambda: {c: 0 for c in CATEGORIES + (INVALID,)})
+    total_transport_index: float = 0.0
+    max_transport_index: float = 0.0
+    max_contact: float = 0.0
+    invalid_rows: List[int] = field(default_factory=list)   # Numéros de ligne du fichier
+
+
+def _find_column(header, candidates, name):
+    """Indice de la colonne dont l'en-tête figure parmi ``candidates``"""
+    normalized = [h.strip().lower() for h in header]
+    for candidate in candidates:
+        if candidate in normalized:
+            return normalized.index(candidate)
+    raise ValueError(f"Colonne « {name} » introuvable dans l'en-tête : {';'.join(header)}")
+
+
+def _parse_dose_rate(text):
+    """Débit en µSv/h ; une unité peut suivre la valeur (ex: « 1,2 mSv/h »)"""
+    try:
+        return float(text.replace(',', '.'))
+    except ValueError:
+        return unit_registry.parse_to(text, "µSv/h")
+
+
+def classify_manifest(input_path, output_path, chunk_size=10_000, encoding='utf-8-sig',
+                      max_invalid_rows=100) -> ManifestSummary:
+    """Classe tous les colis d'un manifeste CSV et écrit le manifeste annoté.
+
+    Le fichier d'entrée contient au moins une colonne identifiant, une colonne
+    débit au contact et une colonne débit à 1 m (µSv/h par défaut), séparées
+    par « ; », « , » ou une tabulation. Le fichier de sortie reprend chaque
+    ligne avec deux colonnes ajoutées : catégorie et IT, écrit avec le
+    séparateur décimal des débits d'entrée. Les lignes illisibles sont
+    marquées INVALIDE. Les colis sont traités par blocs de ``chunk_size``.
+    """
+    summary = ManifestSummary()
+    with open(input_path, 'r', encoding=encoding, newline='') as source, \
+            open(output_path, 'w', encoding='utf-8', newline='') as target:
+        sample = source.read(4096)
+        source.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=";,\t")
+            delimiter = dialect.delimiter
+        except csv.Error:
+            delimiter = ';'
+        reader = csv.reader(source, delimiter=delimiter)
+        writer = csv.writer(target, delimiter=delimiter)
+
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("Manifeste vide")
+        _find_column(header, ID_HEADERS, "identifiant")
+        contact_column = _find_column(header, CONTACT_HEADERS, "débit au contact")
+        one_meter_column = _find_column(header, ONE_METER_HEADERS, "débit à 1 m")
+        writer.writerow(header + ["categorie", "IT"])
+        # Séparateur décimal de l'IT : virgule si les débits du premier bloc en contiennent
+        decimal = None
+
+        def flush(rows, line_numbers):
+            nonlocal decimal
+            if decimal is None:
+                cells = [row[column] for row in rows for column in (contact_column, one_meter_column)
+                         if column < len(row)]
+                decimal = "," if delimiter != "," and any("," in cell for cell in cells) else "."
+            contact = np.full(len(rows), np.nan)
+            one_meter = np.full(len(rows), np.nan)
+            for index, row in enumerate(rows):
+                try:
+                    contact[index] = _parse_dose_rate(row[contact_column])
+                    one_meter[index] = _parse_dose_rate(row[one_meter_column])
+                except (ValueError, IndexError):
+                    pass
+            valid = np.isfinite(contact) & np.isfinite(one_meter) & (contact >= 0) & (one_meter >= 0)
+            codes = classify(contact, one_meter)
+            indices = transport_index(one_meter)
+
+            labels = np.array(CATEGORIES + (INVALID,), dtype=object)[np.where(valid, codes, len(CATEGORIES))]
+            index_texts = np.char.mod('%.2f', np.nan_to_num(indices))
+            if decimal != ".":
+                index_texts = np.char.replace(index_texts, ".", decimal)
+            index_texts = np.where(valid, index_texts, "")
+            writer.writerows(row + [label, text] for row, label, text in zip(rows, labels, index_texts))
+
+            summary.packages += len(rows)
+            counts = np.bincount(np.where(valid, codes, len(CATEGORIES)), minlength=len(CATEGORIES) + 1)
+            for name, count in zip(CATEGORIES + (INVALID,), counts):
+                summary.counts[name] += int(count)
+            if valid.any():
+                summary.total_transport_index += float(indices[valid].sum())
+                summary.max_transport_index = max(summary.max_transport_index, float(indices[valid].max()))
+                summary.max_contact = max(summary.max_contact, float(contact[valid].max()))
+            invalid = np.flatnonzero(~valid)
+            room = max_invalid_rows - len(summary.invalid_rows)
+            summary.invalid_rows.extend(line_numbers[i] for i in invalid[:room])
+
+        rows, line_numbers = [], []
+        for row in reader:
+            if not any(cell.strip() for cell in row):
+                continue
+            rows.append(row)
+            line_numbers.append(reader.line_num)
+            if len(rows) >= chunk_size:
+                flush(rows, line_numbers)
+                rows, line_numbers = [], []
+        if rows:
+            flush(rows, line_numbers)
+    return summary
+
+
+def category_of(contact, dose_rate_1m) -> str:
+    """Catégorie d'un seul colis"""
+    return CATEGORIES[int(classify(contact, dose_rate_1m))]
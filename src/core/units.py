@@ -0,0 +1,177 @@
+"""
+Registre des unités pour EasyCMIR
+Source unique des facteurs de conversion (débits de dose, doses, activités,
+durées, distances). Chaque grandeur dispose d'une matrice de conversion
+précalculée : convertir un tableau NumPy entier coûte une multiplication, et
+les saisies texte (« 12,5 mSv/h ») sont analysées par une expression régulière
+compilée.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# 1 R (exposition) = 8.77 mGy de kerma dans l'air ; pour les photons, 1 Gy = 1 Sv
+ROENTGEN_TO_SIEVERT = 8.77e-3
+CURIE_TO_BECQUEREL = 3.7e10
+
+
+@dataclass(frozen=True)
+class Unit:
+    """Unité d'une grandeur et son facteur vers l'unité de base de cette grandeur"""
+    symbol: str
+    quantity: str
+    factor: float
+
+
+# (grandeur, unité de base, [(symbole, facteur vers la base), ...]) dans l'ordre d'affichage
+DEFAULT_UNITS = [
+    ("dose_rate", "µSv/h", [
+        ("Sv/h", 1e6), ("mSv/h", 1e3), ("µSv/h", 1.0), ("nSv/h", 1e-3), ("pSv/h", 1e-6),
+        ("R/h", ROENTGEN_TO_SIEVERT * 1e6), ("mR/h", ROENTGEN_TO_SIEVERT * 1e3), ("µR/h", ROENTGEN_TO_SIEVERT),
+        ("Rad/h", 1e4), ("mRad/h", 10.0), ("µRad/h", 1e-2),
+        ("Rem/h", 1e4), ("mRem/h", 10.0),
+        ("Gy/h", 1e6), ("mGy/h", 1e3), ("µGy/h", 1.0),
+    ]),
+    ("dose", "µSv", [
+        ("Sv", 1e6), ("mSv", 1e3), ("µSv", 1.0), ("nSv", 1e-3),
+        ("Rem", 1e4), ("mRem", 10.0),
+    ]),
+    ("activity", "Bq", [
+        ("Bq", 1.0), ("kBq", 1e3), ("MBq", 1e6), ("GBq", 1e9), ("TBq", 1e12),
+        ("Ci", CURIE_TO_BECQUEREL), ("mCi", CURIE_TO_BECQUEREL * 1e-3),
+        ("µCi", CURIE_TO_BECQUEREL * 1e-6), ("nCi", CURIE_TO_BECQUEREL * 1e-9),
+    ]),
+    ("time", "s", [
+        ("s", 1.0), ("min", 60.0), ("h", 3600.0), ("j", 86400.0), ("a", 365.25 * 86400.0),
+    ]),
+    ("length", "m", [
+        ("mm", 1e-3), ("cm", 1e-2), ("m", 1.0), ("km", 1e3),
+    ]),
+]
+
+# Variantes d'écriture acceptées à la saisie (clé en minuscules). Les symboles
+# eux-mêmes restent sensibles à la casse : « mBq » n'est pas « MBq ».
+ALIASES = {
+    "rem/h": "Rem/h", "mrem/h": "mRem/h", "rad/h": "Rad/h", "mrad/h": "mRad/h",
+    "rem": "Rem", "mrem": "mRem",
+    "usv/h": "µSv/h", "μsv/h": "µSv/h", "usv": "µSv", "μsv": "µSv",
+    "ur/h": "µR/h", "μr/h": "µR/h", "urad/h": "µRad/h", "μrad/h": "µRad/h",
+    "ugy/h": "µGy/h", "μgy/h": "µGy/h", "uci": "µCi", "μci": "µCi",
+    "sec": "s", "mn": "min", "d": "j", "jour": "j", "jours": "j", "an": "a", "ans": "a",
+}
+
+# Nombre (virgule ou point décimal, exposant éventuel) suivi d'une unité facultative
+_QUANTITY_PATTERN = re.compile(
+    r"^\s*([-+]?(?:\d+(?:[.,]\d*)?|[.,]\d+)(?:[eE][-+]?\d+)?)\s*([^\d\s].*?)?\s*$"
+)
+
+
+class UnitRegistry:
+    """Unités connues, matrices de conversion par grandeur et analyse des saisies"""
+
+    def __init__(self):
+        self._units: Dict[str, Unit] = {}
+        self._lookup: Dict[str, str] = {}
+        self._symbols: Dict[str, List[str]] = {}
+        self._base: Dict[str, str] = {}
+        self._matrices: Dict[str, np.ndarray] = {}
+        self._index: Dict[str, int] = {}
+
+    def register(self, quantity: str, base: str, units):
+        """Enregistre les unités (symbole, facteur vers ``base``) d'une grandeur"""
+        symbols = self._symbols.setdefault(quantity, [])
+        self._base[quantity] = base
+        for symbol, factor in units:
+            if symbol in self._units and self._units[symbol].quantity != quantity:
+                raise ValueError(f"Unité déjà enregistrée pour une autre grandeur : {symbol}")
+            if symbol not in symbols:
+                symbols.append(symbol)
+            self._units[symbol] = Unit(symbol, quantity, float(factor))
+        for alias, symbol in ALIASES.items():
+            if symbol in self._units:
+                self._lookup[alias] = symbol
+
+        # Matrice M[i, j] : valeur en unité j = valeur en unité i × M[i, j]
+        factors = np.array([self._units[s].factor for s in symbols])
+        self._matrices[quantity] = factors[:, None] / factors[None, :]
+        self._matrices[quantity].flags.writeable = False
+        for index, symbol in enumerate(symbols):
+            self._index[symbol] = index
+
+    def units(self, quantity: str) -> List[str]:
+        """Symboles d'une grandeur dans l'ordre d'affichage"""
+        return list(self._symbols.get(quantity, []))
+
+    def base_unit(self, quantity: str) -> str:
+        return self._base[quantity]
+
+    def unit(self, symbol: str) -> Unit:
+        """Unité correspondant à un symbole ou à l'une de ses variantes"""
+        unit = self._units.get(symbol)
+        if unit is None:
+            symbol = symbol.strip()
+            unit = self._units.get(symbol) or self._units.get(self._lookup.get(symbol.lower(), ""))
+        if unit is None:
+            raise ValueError(f"Unité inconnue : {symbol}")
+        return unit
+
+    def __contains__(self, symbol) -> bool:
+        try:
+            self.unit(symbol)
+        except ValueError:
+            return False
+        return True
+
+    def factor(self, from_unit: str, to_unit: str) -> float:
+        """Facteur multiplicatif de ``from_unit`` vers ``to_unit`` (même grandeur)"""
+        source, target = self.unit(from_unit), self.unit(to_unit)
+        if source.quantity != target.quantity:
+            raise ValueError(f"Conversion impossible de {source.symbol} vers {target.symbol}")
+        return float(self._matrices[source.quantity][self._index[source.symbol], self._index[target.symbol]])
+
+    def convert(self, values, from_unit: str, to_unit: str):
+        """Convertit un scalaire ou un tableau en une multiplication"""
+        factor = self.factor(from_unit, to_unit)
+        if isinstance(values, (int, float)):
+            return values * factor
+        return np.asarray(values, dtype=float) * factor
+
+    def convert_each(self, values, from_units, to_unit: str) -> np.ndarray:
+        """Convertit des valeurs exprimées chacune dans sa propre unité (tableau de symboles)"""
+        target = self.unit(to_unit)
+        # Facteur de chaque unité distincte, puis une seule multiplication
+        symbols, inverse = np.unique(np.asarray(from_units, dtype=object).astype(str), return_inverse=True)
+        factors = np.array([self.factor(symbol, target.symbol) for symbol in symbols])
+        return np.asarray(values, dtype=float) * factors[inverse.reshape(np.shape(values))]
+
+    def to_base(self, values, unit: str):
+        """Convertit vers l'unité de base de la grandeur"""
+        return self.convert(values, unit, self._base[self.unit(unit).quantity])
+
+    def parse(self, text: str, default_unit: Optional[str] = None) -> Tuple[float, str]:
+        """Analyse une saisie « valeur [unité] » (virgule ou point décimal).
+
+        Retourne (valeur, symbole). Sans unité dans le texte, ``default_unit``
+        est utilisée ; ValueError si elle manque ou si l'unité est inconnue.
+        """
+        match = _QUANTITY_PATTERN.match(text)
+        if match is None:
+            raise ValueError(f"Saisie invalide : {text!r}")
+        value = float(match.group(1).replace(',', '.'))
+        symbol = match.group(2) or default_unit
+        if symbol is None:
+            raise ValueError(f"Unité manquante : {text!r}")
+        return value, self.unit(symbol).symbol
+
+    def parse_to(self, text: str, unit: str, default_unit: Optional[str] = None) -> float:
+        """Analyse une saisie et la convertit dans ``unit`` (``unit`` par défaut)"""
+        value, symbol = self.parse(text, default_unit or unit)
+        return value * self.factor(symbol, unit)
+
+
+# Instance globale du registre des unités
+unit_registry = UnitRegistry()
+for _quantity, _base, _units in DEFAULT_UNITS:
+    unit_registry.register(_quantity, _base, _units)
@@ -3,17 +3,23 @@ import math
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QLineEdit, QComboBox, QFormLayout, QGroupBox, QMessageBox,
-    QDoubleSpinBox
+    QDoubleSpinBox, QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox
 )
 from PySide6.QtCore import Qt
 from PySide6.QtGui import QIcon
 from ..constants import ICONS_DIR
-from ..utils.config_manager import config_manager
+from ..utils.isotope_catalog import isotope_catalog
+from ..utils.localization import locate_source
+from ..utils.uncertainty import Uncertain
+from ..core.units import unit_registry
+from ..core import ded
 
 
 class ActiviteOriginDialog(QDialog):
     """Dialog pour calculer l'activité d'origine à partir du débit de dose."""
     
+    MODES = ["Mesure unique", "Localisation multi-mesures"]
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Calcul Activité d'Origine")
@@ -36,33 +42,22 @@ class ActiviteOriginDialog(QDialog):
             self.setWindowIcon(QIcon(icon_path))
     
     def load_isotopes(self):
-        """Charge la liste des isotopes depuis le fichier isotopes.txt."""
+        """Charge la liste des isotopes depuis le catalogue partagé."""
         self.isotopes_data = {}
         
         try:
-            isotopes_file = config_manager.get_isotopes_path()
-            
-            with open(isotopes_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        parts = line.split(';')
-                        if len(parts) >= 9:
-                            nom = parts[0]
-                            activite_specifique = float(parts[1]) if parts[1] != '0' else 0
-                            demi_vie = float(parts[2]) if parts[2] != '0' else 0
-                            
-                            # Stocker les données de l'isotope
-                            self.isotopes_data[nom] = {
-                                'activite_specifique': activite_specifique,
-                                'demi_vie': demi_vie,
-                                'energie1': float(parts[3]) if parts[3] != '0.000' else 0,
-                                'energie2': float(parts[4]) if parts[4] != '0.000' else 0,
-                                'energie3': float(parts[5]) if parts[5] != '0.000' else 0,
-                                'intensite1': float(parts[6]) if parts[6] != '0.0' else 0,
-                                'intensite2': float(parts[7]) if parts[7] != '0.0' else 0,
-                                'intensite3': float(parts[8].split(',')[0]) if parts[8].split(',')[0] != '0.0' else 0
-                            }
+            for isotope in isotope_catalog:
+                # Stocker les données de l'isotope
+                self.isotopes_data[isotope.name] = {
+                    'activite_specifique': isotope.specific_activity,
+                    'demi_vie': isotope.half_life,
+                    'energie1': isotope.energies[0],
+                    'energie2': isotope.energies[1],
+                    'energie3': isotope.energies[2],
+                    'intensite1': isotope.intensities[0],
+                    'intensite2': isotope.intensities[1],
+                    'intensite3': isotope.intensities[2]
+                }
         except Exception as e:
             QMessageBox.warning(self, "Erreur", f"Erreur lors du chargement des isotopes: {str(e)}")
             self.isotopes_data = {}
@@ -143,6 +138,13 @@ class ActiviteOriginDialog(QDialog):
         self.isotope_combo.setToolTip("Sélectionner l'isotope à analyser")
         input_layout.addRow("Isotope:", self.isotope_combo)
         
+        # Mode de calcul : une mesure à distance connue ou plusieurs mesures positionnées
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(self.MODES)
+        self.mode_combo.setToolTip("Mesure unique à distance connue, ou localisation de la source à partir de mesures en (x, y)")
+        self.mode_combo.currentIndexChanged.connect(self.update_mode)
+        input_layout.addRow("Mode:", self.mode_combo)
+        
         # Débit de dose
         dose_layout = QHBoxLayout()
         self.dose_input = QDoubleSpinBox()
@@ -176,6 +178,48 @@ class ActiviteOriginDialog(QDialog):
         
         layout.addWidget(input_group)
         
+        # Groupe des mesures positionnées (mode multi-mesures)
+        self.readings_group = QGroupBox("Mesures (débit dans l'unité choisie)")
+        readings_layout = QVBoxLayout(self.readings_group)
+        
+        self.readings_table = QTableWidget(0, 3)
+        self.readings_table.setHorizontalHeaderLabels(["X (m)", "Y (m)", "Débit de dose"])
+        self.readings_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.readings_table.verticalHeader().setVisible(False)
+        readings_layout.addWidget(self.readings_table)
+        
+        table_buttons = QHBoxLayout()
+        add_button = QPushButton("Ajouter")
+        add_button.clicked.connect(lambda: self.add_reading(0.0, 0.0, 1.0))
+        remove_button = QPushButton("Supprimer")
+        remove_button.clicked.connect(self.remove_reading)
+        table_buttons.addWidget(add_button)
+        table_buttons.addWidget(remove_button)
+        readings_layout.addLayout(table_buttons)
+        
+        options_layout = QFormLayout()
+        self.height_input = QDoubleSpinBox()
+        self.height_input.setDecimals(2)
+        self.height_input.setMaximum(100.0)
+        self.height_input.setValue(1.0)
+        self.height_input.setSuffix(" m")
+        self.height_input.setToolTip("Hauteur du détecteur au-dessus du plan de la source")
+        options_layout.addRow("Hauteur de mesure:", self.height_input)
+        
+        self.uncertainty_input = QDoubleSpinBox()
+        self.uncertainty_input.setDecimals(1)
+        self.uncertainty_input.setRange(1.0, 100.0)
+        self.uncertainty_input.setValue(10.0)
+        self.uncertainty_input.setSuffix(" %")
+        self.uncertainty_input.setToolTip("Incertitude relative de chaque mesure (pondération de l'ajustement)")
+        options_layout.addRow("Incertitude des mesures:", self.uncertainty_input)
+        
+        self.background_check = QCheckBox("Ajuster le bruit de fond")
+        options_layout.addRow("", self.background_check)
+        readings_layout.addLayout(options_layout)
+        
+        layout.addWidget(self.readings_group)
+        
         # Bouton de calcul
         self.calc_button = QPushButton("Calculer l'Activité")
         self.calc_button.setStyleSheet("""
@@ -195,9 +239,14 @@ class ActiviteOriginDialog(QDialog):
                 background-color: #21618c;
             }
         """)
-        self.calc_button.clicked.connect(self.calculate_activity)
+        self.calc_button.clicked.connect(self.calculate)
         layout.addWidget(self.calc_button)
         
+        self.uncertainty_button = QPushButton("Incertitudes")
+        self.uncertainty_button.setToolTip("Propagation Monte-Carlo des incertitudes de mesure et de distance")
+        self.uncertainty_button.clicked.connect(self.open_uncertainty)
+        layout.addWidget(self.uncertainty_button)
+        
         # Groupe de résultats
         result_group = QGroupBox("Résultats")
         result_layout = QFormLayout(result_group)
@@ -222,6 +271,120 @@ class ActiviteOriginDialog(QDialog):
         close_button = QPushButton("Fermer")
         close_button.clicked.connect(self.accept)
         layout.addWidget(close_button)
+        
+        self.update_mode()
+    
+    def update_mode(self):
+        """Affiche les champs du mode de calcul sélectionné."""
+        multi = self.mode_combo.currentIndex() == 1
+        self.readings_group.setVisible(multi)
+        self.distance_input.setEnabled(not multi)
+        self.dose_input.setEnabled(not multi)
+        self.uncertainty_button.setEnabled(not multi)
+        self.calc_button.setText("Localiser la Source" if multi else "Calculer l'Activité")
+        self.resize(self.width(), 750 if multi else 450)
+    
+    def add_reading(self, x, y, dose_rate):
+        """Ajoute une ligne de mesure à la table."""
+        row = self.readings_table.rowCount()
+        self.readings_table.insertRow(row)
+        for column, value in enumerate((x, y, dose_rate)):
+            self.readings_table.setItem(row, column, QTableWidgetItem(f"{value:g}"))
+    
+    def remove_reading(self):
+        """Supprime la ligne de mesure sélectionnée."""
+        row = self.readings_table.currentRow()
+        if row >= 0:
+            self.readings_table.removeRow(row)
+    
+    def read_readings(self):
+        """Lit les mesures de la table : listes x, y (m) et débit (µSv/h).
+        
+        Virgule ou point décimal ; un débit peut porter sa propre unité
+        (ex: « 12,5 mSv/h »), sinon l'unité choisie dans le menu s'applique.
+        """
+        dose_unit = self.dose_unit_combo.currentText()
+        units = ("m", "m", "µSv/h")
+        defaults = ("m", "m", dose_unit)
+        columns = ([], [], [])
+        for row in range(self.readings_table.rowCount()):
+            for column, values in enumerate(columns):
+                item = self.readings_table.item(row, column)
+                text = item.text() if item else ""
+                values.append(unit_registry.parse_to(text, units[column], default_unit=defaults[column]))
+        return columns
+    
+    def calculate(self):
+        """Lance le calcul du mode sélectionné."""
+        if self.mode_combo.currentIndex() == 1:
+            self.locate_source()
+        else:
+            self.calculate_activity()
+    
+    def locate_source(self):
+        """Localise la source et estime son activité à partir des mesures positionnées."""
+        isotope_name = self.isotope_combo.currentText()
+        if isotope_name not in self.isotopes_data:
+            QMessageBox.warning(self, "Erreur", "Veuillez sélectionner un isotope valide.")
+            return
+        
+        try:
+            xs, ys, dose_rates = self.read_readings()
+        except ValueError:
+            QMessageBox.critical(self, "Erreur Saisie", "Veuillez entrer des valeurs numériques valides.")
+            return
+        
+        fit_background = self.background_check.isChecked()
+        minimum = 4 if fit_background else 3
+        if len(dose_rates) < minimum:
+            QMessageBox.warning(self, "Attention", f"Au moins {minimum} mesures sont nécessaires.")
+            return
+        if min(dose_rates) <= 0:
+            QMessageBox.warning(self, "Attention", "Les débits de dose doivent être strictement positifs.")
+            return
+        
+        try:
+            gamma_constant = self.calculate_gamma_constant(self.isotopes_data[isotope_name])
+            if gamma_constant <= 0:
+                QMessageBox.warning(self, "Erreur", f"Impossible de calculer pour {isotope_name}: données gamma insuffisantes pour le calcul de la constante.")
+                return
+            
+            result = locate_source(
+                xs, ys, dose_rates,
+                relative_error=self.uncertainty_input.value() / 100,
+                height=self.height_input.value(),
+                fit_background=fit_background
+            )
+            
+            # Activité : A (MBq) = D1m (µSv/h) / Γ, intervalle à 95 % reporté depuis D1m
+            activity_bq = result.dose_rate_1m / gamma_constant * 1e6
+            low, high = result.confidence_interval(2)
+            x_low, x_high = result.confidence_interval(0)
+            y_low, y_high = result.confidence_interval(1)
+            
+            self.result_label.setText(
+                f"{self.format_activity(activity_bq)}\n"
+                f"(IC 95 %: {self.format_activity(max(low, 0) / gamma_constant * 1e6)} – "
+                f"{self.format_activity(high / gamma_constant * 1e6)})"
+            )
+            self.result_label.adjustSize()
+            
+            info_text = f"Isotope: {isotope_name}\n"
+            info_text += f"Position: x = {result.x:.2f} m [{x_low:.2f} ; {x_high:.2f}], "
+            info_text += f"y = {result.y:.2f} m [{y_low:.2f} ; {y_high:.2f}]\n"
+            info_text += f"Débit de dose à 1m: {result.dose_rate_1m:.2f} µSv/h\n"
+            if fit_background:
+                info_text += f"Bruit de fond: {result.background:.3f} µSv/h\n"
+            info_text += f"Constante γ calculée: {gamma_constant:.3f} (µSv·h⁻¹)/(MBq·m⁻²)\n"
+            info_text += f"{len(dose_rates)} mesures, écart résiduel: {result.residual_rms * 100:.1f} %"
+            if not result.converged:
+                info_text += "\nAttention : l'ajustement n'a pas convergé"
+            
+            self.info_label.setText(info_text)
+            self.info_label.adjustSize()
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors du calcul: {str(e)}")
     
     def calculate_activity(self):
         """Calcule l'activité d'origine en fonction des paramètres saisis."""
@@ -239,12 +402,7 @@ class ActiviteOriginDialog(QDialog):
             isotope_data = self.isotopes_data[isotope_name]
             
             # Conversion du débit de dose en µSv/h
-            if dose_unit == "mSv/h":
-                dose_rate_usv = dose_rate * 1000
-            elif dose_unit == "Sv/h":
-                dose_rate_usv = dose_rate * 1000000
-            else:  # µSv/h
-                dose_rate_usv = dose_rate
+            dose_rate_usv = unit_registry.convert(dose_rate, dose_unit, "µSv/h")
             
             # Correction du débit de dose à 1m selon la loi de l'inverse du carré de la distance
             dose_rate_1m = dose_rate_usv * (distance * distance)
@@ -279,6 +437,31 @@ class ActiviteOriginDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur lors du calcul: {str(e)}")
     
+    def open_uncertainty(self):
+        """Ouvre la propagation des incertitudes du calcul sur mesure unique."""
+        from .incertitudes import UncertaintyDialog
+        isotope_name = self.isotope_combo.currentText()
+        if isotope_name not in self.isotopes_data:
+            QMessageBox.warning(self, "Erreur", "Veuillez sélectionner un isotope valide.")
+            return
+        gamma_constant = self.calculate_gamma_constant(self.isotopes_data[isotope_name])
+        if gamma_constant <= 0:
+            QMessageBox.warning(self, "Erreur", f"Impossible de calculer pour {isotope_name}: données gamma insuffisantes pour le calcul de la constante.")
+            return
+        dose_unit = self.dose_unit_combo.currentText()
+        factor = unit_registry.factor(dose_unit, "µSv/h")
+        
+        def model(dose_rate, distance):
+            # Même formule que calculate_activity : A (Bq) = D × d² / Γ × 1e6
+            return dose_rate * factor * distance ** 2 / gamma_constant * 1e6
+        
+        inputs = [
+            ("dose_rate", f"Débit de dose ({dose_unit})", Uncertain(self.dose_input.value(), 0.1), None),
+            ("distance", "Distance (m)", Uncertain(self.distance_input.value(), 0.05, relative=False), "m")
+        ]
+        dialog = UncertaintyDialog("Activité d'origine", inputs, model, self.format_activity, self)
+        dialog.exec()
+    
     def calculate_gamma_constant(self, isotope_data):
         """Calcule la constante gamma à partir des données de l'isotope.
         
@@ -290,27 +473,9 @@ class ActiviteOriginDialog(QDialog):
         
         Résultat en (µSv·h⁻¹)/(MBq·m⁻²)
         """
-        
-        total_gamma_contribution = 0
-        
-        # Somme pondérée des énergies par leurs intensités
-        if isotope_data['energie1'] > 0 and isotope_data['intensite1'] > 0:
-            total_gamma_contribution += isotope_data['energie1'] * isotope_data['intensite1']
-        
-        if isotope_data['energie2'] > 0 and isotope_data['intensite2'] > 0:
-            total_gamma_contribution += isotope_data['energie2'] * isotope_data['intensite2']
-        
-        if isotope_data['energie3'] > 0 and isotope_data['intensite3'] > 0:
-            total_gamma_contribution += isotope_data['energie3'] * isotope_data['intensite3']
-        
-        # Facteur de conversion empirique pour obtenir (µSv·h⁻¹)/(MBq·m⁻²)
-        # Facteur calibré pour correspondre aux valeurs expérimentales connues
-        # (basé sur Cobalt-60: constante gamma = 0.35)
-        conversion_factor = 1.4e-3
-        
-        gamma_constant = total_gamma_contribution * conversion_factor
-        
-        return gamma_constant
+        energies = [isotope_data[f'energie{i}'] for i in (1, 2, 3)]
+        intensities = [isotope_data[f'intensite{i}'] for i in (1, 2, 3)]
+        return float(ded.gamma_constant(energies, intensities))
     
     def format_activity(self, activity_bq):
         """Formate l'activité avec l'unité appropriée pour avoir au maximum 2 décimales."""
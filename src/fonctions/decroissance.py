@@ -8,94 +8,149 @@ from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 import os
-from math import log, exp
 import numpy as np
 from ..utils.database import save_to_history
 from ..utils.widgets import ClearingSpinBox
-from ..utils.config_manager import config_manager
+from ..utils.isotope_catalog import isotope_catalog
+from ..utils.formatting import format_activity, format_dose_rate
+from ..utils.decay_chain import get_decay_chain
+from ..core.units import unit_registry
+from ..core import decay
+from ..core.ded import ded1m
 
 class DecroissanceCalculator:
-    """Classe pour calculer la décroissance radioactive."""
+    """Classe pour calculer la décroissance radioactive.
+
+    Les courbes sont calculées en une seule expression NumPy : la grille de
+    temps est un tableau ``datetime64`` et l'activité A(t) = A0 e^(-λt) est
+    évaluée sur tout le tableau, ce qui permet des grilles très fines.
+    """
+    
+    # Nombre de points par défaut des courbes
+    DEFAULT_POINTS = 1000
+    # Débit de dose de la limite publique en mSv/h (2.5 µSv/h)
+    PUBLIC_LIMIT_MSVH = 0.0025
     
-    def __init__(self):
+    def __init__(self, n_points=DEFAULT_POINTS):
         self.initial_activity = 0
-        self.half_life = 0
+        self.half_life = 0  # en heures
         self.start_datetime = None
         self.isotope_name = None  # Ajout du nom de l'isotope
+        self.n_points = n_points
+    
+    @property
+    def decay_constant(self):
+        """Constante de décroissance λ en s⁻¹"""
+        return decay.decay_constant(self.half_life * 3600)  # conversion half_life en secondes
+    
+    def activity_at(self, seconds):
+        """Activité (Bq) après un temps en secondes (scalaire ou tableau)"""
+        return decay.activity_at(self.initial_activity, self.half_life * 3600, seconds)
+    
+    def time_to_activity(self, target_activity):
+        """Temps (s) nécessaire pour que l'activité atteigne la valeur cible"""
+        return decay.time_to_activity(self.initial_activity, self.half_life * 3600, target_activity)
+    
+    def ded_per_bq(self):
+        """DED à 1m (mSv/h) par Bq pour l'isotope sélectionné, 0 si inconnu"""
+        isotope = isotope_catalog.get(self.isotope_name) if self.isotope_name else None
+        if isotope is None:
+            return 0
+        # Calcul du DED avec la formule générique
+        return float(ded1m(1.0, isotope.energies, isotope.intensities))
+    
+    def time_grid(self, duration_seconds, n_points=None):
+        """Grille de temps régulière depuis la date initiale.
+
+        Retourne les temps écoulés (s, float64) et les dates correspondantes
+        (datetime64[ms]).
+        """
+        n_points = n_points or self.n_points
+        seconds = np.linspace(0, duration_seconds, n_points)
+        start = np.datetime64(self.start_datetime, 'ms')
+        dates = start + np.round(seconds * 1000).astype('timedelta64[ms]')
+        return seconds, dates
+    
+    def decay_curve(self, duration_seconds=None, n_points=None):
+        """Courbe de décroissance (dates datetime64, activités en Bq).
+
+        Par défaut, la courbe couvre 10 périodes.
+        """
+        if duration_seconds is None:
+            duration_seconds = self.half_life * 10 * 3600
+        seconds, dates = self.time_grid(duration_seconds, n_points)
+        return dates, self.activity_at(seconds)
+    
+    def decay_chain(self):
+        """Chaîne de décroissance de l'isotope (descendants), ou None"""
+        return get_decay_chain(self.isotope_name) if self.isotope_name else None
+    
+    def chain_curve(self, duration_seconds=None, n_points=None):
+        """Courbes de la chaîne de décroissance (Bateman).
+
+        Retourne les dates (datetime64), les activités (k, n_membres) en Bq et
+        le DED à 1m (mSv/h) incluant les raies gamma des descendants.
+        """
+        chain = self.decay_chain()
+        if chain is None:
+            raise ValueError(f"Aucune chaîne de décroissance connue pour {self.isotope_name}")
+        if duration_seconds is None:
+            duration_seconds = self.half_life * 10 * 3600
+        seconds, dates = self.time_grid(duration_seconds, n_points)
+        activities = chain.activities(seconds, self.initial_activity)
+        return dates, activities, chain.dose_rate(activities)
+    
+    def calculate_ten_periods(self, initial_activity=None, half_life=None, start_datetime=None):
+        """Retourne la date et l'activité après 10 périodes"""
+        if initial_activity is not None:
+            self.initial_activity = initial_activity
+        if half_life is not None:
+            self.half_life = half_life
+        if start_datetime is not None:
+            self.start_datetime = start_datetime
+        end_datetime = self.start_datetime + timedelta(hours=self.half_life * 10)
+        return end_datetime, float(self.activity_at(self.half_life * 10 * 3600))
         
     def plot_decay(self):
         """Génère le graphique de décroissance avec indication des 10 périodes et DED."""
         if not all([self.initial_activity, self.half_life, self.start_datetime]):
             raise ValueError("Les paramètres initiaux doivent être définis")
-            
-        # Calcul de lambda
-        lambda_const = log(2) / (self.half_life * 3600)  # conversion half_life en secondes
         
         # Calcul pour 10 périodes
-        end_datetime = self.start_datetime + timedelta(hours=self.half_life * 10)
-        final_activity = self.initial_activity * exp(-lambda_const * (self.half_life * 10 * 3600))
+        end_datetime, final_activity = self.calculate_ten_periods()
         
-        # Conversion en MBq pour le calcul du DED
-        final_activity_mbq = final_activity * 1e-6  # Conversion de Bq en MBq
-        final_ded = 0  # Initialisation par défaut
-
-        # Récupération des données de l'isotope depuis le fichier
-        try:
-            isotopes_file = config_manager.get_isotopes_path()
-            with open(isotopes_file, "r", encoding='utf-8') as f:
-                for line in f:
-                    if line.strip() and not line.startswith('#'):
-                        values = line.strip().split(';')
-                        name = values[0]
-                        if name == self.isotope_name:
-                            e1, e2, e3 = float(values[3]), float(values[4]), float(values[5])
-                            q1, q2, q3 = float(values[6]), float(values[7]), float(values[8].split(',')[0])
-                            # Calcul du DED avec la formule générique
-                            final_ded = 1.3e-10 * final_activity_mbq * 1e6 * (e1 * q1/100 + e2 * q2/100 + e3 * q3/100)
-                            break
-        except Exception:
-            final_ded = 0
-
-        # Points pour le graphique
-        total_hours = self.half_life * 10
-        time_points = np.linspace(0, total_hours * 3600, 1000)  # en secondes
-        dates = [self.start_datetime + timedelta(seconds=t) for t in time_points]
-        
-        # Calcul des activités selon la loi de décroissance A(t) = A0 * e^(-λt)
-        activities = [self.initial_activity * exp(-lambda_const * t) for t in time_points]
+        # Points pour le graphique (grille datetime64 et activités vectorisées)
+        dates, activities = self.decay_curve()
+        current_datetime = datetime.now()
+        delta_seconds = (current_datetime - self.start_datetime).total_seconds()
         
         # Création du graphique
         plt.figure(figsize=(12, 8))
         plt.plot(dates, activities, 'b-', label='Décroissance')
         
-        # Formatage de l'activité finale avec l'unité adaptée
-        if final_activity >= 1e12:  # TBq
-            activity_str = f"{final_activity * 1e-12:.1f} TBq"
-        elif final_activity >= 1e9:  # GBq
-            activity_str = f"{final_activity * 1e-9:.1f} GBq"
-        elif final_activity >= 1e6:  # MBq
-            activity_str = f"{final_activity * 1e-6:.1f} MBq"
-        elif final_activity >= 1e3:  # kBq
-            activity_str = f"{final_activity * 1e-3:.1f} kBq"
-        else:  # Bq
-            activity_str = f"{final_activity:.1f} Bq"
-
-        # Formatage du débit de dose avec l'unité adaptée
-        if final_ded >= 1:  # > 1 mSv/h
-            ded_str = f"{final_ded:.1f} mSv/h"
-        elif final_ded >= 0.001:  # > 1 µSv/h
-            ded_str = f"{final_ded * 1000:.1f} µSv/h"
-        else:  # < 1 µSv/h
-            ded_str = f"{final_ded * 1000000:.1f} nSv/h"
-
+        chain = self.decay_chain()
+        if chain is not None:
+            # Croissance des descendants et DED incluant leurs raies gamma
+            _, chain_activities, _ = self.chain_curve()
+            for i, name in enumerate(chain.names[1:], start=1):
+                plt.plot(dates, chain_activities[:, i], '--', label=f'{name} (descendant)')
+            final_ded, current_ded = chain.dose_rate(
+                chain.activities([self.half_life * 10 * 3600, delta_seconds], self.initial_activity))
+            # DED par Bq du parent, à l'équilibre atteint après 10 périodes
+            ded_per_bq = final_ded / final_activity
+        else:
+            # DED à 1m par Bq de l'isotope (0 si période personnalisée)
+            ded_per_bq = self.ded_per_bq()
+            final_ded = final_activity * ded_per_bq
+        
         # Ajout du point à 10 périodes avec bulle d'information
         plt.plot(end_datetime, final_activity, 'yo', label='10 périodes',
                 markerfacecolor='yellow', markeredgecolor='black')
         plt.annotate(
             f'Après 10 périodes:\n'
             f'Date: {end_datetime.strftime("%d/%m/%Y %H:%M")}\n'
-            f'Activité: {activity_str}\n'
-            f'DED à 1m: {ded_str}',
+            f'Activité: {format_activity(final_activity)}\n'
+            f'DED à 1m: {format_dose_rate(final_ded)}',
             xy=(end_datetime, final_activity),
             xytext=(0, 30),
             textcoords='offset points',
@@ -105,34 +160,10 @@ class DecroissanceCalculator:
             arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0')
         )
         
-        # Calcul de l'activité actuelle
-        current_datetime = datetime.now()
-        delta_seconds = (current_datetime - self.start_datetime).total_seconds()
-        current_activity = self.initial_activity * exp(-lambda_const * delta_seconds)
-        
-        # Calcul du DED actuel
-        current_activity_mbq = current_activity * 1e-6
-        current_ded = final_ded * (current_activity / final_activity)  # Utilise le même rapport que final_ded
-
-        # Formatage de l'activité actuelle
-        if current_activity >= 1e12:
-            current_activity_str = f"{current_activity * 1e-12:.1f} TBq"
-        elif current_activity >= 1e9:
-            current_activity_str = f"{current_activity * 1e-9:.1f} GBq"
-        elif current_activity >= 1e6:
-            current_activity_str = f"{current_activity * 1e-6:.1f} MBq"
-        elif current_activity >= 1e3:
-            current_activity_str = f"{current_activity * 1e-3:.1f} kBq"
-        else:
-            current_activity_str = f"{current_activity:.1f} Bq"
-
-        # Formatage du DED actuel
-        if current_ded >= 1:
-            current_ded_str = f"{current_ded:.1f} mSv/h"
-        elif current_ded >= 0.001:
-            current_ded_str = f"{current_ded * 1000:.1f} µSv/h"
-        else:
-            current_ded_str = f"{current_ded * 1000000:.1f} nSv/h"
+        # Calcul de l'activité et du DED actuels
+        current_activity = float(self.activity_at(delta_seconds))
+        if chain is None:
+            current_ded = current_activity * ded_per_bq
 
         # Ajout du point actuel avec bulle d'information
         plt.plot(current_datetime, current_activity, 'mo', label='Actuel',
@@ -140,8 +171,8 @@ class DecroissanceCalculator:
         plt.annotate(
             f'Actuellement:\n'
             f'Date: {current_datetime.strftime("%d/%m/%Y %H:%M")}\n'
-            f'Activité: {current_activity_str}\n'
-            f'DED à 1m: {current_ded_str}',
+            f'Activité: {format_activity(current_activity)}\n'
+            f'DED à 1m: {format_dose_rate(current_ded)}',
             xy=(current_datetime, current_activity),
             xytext=(30, 30),
             textcoords='offset points',
@@ -152,27 +183,13 @@ class DecroissanceCalculator:
         )
         
         # Ajout d'une bulle pour DED = 2.5 µSv/h si le DED final > 2.5 µSv/h
-        if final_ded >= 0.0025:  # 2.5 µSv/h en mSv/h
+        if final_ded >= self.PUBLIC_LIMIT_MSVH:
             # Calcul du temps nécessaire pour atteindre 2.5 µSv/h
-            target_ded = 0.0025  # 2.5 µSv/h en mSv/h
-            ratio = target_ded / final_ded
-            target_activity = final_activity * ratio
+            target_activity = self.PUBLIC_LIMIT_MSVH / ded_per_bq
             
             # Calcul de la date correspondante
-            time_to_target = -log(target_activity / self.initial_activity) / lambda_const
+            time_to_target = self.time_to_activity(target_activity)
             target_datetime = self.start_datetime + timedelta(seconds=time_to_target)
-            
-            # Formatage de l'activité cible
-            if target_activity >= 1e12:
-                target_activity_str = f"{target_activity * 1e-12:.1f} TBq"
-            elif target_activity >= 1e9:
-                target_activity_str = f"{target_activity * 1e-9:.1f} GBq"
-            elif target_activity >= 1e6:
-                target_activity_str = f"{target_activity * 1e-6:.1f} MBq"
-            elif target_activity >= 1e3:
-                target_activity_str = f"{target_activity * 1e-3:.1f} kBq"
-            else:
-                target_activity_str = f"{target_activity:.1f} Bq"
 
             # Ajout du point et de la bulle d'information
             plt.plot(target_datetime, target_activity, 'go', label='Périmètre public',
@@ -180,7 +197,7 @@ class DecroissanceCalculator:
             plt.annotate(
                 f'Périmètre public\n'
                 f'Date: {target_datetime.strftime("%d/%m/%Y %H:%M")}\n'
-                f'Activité: {target_activity_str}\n'
+                f'Activité: {format_activity(target_activity)}\n'
                 f'DED à 1m: 2.5 µSv/h',
                 xy=(target_datetime, target_activity),
                 xytext=(60, 150),
@@ -241,15 +258,9 @@ class DecroissanceDialog(QDialog):
         self.isotope_combo = QComboBox()
         self.isotope_combo.addItem("Sélectionner un isotope")
         
-        # Chargement des isotopes depuis le fichier
-        isotopes_file = config_manager.get_isotopes_path()
-        
+        # Chargement des isotopes depuis le catalogue
         try:
-            with open(isotopes_file, "r", encoding='utf-8') as f:
-                for line in f:
-                    if line.strip() and not line.startswith('#'):
-                        isotope, _, period, *_ = line.strip().split(';')
-                        self.isotope_combo.addItem(isotope)
+            self.isotope_combo.addItems(isotope_catalog.names())
         except Exception as e:
             QMessageBox.warning(self, "Erreur", f"Impossible de charger la liste des isotopes: {str(e)}")
     
@@ -323,18 +334,11 @@ class DecroissanceDialog(QDialog):
             self.period_seconds = None
             return
         
-        isotope = self.isotope_combo.currentText()
-        isotopes_file = config_manager.get_isotopes_path()
+        isotope_name = self.isotope_combo.currentText()
         
         try:
-            with open(isotopes_file, "r", encoding='utf-8') as f:
-                for line in f:
-                    if line.strip() and not line.startswith('#'):
-                        values = line.strip().split(';')
-                        name = values[0]
-                        if name == isotope:
-                            self.period_seconds = float(values[2])  # La période est en 3ème position
-                            break
+            isotope = isotope_catalog.get(isotope_name)
+            self.period_seconds = isotope.half_life if isotope is not None else None
         except Exception as e:
             QMessageBox.warning(self, "Erreur", f"Impossible de lire la période de l'isotope: {str(e)}")
             self.period_seconds = None
@@ -350,11 +354,7 @@ class DecroissanceDialog(QDialog):
             initial_activity = self.activity_input.value()
             
             # Conversion de l'activité selon l'unité choisie en Bq
-            unit_factors = {"Bq": 1, "kBq": 1e3, "MBq": 1e6, "GBq": 1e9, "TBq": 1e12}
-            initial_activity_bq = initial_activity * unit_factors[self.activity_unit.currentText()]
-            
-            # Calcul de λ (lambda) = ln(2)/T
-            lambda_const = log(2) / self.period_seconds
+            initial_activity_bq = unit_registry.convert(initial_activity, self.activity_unit.currentText(), "Bq")
             
             # Récupération de la date
             selected_date = self.date_input.date()
@@ -371,36 +371,25 @@ class DecroissanceDialog(QDialog):
             current_datetime = datetime.now()
             delta_seconds = (current_datetime - initial_date).total_seconds()
             
-            # Calcul du nombre de périodes écoulées
-            n_periodes = delta_seconds / self.period_seconds  # Nombre de périodes écoulées
-            current_activity_bq = initial_activity_bq * (0.5 ** n_periodes)  # Division par 2 pour chaque période
+            # Activité actuelle A(t) = A0 e^(-λt)
+            current_activity_bq = float(decay.activity_at(initial_activity_bq, self.period_seconds, delta_seconds))
             current_activity_gbq = current_activity_bq * 1e-9
             
             # Mise à jour des résultats
             # Formatage de l'activité avec l'unité adaptée
-            if current_activity_bq >= 1e12:  # TBq
-                formatted_activity = f"{current_activity_bq * 1e-12:.1f} TBq"
-            elif current_activity_bq >= 1e9:  # GBq
-                formatted_activity = f"{current_activity_bq * 1e-9:.1f} GBq"
-            elif current_activity_bq >= 1e6:  # MBq
-                formatted_activity = f"{current_activity_bq * 1e-6:.1f} MBq"
-            elif current_activity_bq >= 1e3:  # kBq
-                formatted_activity = f"{current_activity_bq * 1e-3:.1f} kBq"
-            else:  # Bq
-                formatted_activity = f"{current_activity_bq:.1f} Bq"
+            formatted_activity = format_activity(current_activity_bq)
             
             self.result_gbq_label.setText(formatted_activity)
             self.result_bq_label.setText(f"{current_activity_bq:.1e} Bq")
             
             # Conversion vers l'unité sélectionnée pour le graphique
             unit_text = self.activity_unit.currentText()
-            unit_factors = {"Bq": 1, "kBq": 1e-3, "MBq": 1e-6, "GBq": 1e-9, "TBq": 1e-12}
-            conversion_factor = unit_factors[unit_text]
+            conversion_factor = unit_registry.factor("Bq", unit_text)
             
             # Préparation des données pour le graphique
             max_plot_time = max(self.period_seconds * 3, delta_seconds * 1.5)
             time_points = np.linspace(0, max_plot_time, 200)
-            activity_points = initial_activity_bq * np.exp(-lambda_const * time_points) * conversion_factor
+            activity_points = decay.activity_at(initial_activity_bq, self.period_seconds, time_points) * conversion_factor
             
             self._time_data_for_plot = time_points / 3600  # Conversion en heures
             self._activity_data_for_plot = activity_points
@@ -428,8 +417,7 @@ class DecroissanceDialog(QDialog):
                 
             # Récupération des données initiales
             initial_activity = self.activity_input.value()
-            unit_factors = {"Bq": 1, "kBq": 1e3, "MBq": 1e6, "GBq": 1e9, "TBq": 1e12}
-            initial_activity_bq = initial_activity * unit_factors[self.activity_unit.currentText()]
+            initial_activity_bq = unit_registry.convert(initial_activity, self.activity_unit.currentText(), "Bq")
             
             # Utilisation directe de period_seconds au lieu des widgets
             period_hours = self.period_seconds / 3600  # Conversion secondes en heures
@@ -6,39 +6,24 @@ from PySide6.QtCore import Qt
 import os
 from src.utils.widgets import ClearingDoubleSpinBox
 from src.utils.database import save_to_history
+from src.utils.isotope_catalog import isotope_catalog
+from src.utils.formatting import format_dose_rate
+from src.utils.uncertainty import Uncertain
+from src.core.units import unit_registry
+from src.core.ded import ded1m
+# Table en colonnes, déplacée dans le noyau (ré-exportée pour compatibilité)
+from src.core.library import USAGE_CODES, IsotopeTable
 
 def load_isotopes():
-    """Charge les isotopes depuis le fichier texte."""
+    """Charge les isotopes depuis le catalogue partagé."""
     isotopes = {}
     try:
-        # Utiliser le gestionnaire de configuration pour obtenir le chemin
-        from ..utils.config_manager import config_manager
-        isotopes_path = config_manager.get_isotopes_path()
-        
-        with open(isotopes_path, 'r', encoding='utf-8') as file:
-            for line in file:
-                if line.startswith("//") or not line.strip():
-                    continue
-                data = line.strip().split(';')
-                if len(data) >= 9:
-                    name = data[0]
-                    # Sépare le type d'usage des valeurs numériques
-                    numeric_values = data[1:9]
-                    usage_type = data[8].split(',')[1] if ',' in data[8] else "N/A"
-                    
-                    # Conversion des valeurs numériques uniquement
-                    try:
-                        values = [float(x.split(',')[0] if ',' in x else x) 
-                                for x in numeric_values]
-                        values.append(usage_type)  # Ajoute le type d'usage comme chaîne
-                        isotopes[name] = values
-                    except ValueError as e:
-                        print(f"Erreur de conversion pour {name}: {e}")
-                        continue
-                    
+        # Format historique : [A, T, E1, E2, E3, Q1, Q2, Q3, usage]
+        for isotope in isotope_catalog:
+            isotopes[isotope.name] = isotope.as_list()
     except FileNotFoundError:
         QMessageBox.critical(None, "Fichier Non Trouvé", 
-            f"Fichier isotopes.txt non trouvé à {isotopes_path}")
+            f"Fichier isotopes.txt non trouvé à {isotope_catalog.path}")
     except Exception as e:
         QMessageBox.critical(None, "Erreur", 
             f"Erreur lors du chargement des isotopes: {e}")
@@ -56,13 +41,23 @@ except Exception as e:
     ISOTOPES = {}
     ISOTOPE_NAMES = []
 
+
+def get_isotope_table():
+    """Retourne la table en colonnes, reconstruite si le catalogue a été rechargé."""
+    return isotope_catalog.table()
+
+try:
+    ISOTOPE_TABLE = get_isotope_table()
+except Exception:
+    ISOTOPE_TABLE = IsotopeTable([])
+
 class Ded1mDialog(QDialog):  # Renommé de Ded1mDialog à DED1MDialog
     """Dialog pour le calcul du débit de dose à 1m."""
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Calcul DED à 1m")
-        self.setFixedSize(300, 220)
+        self.setFixedSize(300, 280)
 
         self.layout = QVBoxLayout(self)
 
@@ -119,6 +114,16 @@ class Ded1mDialog(QDialog):  # Renommé de Ded1mDialog à DED1MDialog
         self.manual_mode_button.clicked.connect(self.open_manual_mode)
         self.layout.addWidget(self.manual_mode_button)
 
+        self.uncertainty_button = QPushButton("Incertitudes")
+        self.uncertainty_button.setToolTip("Propagation Monte-Carlo de l'incertitude sur l'activité")
+        self.uncertainty_button.clicked.connect(self.open_uncertainty)
+        self.layout.addWidget(self.uncertainty_button)
+
+        self.stay_time_button = QPushButton("Dose intégrée / séjour")
+        self.stay_time_button.setToolTip("Dose cumulée et durée maximale de séjour des agents")
+        self.stay_time_button.clicked.connect(self.open_stay_time)
+        self.layout.addWidget(self.stay_time_button)
+
         self.layout.addStretch(1)
 
         # Ajout du label pour le type d'usage après la combobox
@@ -131,14 +136,9 @@ class Ded1mDialog(QDialog):  # Renommé de Ded1mDialog à DED1MDialog
 
     def update_usage_type(self, isotope_name):
         """Met à jour l'affichage du type d'usage quand un isotope est sélectionné."""
-        if isotope_name in ISOTOPES:
-            usage = ISOTOPES[isotope_name][-1]  # Le type est la dernière valeur
-            usage_text = {
-                "Med": "Médical",
-                "Ind": "Industriel",
-                "Mil": "Militaire"
-            }.get(usage, "Non spécifié")
-            self.usage_type_label.setText(usage_text)
+        isotope = isotope_catalog.get(isotope_name)
+        if isotope is not None:
+            self.usage_type_label.setText(isotope.usage_label)
         else:
             self.usage_type_label.setText("")
 
@@ -150,26 +150,14 @@ class Ded1mDialog(QDialog):  # Renommé de Ded1mDialog à DED1MDialog
             unit = self.activity_unit.currentText()
 
             # Conversion en Bq selon l'unité sélectionnée
-            conversion = {
-                "Bq": 1,
-                "kBq": 1e3,
-                "MBq": 1e6,
-                "GBq": 1e9,
-                "TBq": 1e12
-            }
-            
-            activity_bq = activity_value * conversion[unit]
+            activity_bq = unit_registry.convert(activity_value, unit, "Bq")
             
-            if not selected_isotope_name or selected_isotope_name not in ISOTOPES:
+            isotope = isotope_catalog.get(selected_isotope_name)
+            if not selected_isotope_name or isotope is None:
                 QMessageBox.warning(self, "Erreur Saisie", "Veuillez sélectionner un isotope valide.")
                 return
 
-            isotope_data = ISOTOPES[selected_isotope_name]
-            e1, e2, e3 = isotope_data[2:5]
-            # Conversion des pourcentages en décimales (division par 100)
-            q1, q2, q3 = [x/100 for x in isotope_data[5:8]]
-
-            ded1m_msvh = 1.3e-10 * activity_bq * (e1 * q1 + e2 * q2 + e3 * q3)
+            ded1m_msvh = float(ded1m(activity_bq, isotope.energies, isotope.intensities))
             ded1m_msvh = round(ded1m_msvh, 4)  # Augmentation de la précision
             ded1m_usvh = round(ded1m_msvh * 1e3, 2)
 
@@ -196,6 +184,36 @@ class Ded1mDialog(QDialog):  # Renommé de Ded1mDialog à DED1MDialog
         manual_dialog = Ded1mManualDialog(self)
         manual_dialog.exec()
 
+    def open_stay_time(self):
+        """Ouvre le calcul de dose intégrée avec le DED à 1m et la période de l'isotope."""
+        from .sejour import StayTimeDialog
+        isotope = isotope_catalog.get(self.isotope_selection_combo.currentText())
+        if isotope is None:
+            QMessageBox.warning(self, "Erreur Saisie", "Veuillez sélectionner un isotope valide.")
+            return
+        activity_bq = unit_registry.convert(self.activity_ded1m_input.value(), self.activity_unit.currentText(), "Bq")
+        ded1m_usvh = float(ded1m(activity_bq, isotope.energies, isotope.intensities)) * 1e3
+        dialog = StayTimeDialog(ded1m_usvh, isotope.half_life, self)
+        dialog.exec()
+
+    def open_uncertainty(self):
+        """Ouvre la propagation des incertitudes pour l'isotope et l'activité saisis."""
+        from .incertitudes import UncertaintyDialog
+        isotope = isotope_catalog.get(self.isotope_selection_combo.currentText())
+        if isotope is None:
+            QMessageBox.warning(self, "Erreur Saisie", "Veuillez sélectionner un isotope valide.")
+            return
+        unit = self.activity_unit.currentText()
+        # DED à 1m (mSv/h) par unité d'activité saisie, même formule que calculate_ded1m
+        dose_rate_per_unit = float(ded1m(unit_registry.factor(unit, "Bq"), isotope.energies, isotope.intensities))
+
+        def model(activity):
+            return activity * dose_rate_per_unit
+
+        inputs = [("activity", f"Activité ({unit})", Uncertain(self.activity_ded1m_input.value(), 0.05), None)]
+        dialog = UncertaintyDialog("DED à 1m", inputs, model, format_dose_rate, self)
+        dialog.exec()
+
 class Ded1mManualDialog(QDialog):
     """Dialog pour le calcul manuel du débit de dose à 1m."""
     
@@ -283,8 +301,9 @@ class Ded1mManualDialog(QDialog):
             e1, e2, e3 = self.e1_input.value(), self.e2_input.value(), self.e3_input.value()
             q1, q2, q3 = self.q1_input.value(), self.q2_input.value(), self.q3_input.value()
 
-            activity_bq = activity_gbq * 1e9
-            ded1m_msvh = 1.3e-10 * activity_bq * (e1 * q1 + e2 * q2 + e3 * q3)
+            activity_bq = unit_registry.convert(activity_gbq, "GBq", "Bq")
+            # Rendements saisis en fraction, la formule les attend en %
+            ded1m_msvh = float(ded1m(activity_bq, [e1, e2, e3], [q1 * 100, q2 * 100, q3 * 100]))
             ded1m_msvh = round(ded1m_msvh, 2)
 
             self.manual_ded1m_result_label.setText(f"{ded1m_msvh} mSv/h")
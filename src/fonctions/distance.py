@@ -4,9 +4,12 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 import matplotlib.pyplot as plt
-import numpy as np
 from ..utils.widgets import ClearingDoubleSpinBox
 from ..utils.database import save_to_history
+from ..utils.uncertainty import Uncertain
+from ..core.units import unit_registry
+from ..core.distance import dose_rate_at
+from ..core.geometry import GEOMETRIES, GEOMETRY_LABELS, LINE, DISC, RECTANGLE, extended_dose_rate_at
 
 class DistanceDialog(QDialog):
     """Dialog pour le calcul de distance."""
@@ -17,7 +20,7 @@ class DistanceDialog(QDialog):
         self.setup_ui()
 
     def setup_ui(self):
-        self.setFixedSize(500, 150)
+        self.setFixedSize(500, 215)
         
         self.layout = QGridLayout(self)
         
@@ -81,6 +84,84 @@ class DistanceDialog(QDialog):
         self.plot_button.setEnabled(False)  # Désactivé par défaut
         self.layout.addWidget(self.plot_button, 2, 4)
         self.plot_button.clicked.connect(self.show_plot)
+
+        # Carte 2D (plusieurs sources, murs)
+        self.map_button = QPushButton("Carte de dose")
+        self.map_button.setToolTip("Carte du débit de dose autour de la source, murs et sources supplémentaires")
+        self.layout.addWidget(self.map_button, 4, 4)
+        self.map_button.clicked.connect(self.show_dose_map)
+
+        # Propagation des incertitudes (mesure et distances)
+        self.uncertainty_button = QPushButton("Incertitudes")
+        self.uncertainty_button.setToolTip("Propagation Monte-Carlo des incertitudes de mesure et de distance")
+        self.layout.addWidget(self.uncertainty_button, 4, 2)
+        self.uncertainty_button.clicked.connect(self.show_uncertainty)
+
+        # Dose cumulée sur la durée du séjour
+        self.stay_time_button = QPushButton("Dose intégrée")
+        self.stay_time_button.setToolTip("Dose cumulée et durée maximale de séjour des agents")
+        self.layout.addWidget(self.stay_time_button, 4, 0)
+        self.stay_time_button.clicked.connect(self.show_stay_time)
+
+        # Géométrie de la source (ponctuelle par défaut)
+        self.layout.addWidget(QLabel("Géométrie"), 5, 0)
+        self.geometry_combo = QComboBox()
+        self.geometry_combo.addItems(["Ponctuelle"] + [GEOMETRY_LABELS[g] for g in GEOMETRIES])
+        self.geometry_combo.setToolTip("Source ponctuelle (1/d²), linéique, en disque ou rectangulaire")
+        self.layout.addWidget(self.geometry_combo, 5, 1)
+
+        self.size_input = ClearingDoubleSpinBox()
+        self.size_input.setDecimals(2)
+        self.size_input.setRange(0.0, 10000.0)
+        self.size_input.setValue(1.0)
+        self.size_input.setSuffix(" m")
+        self.layout.addWidget(self.size_input, 5, 2, 1, 2)
+
+        self.depth_input = ClearingDoubleSpinBox()
+        self.depth_input.setDecimals(2)
+        self.depth_input.setRange(0.0, 10000.0)
+        self.depth_input.setValue(1.0)
+        self.depth_input.setPrefix("l = ")
+        self.depth_input.setSuffix(" m")
+        self.depth_input.setToolTip("Profondeur du rectangle (m)")
+        self.layout.addWidget(self.depth_input, 5, 4)
+
+        self.geometry_combo.currentIndexChanged.connect(self.update_geometry_inputs)
+        self.update_geometry_inputs(0)
+
+    def update_geometry_inputs(self, index):
+        """Adapte les champs de dimension à la géométrie choisie."""
+        geometry = self.current_geometry()
+        prefixes = {None: "", LINE: "L = ", DISC: "R = ", RECTANGLE: "L = "}
+        tooltips = {
+            None: "Source ponctuelle : pas de dimension",
+            LINE: "Longueur de la source linéique (m), distances mesurées depuis son milieu",
+            DISC: "Rayon du disque (m), distances mesurées à la verticale de son centre",
+            RECTANGLE: "Largeur du rectangle (m), distances mesurées à la verticale de son centre"
+        }
+        self.size_input.setPrefix(prefixes[geometry])
+        self.size_input.setToolTip(tooltips[geometry])
+        self.size_input.setEnabled(geometry is not None)
+        self.depth_input.setEnabled(geometry == RECTANGLE)
+
+    def current_geometry(self):
+        """Géométrie choisie (None pour une source ponctuelle)."""
+        index = self.geometry_combo.currentIndex()
+        return GEOMETRIES[index - 1] if index > 0 else None
+
+    def _geometry_parameters(self):
+        """(géométrie, dimension, rapport profondeur / largeur) de la source saisie."""
+        geometry = self.current_geometry()
+        size = self.size_input.value()
+        aspect = self.depth_input.value() / size if geometry == RECTANGLE and size > 0 else 1.0
+        return geometry, size, aspect
+
+    def _dose_rate_at(self, ded1, d1, d2):
+        """Débit à d2 selon la géométrie : 1/d² ou table de la source étendue."""
+        geometry, size, aspect = self._geometry_parameters()
+        if geometry is None:
+            return dose_rate_at(ded1, d1, d2)
+        return extended_dose_rate_at(geometry, ded1, d1, d2, size, aspect)
         
     def calculate_distance(self):
         """Calcule le débit de dose à une distance donnée."""
@@ -109,8 +190,15 @@ class DistanceDialog(QDialog):
                 self.actual_distance_result_label.setText("Débit de dose négatif")
                 return
 
-            # Calcul selon la loi inverse du carré de la distance
-            result = round((ded1 * d1 ** 2) / (d2 ** 2), 2)
+            geometry, size, aspect = self._geometry_parameters()
+            if geometry is not None and (size <= 0 or aspect <= 0):
+                QMessageBox.warning(self, "Erreur Saisie",
+                                  "Les dimensions de la source doivent être strictement positives.")
+                self.actual_distance_result_label.setText("Dimension de source nulle")
+                return
+
+            # Loi inverse du carré de la distance ou source étendue
+            result = round(float(self._dose_rate_at(ded1, d1, d2)), 2)
             self.actual_distance_result_label.setText(f"{result} {chosen_unit} à {d2} m")
             
             # Activation du bouton du graphique
@@ -120,11 +208,15 @@ class DistanceDialog(QDialog):
             
 
             # Sauvegarde dans l'historique
-            save_to_history([
+            history = [
                 "Distance",
                 f"Debit de dose connu: {ded1} {chosen_unit} à {d1} mètres",
                 f"Debit de dose calcule: {result} {chosen_unit} à {d2} mètres"
-            ])
+            ]
+            if geometry is not None:
+                dimensions = (f"{size:g} x {aspect * size:g} m" if geometry == RECTANGLE else f"{size:g} m")
+                history.append(f"Source {GEOMETRY_LABELS[geometry].lower()}: {dimensions}")
+            save_to_history(history)
 
         except ValueError:
             QMessageBox.critical(self, "Erreur Saisie", 
@@ -135,8 +227,58 @@ class DistanceDialog(QDialog):
     def show_plot(self):
         """Affiche la fenêtre du graphique."""
         from .plot_window import PlotDialog
+        from .geometrie import GeometryProfileDialog
         if hasattr(self, '_last_calculation'):
             d1, d2, ded1, result = self._last_calculation
             unit = self.unit_choice_combo.currentText()
-            dialog = PlotDialog(d1, d2, ded1, result, unit, self)
-            dialog.exec()
\ No newline at end of file
+            geometry, size, aspect = self._geometry_parameters()
+            if geometry is None:
+                dialog = PlotDialog(d1, d2, ded1, result, unit, self)
+            else:
+                dialog = GeometryProfileDialog(geometry, size, aspect, d1, ded1, unit, d2, self)
+            dialog.exec()
+
+    def show_uncertainty(self):
+        """Affiche la propagation des incertitudes du débit de dose à la distance souhaitée."""
+        from .incertitudes import UncertaintyDialog
+        d1 = self.d1_input.value()
+        d2 = self.d2_input.value()
+        if d1 <= 0 or d2 <= 0:
+            QMessageBox.warning(self, "Erreur Saisie", "Les distances doivent être strictement positives.")
+            return
+        unit = self.unit_choice_combo.currentText()
+
+        def model(ded1, d1, d2):
+            # Même loi que calculate_distance (1/d² ou source étendue)
+            return self._dose_rate_at(ded1, d1, d2)
+
+        inputs = [
+            ("ded1", f"Débit de dose ({unit})", Uncertain(self.ded1_input.value(), 0.1), None),
+            ("d1", "Distance initiale (m)", Uncertain(d1, 0.05, relative=False), "m"),
+            ("d2", "Distance souhaitée (m)", Uncertain(d2, 0.05, relative=False), "m")
+        ]
+        dialog = UncertaintyDialog("Distance", inputs, model, lambda value: f"{value:.3g} {unit}", self)
+        dialog.exec()
+
+    def show_stay_time(self):
+        """Affiche le calcul de dose intégrée, initialisé avec la source saisie."""
+        from .sejour import StayTimeDialog
+        # DED à 1 m en µSv/h selon la loi inverse du carré de la distance
+        factor = unit_registry.factor(self.unit_choice_combo.currentText(), "µSv/h")
+        dose_rate_1m = self.ded1_input.value() * self.d1_input.value() ** 2 * factor
+        dialog = StayTimeDialog(dose_rate_1m, parent=self)
+        dialog.exec()
+
+    def show_dose_map(self):
+        """Affiche la carte de débit de dose, initialisée avec la source saisie."""
+        from .plot_window import DoseMapDialog
+        from ..utils.dose_field import PointSource
+        sources = []
+        d1 = self.d1_input.value()
+        ded1 = self.ded1_input.value()
+        if d1 > 0 and ded1 > 0:
+            # DED à 1 m en µSv/h selon la loi inverse du carré de la distance
+            factor = unit_registry.factor(self.unit_choice_combo.currentText(), "µSv/h")
+            sources.append(PointSource(0.0, 0.0, ded1 * d1 ** 2 * factor))
+        dialog = DoseMapDialog(sources, parent=self)
+        dialog.exec()
\ No newline at end of file
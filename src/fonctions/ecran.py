@@ -5,21 +5,31 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 import os
-import math
-from ..utils.config_manager import config_manager
+import numpy as np
+from ..utils.isotope_catalog import isotope_catalog
+from ..utils.formatting import format_dose_rate
+from ..utils.widgets import ClearingDoubleSpinBox
+from ..core.shielding import line_weights, required_thickness, transmission
+from ..core.ded import ded1m
+from ..utils.attenuation import attenuation_library
+from ..utils.buildup import buildup_library
+from ..utils.shield_optimizer import Layer, optimize_stack
+from ..utils.uncertainty import Uncertain
+from ..core.units import unit_registry
 
 class EcranDialog(QDialog):
+    # Unités d'activité proposées (facteurs dans le registre des unités)
+    ACTIVITY_UNITS = ["Bq", "kBq", "MBq", "GBq", "TBq"]
+
+    # Balayage des épaisseurs (cm) pour le calcul en faisceau large
+    SWEEP_MAX_THICKNESS = 50
+    SWEEP_STEP = 0.01
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Calcul Écran")
         self.setMinimumSize(500, 400)
         
-        # Définition des coefficients d'atténuation (en cm^-1)
-        self.mu_data = {
-            "plomb": [(0.5, 1.7), (1.0, 0.8), (2.0, 0.5), (3.0, 0.4)],
-            "plexiglas": [(0.5, 0.1), (1.0, 0.07), (2.0, 0.05), (3.0, 0.04)]
-        }
-        
         # Chargement des isotopes
         self.isotopes_data = {}
         self.load_isotopes()
@@ -28,24 +38,13 @@ class EcranDialog(QDialog):
         self.setup_ui()
 
     def load_isotopes(self):
-        """Charge les données des isotopes depuis le fichier."""
-        isotopes_file = config_manager.get_isotopes_path()
-        
+        """Charge les données des isotopes depuis le catalogue partagé."""
         try:
-            with open(isotopes_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip() and not line.startswith('#'):
-                        parts = line.strip().split(';')
-                        if len(parts) >= 9:
-                            name = parts[0]
-                            energies = [float(parts[i]) for i in range(3, 6)]
-                            abundances = [float(parts[i].split(',')[0] if i == 8 else parts[i]) 
-                                        for i in range(6, 9)]
-                            
-                            self.isotopes_data[name] = {
-                                'energies': energies,
-                                'abundances': abundances
-                            }
+            for isotope in isotope_catalog:
+                self.isotopes_data[isotope.name] = {
+                    'energies': list(isotope.energies),
+                    'abundances': list(isotope.intensities)
+                }
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Impossible de charger les isotopes: {str(e)}")
 
@@ -61,7 +60,7 @@ class EcranDialog(QDialog):
         self.activity_input.setPlaceholderText("Entrez l'activité")
         
         self.unit_combo = QComboBox()
-        self.unit_combo.addItems(["Bq", "kBq", "MBq", "GBq", "TBq"])
+        self.unit_combo.addItems(self.ACTIVITY_UNITS)
         
         activity_layout.addWidget(self.activity_input)
         activity_layout.addWidget(self.unit_combo)
@@ -82,7 +81,11 @@ class EcranDialog(QDialog):
         material_layout = QHBoxLayout()
         
         self.material_combo = QComboBox()
-        self.material_combo.addItems(["Plomb", "Plexiglas"])  # Suppression du béton
+        try:
+            for material in attenuation_library.materials():
+                self.material_combo.addItem(material.label, material.key)
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Impossible de charger les coefficients d'atténuation: {str(e)}")
         
         material_layout.addWidget(self.material_combo)
         material_group.setLayout(material_layout)
@@ -110,10 +113,61 @@ class EcranDialog(QDialog):
         
         thickness_group.setLayout(thickness_layout)
         
+        # Section débit de dose cible
+        target_group = QGroupBox("Débit de dose cible")
+        target_layout = QHBoxLayout()
+        
+        self.target_input = ClearingDoubleSpinBox()
+        self.target_input.setDecimals(3)
+        self.target_input.setRange(0.001, 1e9)
+        self.target_input.setValue(2.5)
+        self.target_input.setSuffix(" µSv/h")
+        self.target_input.setToolTip("Débit de dose à atteindre derrière l'écran")
+        
+        target_layout.addWidget(self.target_input)
+        target_group.setLayout(target_layout)
+        
+        # Section écran multicouche
+        layers_group = QGroupBox("Écran multicouche (3 couches max.)")
+        layers_layout = QFormLayout()
+        
+        self.layer_combos = []
+        self.layer_max_inputs = []
+        for i in range(3):
+            combo = QComboBox()
+            combo.addItem("—", None)
+            for j in range(self.material_combo.count()):
+                combo.addItem(self.material_combo.itemText(j), self.material_combo.itemData(j))
+            max_input = ClearingDoubleSpinBox()
+            max_input.setDecimals(1)
+            max_input.setRange(0.1, 300)
+            max_input.setValue(20)
+            max_input.setSuffix(" cm max")
+            row = QHBoxLayout()
+            row.addWidget(combo)
+            row.addWidget(max_input)
+            layers_layout.addRow(f"Matériau {i + 1}:", row)
+            self.layer_combos.append(combo)
+            self.layer_max_inputs.append(max_input)
+        
+        self.objective_combo = QComboBox()
+        self.objective_combo.addItem("Masse minimale", "mass")
+        self.objective_combo.addItem("Épaisseur minimale", "thickness")
+        layers_layout.addRow("Critère:", self.objective_combo)
+        
+        optimize_btn = QPushButton("Optimiser l'empilement")
+        optimize_btn.clicked.connect(self.optimize_layers)
+        layers_layout.addRow(optimize_btn)
+        layers_group.setLayout(layers_layout)
+        
         # Bouton de calcul
         calculate_btn = QPushButton("Calculer")
         calculate_btn.clicked.connect(self.calculate_shield)
         
+        uncertainty_btn = QPushButton("Incertitudes")
+        uncertainty_btn.setToolTip("Propagation Monte-Carlo des incertitudes d'activité et d'épaisseur")
+        uncertainty_btn.clicked.connect(self.open_uncertainty)
+        
         # Résultat
         self.result_label = QLabel()
         self.result_label.setWordWrap(True)
@@ -123,69 +177,50 @@ class EcranDialog(QDialog):
         layout.addWidget(isotope_group)
         layout.addWidget(material_group)
         layout.addWidget(thickness_group)
+        layout.addWidget(target_group)
+        layout.addWidget(layers_group)
         layout.addWidget(calculate_btn)
+        layout.addWidget(uncertainty_btn)
         layout.addWidget(self.result_label)
         
         self.setLayout(layout)
 
+    def activity_bq(self):
+        """Activité saisie en Bq (une unité tapée avec la valeur prime sur le menu)."""
+        return unit_registry.parse_to(self.activity_input.text(), "Bq", default_unit=self.unit_combo.currentText())
+
     def format_dose_rate(self, dose_rate):
         """Formate le débit de dose avec l'unité appropriée."""
-        if dose_rate >= 1000:  # Plus de 1000 mSv/h -> Sv/h
-            return f"{dose_rate/1000:.1f} Sv/h"
-        elif dose_rate >= 1:  # Entre 1 et 1000 mSv/h
-            return f"{dose_rate:.1f} mSv/h"
-        elif dose_rate >= 0.001:  # Entre 0.001 et 1 mSv/h -> µSv/h
-            return f"{dose_rate * 1000:.1f} µSv/h"
-        else:  # Moins de 1 µSv/h -> nSv/h
-            return f"{dose_rate * 1000000:.1f} nSv/h"
+        return format_dose_rate(dose_rate)
 
     def calculate_shield(self):
-        """Calcule le facteur d'atténuation pour l'épaisseur donnée."""
+        """Calcule le facteur d'atténuation (faisceau large) pour l'épaisseur donnée."""
         try:
             # Récupération des valeurs
-            activity = float(self.activity_input.text())
-            unit = self.unit_combo.currentText()
             isotope = self.isotope_combo.currentText()
-            material = self.material_combo.currentText().lower()
+            material = self.material_combo.currentData()
             thickness = float(self.thickness_slider.value())  # Utilisation du slider
             
             # Conversion en Bq
-            unit_factors = {
-                "Bq": 1,
-                "kBq": 1e3,
-                "MBq": 1e6,
-                "GBq": 1e9,
-                "TBq": 1e12
-            }
+            activity_bq = self.activity_bq()
             
-            activity_bq = activity * unit_factors[unit]
-            
-            # Initialisation du facteur à 1
-            total_factor = 1
-            
-            # Calcul du facteur d'atténuation pour chaque énergie
             isotope_data = self.isotopes_data[isotope]
             energies = isotope_data['energies']
             abundances = isotope_data['abundances']
             
-            for energy, abundance in zip(energies, abundances):
-                if energy > 0 and abundance > 0:
-                    mu = self.get_mu(material, energy)
-                    if mu is not None:  # Vérifie que mu existe
-                        # Calcul du facteur d'atténuation: e^(μx)
-                        attenuation = math.exp(mu * thickness)
-                        total_factor = max(total_factor, attenuation)
-            
-            # Calcul des débits de dose
+            # Débit de dose en faisceau large sur tout le balayage d'épaisseur
             initial_dose_rate = self.calculate_dose_rate(activity_bq, energies, abundances)
-            final_dose_rate = initial_dose_rate / total_factor
+            thicknesses, dose_rates = self.shield_sweep(initial_dose_rate, energies, abundances, material)
+            final_dose_rate = dose_rates[int(round(thickness / self.SWEEP_STEP))]
+            total_factor = initial_dose_rate / final_dose_rate if final_dose_rate > 0 else 1
             
             # Formatage des résultats
             initial_dose_str = self.format_dose_rate(initial_dose_rate)
             final_dose_str = self.format_dose_rate(final_dose_rate)
             
-            # Calcul de l'épaisseur recommandée pour 2.5 µSv/h
-            target_dose_rate = 2.5e-3  # 2.5 µSv/h = 0.0025 mSv/h
+            # Calcul de l'épaisseur recommandée pour le débit cible
+            target_usvh = self.target_input.value()
+            target_dose_rate = target_usvh * 1e-3  # µSv/h -> mSv/h
             recommended_thickness = self.calculate_required_thickness(
                 target_dose_rate, 
                 activity_bq, 
@@ -201,80 +236,143 @@ class EcranDialog(QDialog):
             
             # Ajout de la recommandation
             if recommended_thickness is not None:
-                result += f"\nPour atteindre 2.5 µSv/h il est recommandée un écran de: {recommended_thickness:.1f} cm"
+                result += f"\nPour atteindre {target_usvh:g} µSv/h il est recommandée un écran de: {recommended_thickness:.2f} cm"
             else:
-                result += "\nImpossible d'atteindre 2.5 µSv/h avec une épaisseur raisonnable"
+                result += f"\nImpossible d'atteindre {target_usvh:g} µSv/h avec une épaisseur raisonnable"
 
             self.result_label.setText(result)
             
         except Exception as e:
             QMessageBox.critical(self, "Erreur", f"Erreur de calcul: {str(e)}")
 
-    def get_mu(self, material, energy):
-        """Obtient le coefficient d'atténuation pour un matériau et une énergie."""
-        if material not in self.mu_data:
-            return None
+    def optimize_layers(self):
+        """Recherche l'empilement de couches atteignant le débit cible."""
+        try:
+            activity_bq = self.activity_bq()
+            isotope_data = self.isotopes_data[self.isotope_combo.currentText()]
+            energies = isotope_data['energies']
+            abundances = isotope_data['abundances']
             
-        data_points = self.mu_data[material]
-        
-        # Si l'énergie est inférieure au minimum ou supérieure au maximum
-        min_energy = data_points[0][0]
-        max_energy = data_points[-1][0]
+            layers = []
+            for combo, max_input in zip(self.layer_combos, self.layer_max_inputs):
+                material = combo.currentData()
+                if material is None or any(layer.material == material for layer in layers):
+                    continue
+                max_thickness = max_input.value()
+                # Pas de 0.1 mm jusqu'à 2.5 cm, puis environ 250 valeurs par couche
+                step = max(0.01, round(max_thickness / 250, 2))
+                layers.append(Layer(material, 0.0, max_thickness, step))
+            if not layers:
+                QMessageBox.warning(self, "Attention", "Veuillez choisir au moins un matériau")
+                return
+            
+            initial_dose_rate = self.calculate_dose_rate(activity_bq, energies, abundances)
+            target_usvh = self.target_input.value()
+            if initial_dose_rate <= 0:
+                QMessageBox.warning(self, "Attention", "Cet isotope n'a pas d'émission gamma exploitable")
+                return
+            
+            objective = self.objective_combo.currentData()
+            result = optimize_stack(energies, abundances, target_usvh * 1e-3 / initial_dose_rate, layers, objective)
+            
+            if result is None:
+                text = f"Aucun empilement n'atteint {target_usvh:g} µSv/h dans les bornes choisies"
+            elif not result.materials:
+                text = f"Aucun écran nécessaire pour atteindre {target_usvh:g} µSv/h"
+            else:
+                labels = {self.material_combo.itemData(i): self.material_combo.itemText(i)
+                          for i in range(self.material_combo.count())}
+                stack = " + ".join(f"{labels.get(m, m)} {t:.2f} cm"
+                                   for m, t in zip(result.materials, result.thicknesses))
+                text = (f"Empilement optimal: {stack}\n"
+                        f"Épaisseur totale: {result.total_thickness:.2f} cm - "
+                        f"Masse surfacique: {result.areal_mass:.1f} g/cm²\n"
+                        f"Débit de dose après écran: "
+                        f"{self.format_dose_rate(initial_dose_rate * result.transmission)}")
+            self.result_label.setText(text)
+            
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur d'optimisation: {str(e)}")
+
+    def open_uncertainty(self):
+        """Ouvre la propagation des incertitudes du débit de dose après écran."""
+        from .incertitudes import UncertaintyDialog
+        try:
+            activity, unit = unit_registry.parse(self.activity_input.text(), self.unit_combo.currentText())
+            material = self.material_combo.currentData()
+            isotope_data = self.isotopes_data[self.isotope_combo.currentText()]
+        except (ValueError, KeyError):
+            QMessageBox.warning(self, "Attention", "Veuillez saisir une activité et un isotope valides")
+            return
+        energies = isotope_data['energies']
+        abundances = isotope_data['abundances']
         
-        if energy <= min_energy:
-            return data_points[0][1]
-        if energy >= max_energy:
-            return data_points[-1][1]
+        # Débit à 1 m par unité d'activité saisie, transmission en faisceau large
+        dose_rate_per_unit = self.calculate_dose_rate(unit_registry.factor(unit, "Bq"), energies, abundances)
+        # μ et B sous la table G-P évalués à sa première énergie (majorant)
+        shield_energies = buildup_library.shielding_energies(material, energies)
+        mu = attenuation_library.mu(material, shield_energies)
+        weights = line_weights(energies, abundances)
+        buildup = buildup_library.table(material, shield_energies)
         
-        # Trouve les points d'encadrement
-        for i in range(len(data_points)-1):
-            e1, mu1 = data_points[i]
-            e2, mu2 = data_points[i+1]
-            
-            if e1 <= energy <= e2:
-                # Interpolation linéaire
-                return mu1 + (mu2 - mu1) * (energy - e1) / (e2 - e1)
+        def model(activity, thickness):
+            return activity * dose_rate_per_unit * transmission(thickness, mu, weights, buildup)
         
-        return None
+        inputs = [
+            ("activity", f"Activité ({unit})", Uncertain(activity, 0.05), None),
+            ("thickness", "Épaisseur (cm)", Uncertain(float(self.thickness_slider.value()), 0.1, relative=False), "cm")
+        ]
+        dialog = UncertaintyDialog("Débit de dose après écran", inputs, model, self.format_dose_rate, self)
+        dialog.exec()
+
+    def get_mu(self, material, energy):
+        """Obtient le coefficient d'atténuation (cm⁻¹) pour un matériau et une énergie."""
+        if material not in attenuation_library:
+            return None
+        return float(attenuation_library.mu(material, energy))
+
+    def shield_sweep(self, initial_dose_rate, energies, abundances, material):
+        """Débit de dose derrière l'écran de 0 à 50 cm par pas de 0.1 mm.
+
+        Faisceau large : chaque raie est atténuée en e^(-μx) et corrigée par son
+        facteur d'accumulation G-P, le tout en une seule opération sur le
+        tableau épaisseurs × raies. Retourne (épaisseurs, débits de dose).
+        """
+        thicknesses = np.arange(0, self.SWEEP_MAX_THICKNESS + self.SWEEP_STEP / 2, self.SWEEP_STEP)
+        # μ et B sous la table G-P évalués à sa première énergie (majorant)
+        shield_energies = buildup_library.shielding_energies(material, energies)
+        mu = attenuation_library.mu(material, shield_energies)
+        weights = line_weights(energies, abundances)
+        buildup = buildup_library.table(material, shield_energies)
+        return thicknesses, initial_dose_rate * transmission(thicknesses, mu, weights, buildup)
 
     def calculate_dose_rate(self, activity, energies, abundances):
-        """Calcule le débit de dose à 1m."""
-        dose_rate = 0
-        for energy, abundance in zip(energies, abundances):
-            if energy > 0 and abundance > 0:
-                dose_rate += activity * energy * abundance * 1.3e-10
-        return dose_rate
+        """Calcule le débit de dose à 1m (mSv/h), abondances en %."""
+        return float(ded1m(activity, energies, abundances))
 
     def update_thickness_label(self, value):
         """Met à jour le label avec la valeur actuelle du curseur."""
         self.thickness_value_label.setText(f"{value} cm")
 
-    def calculate_required_thickness(self, target_dose_rate, activity_bq, energies, abundances, material):
-        """Calcule l'épaisseur nécessaire pour atteindre un débit de dose cible."""
+    def calculate_required_thickness(self, target_dose_rate, activity_bq, energies, abundances, material,
+                                     max_thickness=300):
+        """Calcule l'épaisseur nécessaire pour atteindre un débit de dose cible.
+
+        Résout Σ wi Bi e^(-μi x) = cible / initial sur la transmission de toutes
+        les raies en faisceau large (précision inférieure au dixième de millimètre).
+        Retourne None au-delà de ``max_thickness`` cm.
+        """
         initial_dose_rate = self.calculate_dose_rate(activity_bq, energies, abundances)
-        required_factor = initial_dose_rate / target_dose_rate
-        
-        # Si le débit initial est déjà inférieur à la cible
-        if required_factor <= 1:
+        if initial_dose_rate <= target_dose_rate:
             return 0
-            
-        # Recherche par itération de l'épaisseur nécessaire
-        thickness = 0
-        step = 1.0  # Pas de 1 cm
-        max_thickness = 300  # Épaisseur maximale de 300 cm
-        
-        while thickness <= max_thickness:
-            total_factor = 1
-            for energy, abundance in zip(energies, abundances):
-                if energy > 0 and abundance > 0:
-                    mu = self.get_mu(material, energy)
-                    if mu is not None:
-                        attenuation = math.exp(mu * thickness)
-                        total_factor = max(total_factor, attenuation)
-            
-            if total_factor >= required_factor:
-                return thickness
-                
-            thickness += step
-            
-        return None  # Si aucune épaisseur trouvée
\ No newline at end of file
+        
+        # Coefficients d'atténuation de toutes les raies en un seul appel (mis en cache),
+        # évalués à la première énergie de la table G-P pour les raies plus molles
+        shield_energies = buildup_library.shielding_energies(material, energies)
+        mu = attenuation_library.mu(material, shield_energies)
+        weights = line_weights(energies, abundances)
+        
+        return required_thickness(
+            target_dose_rate / initial_dose_rate, mu, weights, max_thickness=max_thickness,
+            buildup=buildup_library.table(material, shield_energies)
+        )
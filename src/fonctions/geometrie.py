@@ -0,0 +1,93 @@
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QSlider
+from PySide6.QtCore import Qt
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import numpy as np
+from ..core.units import unit_registry
+from ..core.geometry import GEOMETRY_LABELS, tabulated_dose_rate
+from ..core.perimeter import PUBLIC_LIMIT_USVH
+
+
+class GeometryProfileDialog(QDialog):
+    """Débit de dose en fonction de la distance pour une source étendue, comparé à une source ponctuelle"""
+
+    # Graduations du curseur de distance (échelle logarithmique)
+    SLIDER_STEPS = 1000
+    CURVE_POINTS = 400
+
+    def __init__(self, geometry, size, aspect, d1, ded1, unit, d2=None, parent=None):
+        """Source ``geometry`` de dimension ``size`` m donnant ``ded1`` ``unit`` à ``d1`` m"""
+        super().__init__(parent)
+        self.setWindowTitle(f"Profil de débit de dose - source {GEOMETRY_LABELS[geometry].lower()}")
+        self.setMinimumSize(650, 500)
+        self.geometry, self.size, self.aspect, self.unit = geometry, size, aspect, unit
+
+        # Intensité de la source recalée sur la mesure (tables en µSv/h·m², unité conservée)
+        self.strength = ded1 / tabulated_dose_rate(geometry, 1.0, size, d1, aspect)
+        self.point_strength = ded1 * d1 * d1
+        self.d_min = min(size * 1e-2, d1 / 2)
+        self.d_max = max(size * 100, d1 * 10, (d2 or 0) * 2)
+
+        layout = QVBoxLayout(self)
+        self.figure, self.ax = plt.subplots()
+        self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(self.canvas)
+
+        slider_layout = QHBoxLayout()
+        slider_layout.addWidget(QLabel("Distance:"))
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setRange(0, self.SLIDER_STEPS)
+        slider_layout.addWidget(self.slider)
+        layout.addLayout(slider_layout)
+
+        self.result_label = QLabel()
+        self.result_label.setObjectName("resultLabel")
+        self.result_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.result_label)
+
+        self.plot_profile(d1, ded1)
+        self.slider.valueChanged.connect(self.update_distance)
+        self.slider.setValue(self._slider_value(d2 if d2 else d1))
+        self.update_distance(self.slider.value())
+
+    def _distance(self, value):
+        return self.d_min * (self.d_max / self.d_min) ** (value / self.SLIDER_STEPS)
+
+    def _slider_value(self, distance):
+        ratio = np.log(distance / self.d_min) / np.log(self.d_max / self.d_min)
+        return int(round(np.clip(ratio, 0, 1) * self.SLIDER_STEPS))
+
+    def plot_profile(self, d1, ded1):
+        """Courbes source étendue / source ponctuelle et limite publique"""
+        distances = np.geomspace(self.d_min, self.d_max, self.CURVE_POINTS)
+        extended = tabulated_dose_rate(self.geometry, self.strength, self.size, distances, self.aspect)
+        self.ax.loglog(distances, extended, color='blue', label=f"Source {GEOMETRY_LABELS[self.geometry].lower()}")
+        self.ax.loglog(distances, self.point_strength / distances ** 2, color='gray', linestyle='--',
+                       label="Source ponctuelle (1/d²)")
+
+        limit = unit_registry.convert(PUBLIC_LIMIT_USVH, "µSv/h", self.unit)
+        self.ax.axhline(limit, color='red', linestyle=':', label=f"Limite publique ({PUBLIC_LIMIT_USVH} µSv/h)")
+        # Débit décroissant avec la distance : interpolation sur la courbe inversée
+        self.public_distance = (float(np.exp(np.interp(np.log(limit), np.log(extended[::-1]), np.log(distances[::-1]))))
+                                if extended[-1] < limit < extended[0] else None)
+
+        self.ax.scatter([d1], [ded1], color='blue', s=60, zorder=3, label="Mesure")
+        self.marker, = self.ax.plot([], [], marker='o', color='orange', markersize=9, linestyle='none')
+        self.ax.set_xlabel("Distance (m)")
+        self.ax.set_ylabel(f"Débit de dose ({self.unit})")
+        self.ax.grid(True, which='both', alpha=0.3)
+        self.ax.legend(fontsize=9)
+        self.canvas.draw()
+
+    def update_distance(self, value):
+        """Lecture instantanée dans la table de la géométrie"""
+        distance = self._distance(value)
+        rate = float(tabulated_dose_rate(self.geometry, self.strength, self.size, distance, self.aspect))
+        point_rate = self.point_strength / distance ** 2
+        self.marker.set_data([distance], [rate])
+        self.canvas.draw_idle()
+        text = (f"{rate:.3g} {self.unit} à {distance:.3g} m "
+                f"(source ponctuelle : {point_rate:.3g} {self.unit})")
+        if self.public_distance:
+            text += f"\nLimite publique atteinte à {self.public_distance:.1f} m"
+        self.result_label.setText(text)
@@ -0,0 +1,91 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox, QLabel,
+    QPushButton, QComboBox, QSpinBox, QDoubleSpinBox, QMessageBox
+)
+from ..utils.uncertainty import Uncertain, propagate
+
+
+class UncertaintyDialog(QDialog):
+    """Propagation Monte-Carlo des incertitudes d'un calcul.
+
+    ``inputs`` est une liste de (clé, libellé, Uncertain par défaut, unité des
+    incertitudes absolues) ; ``model`` reçoit un tableau de tirages par clé et
+    retourne la grandeur calculée, affichée avec ``formatter``.
+    """
+
+    SAMPLE_COUNTS = [100_000, 200_000, 500_000, 1_000_000]
+
+    def __init__(self, title, inputs, model, formatter, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Incertitudes - {title}")
+        self.setMinimumWidth(420)
+        self.inputs = inputs
+        self.model = model
+        self.formatter = formatter
+
+        layout = QVBoxLayout(self)
+
+        inputs_group = QGroupBox("Incertitudes des entrées (1 écart-type)")
+        inputs_layout = QFormLayout()
+        self.spins = {}
+        for key, label, spec, unit in inputs:
+            spin = QDoubleSpinBox()
+            spin.setDecimals(2 if spec.relative else 3)
+            spin.setRange(0.0, 100.0 if spec.relative else 1e6)
+            spin.setValue(spec.uncertainty * 100 if spec.relative else spec.uncertainty)
+            spin.setSuffix(" %" if spec.relative else f" {unit}")
+            self.spins[key] = spin
+            inputs_layout.addRow(f"{label} ({spec.value:g}) ±", spin)
+        inputs_group.setLayout(inputs_layout)
+        layout.addWidget(inputs_group)
+
+        options_layout = QHBoxLayout()
+        options_layout.addWidget(QLabel("Tirages:"))
+        self.samples_combo = QComboBox()
+        self.samples_combo.addItems([f"{n:,}".replace(",", " ") for n in self.SAMPLE_COUNTS])
+        self.samples_combo.setCurrentIndex(1)
+        options_layout.addWidget(self.samples_combo)
+        options_layout.addWidget(QLabel("Graine:"))
+        self.seed_input = QSpinBox()
+        self.seed_input.setRange(0, 999999)
+        self.seed_input.setSpecialValueText("aléatoire")
+        self.seed_input.setToolTip("Graine du générateur (0 : tirage différent à chaque calcul)")
+        options_layout.addWidget(self.seed_input)
+        layout.addLayout(options_layout)
+
+        calculate_btn = QPushButton("Calculer")
+        calculate_btn.clicked.connect(self.calculate)
+        layout.addWidget(calculate_btn)
+
+        self.result_label = QLabel()
+        self.result_label.setObjectName("resultLabel")
+        self.result_label.setWordWrap(True)
+        layout.addWidget(self.result_label)
+
+        close_btn = QPushButton("Fermer")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+
+    def calculate(self):
+        """Lance les tirages et affiche les percentiles."""
+        try:
+            inputs = {}
+            for key, _, spec, _ in self.inputs:
+                value = self.spins[key].value()
+                inputs[key] = Uncertain(spec.value, value / 100 if spec.relative else value,
+                                        spec.relative, spec.law, spec.minimum)
+            samples = self.SAMPLE_COUNTS[self.samples_combo.currentIndex()]
+            seed = self.seed_input.value() or None
+            result = propagate(self.model, inputs, samples, seed=seed)
+
+            low, high = result.interval()
+            fmt = self.formatter
+            self.result_label.setText(
+                f"Médiane: {fmt(result.median)}\n"
+                f"Moyenne: {fmt(result.mean)} (écart-type {fmt(result.std)})\n"
+                f"Intervalle 95 %: {fmt(low)} - {fmt(high)}\n"
+                f"Intervalle 90 %: {fmt(result.percentiles[5.0])} - {fmt(result.percentiles[95.0])}\n"
+                f"{result.samples:,} tirages".replace(",", " ")
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur de calcul: {str(e)}")
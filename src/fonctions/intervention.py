@@ -10,6 +10,11 @@ import json
 from datetime import datetime
 from ..constants import ICONS_DIR
 from ..utils.config_manager import config_manager
+from ..utils.telemetry import (
+    TelemetryReceiver, TelemetryStore, agent_key, create_transport, DEFAULT_UDP_PORT
+)
+from ..utils.recording import TelemetryRecorder, recording_path, ENTRY, EXIT
+from ..utils.measurements import measurements_path
 
 def get_intervention_state_file():
     """Retourne le chemin du fichier d'état de l'intervention"""
@@ -151,6 +156,10 @@ class InterventionDialog(QDialog):
         self.create_file_buttons()
         left_column.addWidget(self.file_group)
         
+        # Groupe Dosimètres électroniques
+        self.create_telemetry_group()
+        left_column.addWidget(self.telemetry_group)
+        
         # Colonne 2 : Formulaire d'entrée/sortie
         right_column = QVBoxLayout()
         self.create_entry_form()
@@ -171,6 +180,14 @@ class InterventionDialog(QDialog):
         self.engaged_personnel = {}
         self.next_agent_id = 1
         
+        # Télémétrie : la réception tourne dans son propre thread, l'interface lit un résumé
+        self.telemetry_store = TelemetryStore()
+        self.telemetry_receiver = None
+        self.telemetry_labels = {}
+        self.recorder = None
+        self.telemetry_timer = QTimer()
+        self.telemetry_timer.timeout.connect(self.update_telemetry_view)
+        
         # Timer pour mise à jour du temps d'engagement
         self.engagement_timer = QTimer()
         self.engagement_timer.timeout.connect(self.update_engaged_view)
@@ -200,8 +217,13 @@ class InterventionDialog(QDialog):
         terminate_btn.clicked.connect(self.terminate_current_intervention)
         terminate_btn.setStyleSheet("QPushButton { color: red; font-weight: bold; }")
         
+        measurements_btn = QPushButton("Mesures terrain")
+        measurements_btn.setToolTip("Relevés de débit de dose géolocalisés et carte de contamination")
+        measurements_btn.clicked.connect(self.show_measurements)
+        
         buttons_layout.addWidget(new_btn)
         buttons_layout.addWidget(open_btn)
+        buttons_layout.addWidget(measurements_btn)
         buttons_layout.addWidget(terminate_btn)
         
         # Ajout du label date/heure
@@ -217,6 +239,177 @@ class InterventionDialog(QDialog):
         file_layout.addWidget(self.datetime_label)
         self.file_group.setLayout(file_layout)
         
+    def create_telemetry_group(self):
+        self.telemetry_group = QGroupBox("Dosimètres électroniques")
+        telemetry_layout = QHBoxLayout()
+        
+        self.transport_combo = QComboBox()
+        self.transport_combo.addItems(["UDP", "Série", "Fichier"])
+        self.transport_combo.currentTextChanged.connect(self.update_transport_placeholder)
+        
+        self.transport_input = QLineEdit()
+        self.update_transport_placeholder(self.transport_combo.currentText())
+        
+        self.telemetry_button = QPushButton("Démarrer")
+        self.telemetry_button.clicked.connect(self.toggle_telemetry)
+        
+        self.telemetry_status = QLabel("Arrêtée")
+        
+        replay_btn = QPushButton("Rejeu")
+        replay_btn.setToolTip("Rejoue l'enregistrement des mesures, entrées/sorties et positions")
+        replay_btn.clicked.connect(self.show_replay)
+        
+        telemetry_layout.addWidget(self.transport_combo)
+        telemetry_layout.addWidget(self.transport_input)
+        telemetry_layout.addWidget(self.telemetry_button)
+        telemetry_layout.addWidget(self.telemetry_status)
+        telemetry_layout.addWidget(replay_btn)
+        self.telemetry_group.setLayout(telemetry_layout)
+    
+    def update_transport_placeholder(self, kind):
+        """Indique le paramètre attendu par le transport choisi"""
+        placeholders = {
+            "UDP": f"Port (défaut {DEFAULT_UDP_PORT})",
+            "Série": "Port série (ex. COM3)",
+            "Fichier": "Chemin du fichier de mesures"
+        }
+        self.transport_input.setPlaceholderText(placeholders[kind])
+    
+    def toggle_telemetry(self):
+        """Démarre ou arrête la réception des mesures des dosimètres"""
+        if self.telemetry_receiver is not None:
+            self.stop_telemetry()
+            return
+        
+        kind = self.transport_combo.currentText()
+        target = self.transport_input.text().strip()
+        if kind == "Fichier" and not target:
+            target, _ = QFileDialog.getOpenFileName(
+                self, "Fichier de mesures", "", "Fichiers texte (*.txt *.csv *.log);;Tous les fichiers (*)"
+            )
+            if not target:
+                return
+            self.transport_input.setText(target)
+        
+        try:
+            receiver = TelemetryReceiver(create_transport(kind, target), self.telemetry_store)
+            receiver.start()
+        except (ValueError, OSError, RuntimeError) as e:
+            QMessageBox.critical(
+                self,
+                "Télémétrie",
+                f"Impossible de démarrer la réception des dosimètres :\n{str(e)}"
+            )
+            return
+        
+        self.telemetry_receiver = receiver
+        self.telemetry_button.setText("Arrêter")
+        self.transport_combo.setEnabled(False)
+        self.transport_input.setEnabled(False)
+        # 2 rafraîchissements par seconde suffisent à l'affichage, quel que soit le débit de mesures
+        self.telemetry_timer.start(500)
+        self.update_telemetry_view()
+    
+    def stop_telemetry(self):
+        """Arrête la réception ; les doses déjà reçues restent affichées"""
+        self.telemetry_timer.stop()
+        if self.telemetry_receiver is not None:
+            self.telemetry_receiver.stop()
+            self.telemetry_receiver = None
+        self.telemetry_button.setText("Démarrer")
+        self.transport_combo.setEnabled(True)
+        self.transport_input.setEnabled(True)
+        self.telemetry_status.setText("Arrêtée")
+    
+    def start_recording(self):
+        """Enregistre mesures et mouvements à côté du fichier de l'intervention courante"""
+        self.stop_recording()
+        if not self.current_file:
+            return
+        try:
+            self.recorder = TelemetryRecorder(recording_path(self.current_file))
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(
+                self,
+                "Enregistrement",
+                f"L'enregistrement des mesures est désactivé :\n{str(e)}"
+            )
+            return
+        self.telemetry_store.recorder = self.recorder
+    
+    def stop_recording(self):
+        self.telemetry_store.recorder = None
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+    
+    def record_event(self, kind, agent_name, time_text, dose):
+        """Enregistre une entrée ou une sortie (heure HH:MM du jour)"""
+        if self.recorder is None:
+            return
+        event_time = datetime.combine(datetime.now().date(), datetime.strptime(time_text, "%H:%M").time())
+        try:
+            self.recorder.record_event(kind, agent_key(agent_name), event_time.timestamp(), dose)
+        except OSError:
+            pass  # L'historique texte reste la référence
+    
+    def show_measurements(self):
+        """Ouvre les mesures terrain, enregistrées avec l'intervention courante"""
+        from .mesures import MeasurementsDialog
+        if not self.current_file:
+            QMessageBox.information(
+                self,
+                "Mesures terrain",
+                "Aucune intervention active : les mesures saisies ne seront pas enregistrées."
+            )
+        path = measurements_path(self.current_file) if self.current_file else None
+        dialog = MeasurementsDialog(path, self)
+        dialog.exec()
+    
+    def show_replay(self):
+        """Ouvre le rejeu de l'intervention courante ou d'un enregistrement choisi"""
+        from .rejeu import ReplayDialog
+        path = recording_path(self.current_file) if self.current_file else ""
+        if not os.path.exists(path):
+            interventions_path, _ = get_safe_interventions_path()
+            path, _ = QFileDialog.getOpenFileName(
+                self, "Ouvrir un enregistrement", interventions_path or "", "Enregistrements (*.tlm)"
+            )
+            if not path:
+                return
+        try:
+            dialog = ReplayDialog(path, self)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Erreur", f"Impossible d'ouvrir l'enregistrement :\n{str(e)}")
+            return
+        dialog.exec()
+    
+    def telemetry_for(self, agent):
+        """Résumé des mesures d'un agent engagé (par son nom), ou None"""
+        return self.telemetry_store.snapshot().get(agent_key(agent["name"]))
+    
+    def update_telemetry_view(self):
+        """Met à jour les débits et doses affichés sans reconstruire les widgets"""
+        receiver = self.telemetry_receiver
+        if receiver is not None and receiver.error is not None:
+            error = receiver.error
+            self.stop_telemetry()
+            QMessageBox.warning(self, "Télémétrie", f"Réception des dosimètres interrompue :\n{str(error)}")
+            return
+        
+        snapshot = self.telemetry_store.snapshot()
+        for agent_id, label in self.telemetry_labels.items():
+            agent = self.engaged_personnel.get(agent_id)
+            reading = snapshot.get(agent_key(agent["name"])) if agent else None
+            if reading:
+                label.setText(f"{reading['dose_rate']:.1f} µSv/h\n{reading['dose']:.1f} µSv")
+        
+        if receiver is not None:
+            self.telemetry_status.setText(
+                f"{len(snapshot)} dosimètre(s)"
+                + (f", {self.telemetry_store.rejected} rejet(s)" if self.telemetry_store.rejected else "")
+            )
+    
     def create_entry_form(self):
         """Crée le formulaire d'entrée/sortie"""
         form_group = QGroupBox("Entrée/Sortie Personnel")
@@ -238,6 +431,8 @@ class InterventionDialog(QDialog):
         self.dose_input = QDoubleSpinBox()
         self.dose_input.setDecimals(2)
         self.dose_input.setSuffix(" µSv")
+        # La plage par défaut (99,99) tronquerait les doses transmises par les dosimètres
+        self.dose_input.setRange(0.0, 1e6)
         
         self.comment_input = QTextEdit()
         self.comment_input.setMaximumHeight(60)
@@ -402,6 +597,8 @@ class InterventionDialog(QDialog):
             )
             return
         
+        self.start_recording()
+        
         # Mettre à jour l'affichage
         self.clear_form()
         self.update_engaged_view()
@@ -460,6 +657,7 @@ class InterventionDialog(QDialog):
                     pass  # Test de lecture
                 self.current_file = filename
                 self.load_engaged_agents()
+                self.start_recording()
                 
                 # Sauvegarder l'état
                 self.save_current_state()
@@ -544,6 +742,10 @@ class InterventionDialog(QDialog):
             )
             return
     
+        self.record_event(ENTRY, entry_data["name"], entry_data["entry"], self.dose_input.value())
+        if exit_str:
+            self.record_event(EXIT, entry_data["name"], exit_str, self.dose_input.value())
+        
         self.update_engaged_view()
         self.clear_form()
         
@@ -605,6 +807,7 @@ class InterventionDialog(QDialog):
         
         # Ajouter un stretch au début pour centrer horizontalement
         self.engaged_layout.addStretch()
+        self.telemetry_labels = {}
         
         for agent_id, agent in self.engaged_personnel.items():
             # Calcul du temps d'engagement
@@ -666,6 +869,14 @@ class InterventionDialog(QDialog):
                 """)
                 agent_layout.addWidget(label, 0, Qt.AlignCenter)  # Centrer explicitement chaque label
             
+            # Débit et dose transmis par le dosimètre, rafraîchis par update_telemetry_view
+            telemetry_label = QLabel("")
+            telemetry_label.setAlignment(Qt.AlignCenter)
+            telemetry_label.setFixedWidth(120)
+            telemetry_label.setStyleSheet("QLabel { color: #2e7d32; border: none; background-color: transparent; }")
+            agent_layout.addWidget(telemetry_label, 0, Qt.AlignCenter)
+            self.telemetry_labels[agent_id] = telemetry_label
+            
             agent_widget.setProperty("agent_id", agent_id)
             agent_widget.setStyleSheet(self._get_widget_style(False))
             
@@ -673,6 +884,7 @@ class InterventionDialog(QDialog):
     
         # Ajouter un stretch à la fin pour centrer horizontalement
         self.engaged_layout.addStretch()
+        self.update_telemetry_view()
     
     def clear_form(self):
         """Réinitialise tous les champs du formulaire"""
@@ -732,6 +944,7 @@ class InterventionDialog(QDialog):
         # Supprimer l'agent si une heure de sortie est définie
         if exit_str:
             del self.engaged_personnel[agent_id]
+            self.record_event(EXIT, updated_data["name"], exit_str, self.dose_input.value())
         else:
             self.engaged_personnel[agent_id] = updated_data
         
@@ -875,6 +1088,10 @@ class InterventionDialog(QDialog):
             self.team_input.setCurrentText(agent["team"])
             self.entry_time.setTime(QTime.fromString(agent["entry"], "HH:mm"))
             self.dose_input.setValue(float(agent["dose"]))
+            # Dose du dosimètre électronique si elle dépasse la dose saisie
+            reading = self.telemetry_for(agent)
+            if reading and reading["dose"] > self.dose_input.value():
+                self.dose_input.setValue(reading["dose"])
             self.comment_input.setPlainText(agent.get("comment", ""))
             self.exit_time.setTime(QTime(0, 0))  # Reset l'heure de sortie
             
@@ -891,6 +1108,8 @@ class InterventionDialog(QDialog):
         # Arrêter les timers
         self.engagement_timer.stop()
         self.state_timer.stop()
+        self.stop_telemetry()
+        self.stop_recording()
         
         # Sauvegarder l'état avant de fermer
         if self.current_file:
@@ -972,6 +1191,9 @@ class InterventionDialog(QDialog):
                     converted_personnel[int_id] = agent_data
                 self.engaged_personnel = converted_personnel
             
+            # Reprendre l'enregistrement des mesures
+            self.start_recording()
+            
             # Mettre à jour l'affichage
             self.start_label.setText(f"Début : {self.start_datetime.strftime('%d/%m/%Y à %H:%M')}")
             self.update_engaged_view()
@@ -1015,6 +1237,9 @@ class InterventionDialog(QDialog):
             self.current_file = None
             self.engaged_personnel.clear()
             self.next_agent_id = 1
+            self.stop_telemetry()
+            self.stop_recording()
+            self.telemetry_store.clear()
             self.start_datetime = datetime.now()
             self.start_label.setText(f"Début : {self.start_datetime.strftime('%d/%m/%Y à %H:%M')}")
             self.update_engaged_view()
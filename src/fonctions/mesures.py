@@ -0,0 +1,262 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox, QTableWidget, QTableWidgetItem,
+    QPushButton, QComboBox, QLabel, QLineEdit, QDoubleSpinBox, QMessageBox, QHeaderView, QFileDialog
+)
+from PySide6.QtCore import QTime
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.colors import LogNorm
+import numpy as np
+import os
+from ..utils.measurements import MeasurementStore, read_measurements, write_measurements
+from ..utils.contours import extract_contours
+from .plot_window import ZONES
+
+
+class MeasurementsDialog(QDialog):
+    """Relevés de débit de dose géolocalisés, recherche spatiale et carte de contamination"""
+
+    HEADERS = ["X (m)", "Y (m)", "Débit (µSv/h)", "Heure", "Commentaire"]
+    RESOLUTIONS = [250, 500, 1000]
+
+    def __init__(self, path=None, parent=None):
+        """``path`` : fichier CSV des mesures de l'intervention, enregistré à chaque modification"""
+        super().__init__(parent)
+        self.setWindowTitle("Mesures terrain")
+        self.setMinimumSize(1000, 650)
+        self.path = path
+        self.store = MeasurementStore()
+
+        layout = QHBoxLayout(self)
+        left_layout = QVBoxLayout()
+
+        # Relevés
+        readings_group = QGroupBox("Relevés")
+        readings_layout = QVBoxLayout()
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        readings_layout.addWidget(self.table)
+
+        entry_layout = QHBoxLayout()
+        self.x_input = self._coordinate_input("X")
+        self.y_input = self._coordinate_input("Y")
+        self.rate_input = QDoubleSpinBox()
+        self.rate_input.setDecimals(2)
+        self.rate_input.setRange(0.0, 1e9)
+        self.rate_input.setSuffix(" µSv/h")
+        self.comment_input = QLineEdit()
+        self.comment_input.setPlaceholderText("Commentaire")
+        entry_layout.addWidget(self.x_input)
+        entry_layout.addWidget(self.y_input)
+        entry_layout.addWidget(self.rate_input)
+        entry_layout.addWidget(self.comment_input)
+        readings_layout.addLayout(entry_layout)
+
+        buttons_layout = QHBoxLayout()
+        add_btn = QPushButton("Ajouter")
+        add_btn.clicked.connect(self.add_measurement)
+        remove_btn = QPushButton("Supprimer")
+        remove_btn.clicked.connect(self.remove_measurements)
+        import_btn = QPushButton("Importer CSV...")
+        import_btn.clicked.connect(self.import_measurements)
+        buttons_layout.addWidget(add_btn)
+        buttons_layout.addWidget(remove_btn)
+        buttons_layout.addWidget(import_btn)
+        readings_layout.addLayout(buttons_layout)
+        readings_group.setLayout(readings_layout)
+        left_layout.addWidget(readings_group)
+
+        # Recherche autour d'un point
+        query_group = QGroupBox("Recherche autour d'un point")
+        query_layout = QFormLayout()
+        point_layout = QHBoxLayout()
+        self.query_x = self._coordinate_input("X")
+        self.query_y = self._coordinate_input("Y")
+        point_layout.addWidget(self.query_x)
+        point_layout.addWidget(self.query_y)
+        query_layout.addRow("Point:", point_layout)
+        self.radius_input = QDoubleSpinBox()
+        self.radius_input.setDecimals(1)
+        self.radius_input.setRange(0.1, 1e5)
+        self.radius_input.setValue(50.0)
+        self.radius_input.setSuffix(" m")
+        query_layout.addRow("Rayon:", self.radius_input)
+        query_btn = QPushButton("Rechercher")
+        query_btn.clicked.connect(self.query_point)
+        query_layout.addRow(query_btn)
+        self.query_label = QLabel()
+        self.query_label.setObjectName("resultLabel")
+        self.query_label.setWordWrap(True)
+        query_layout.addRow(self.query_label)
+        query_group.setLayout(query_layout)
+        left_layout.addWidget(query_group)
+
+        # Carte
+        map_layout = QHBoxLayout()
+        map_layout.addWidget(QLabel("Résolution:"))
+        self.resolution_combo = QComboBox()
+        self.resolution_combo.addItems([f"{n} × {n}" for n in self.RESOLUTIONS])
+        self.resolution_combo.setCurrentIndex(1)
+        map_layout.addWidget(self.resolution_combo)
+        map_btn = QPushButton("Carte de contamination")
+        map_btn.clicked.connect(self.compute_map)
+        map_layout.addWidget(map_btn)
+        left_layout.addLayout(map_layout)
+        self.info_label = QLabel()
+        self.info_label.setWordWrap(True)
+        left_layout.addWidget(self.info_label)
+        layout.addLayout(left_layout, 1)
+
+        self.figure, self.ax = plt.subplots()
+        self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(self.canvas, 2)
+
+        if path and os.path.exists(path):
+            try:
+                self.store = read_measurements(path)
+            except (OSError, ValueError) as e:
+                # Fichier illisible : ne pas l'écraser avec un magasin vide
+                self.path = None
+                QMessageBox.warning(self, "Mesures terrain", f"Impossible de lire les mesures :\n{str(e)}\n"
+                                    "Les nouvelles mesures ne seront pas enregistrées dans ce fichier.")
+        self.fill_table()
+
+    def _coordinate_input(self, name):
+        spin = QDoubleSpinBox()
+        spin.setDecimals(1)
+        spin.setRange(-1e6, 1e6)
+        spin.setPrefix(f"{name} = ")
+        spin.setSuffix(" m")
+        return spin
+
+    def fill_table(self):
+        """Affiche toutes les mesures du magasin"""
+        store = self.store
+        self.table.setRowCount(len(store))
+        for row in range(len(store)):
+            self._set_row(row, store.x[row], store.y[row], store.dose_rate[row],
+                          store.times[row], store.comments[row])
+
+    def _set_row(self, row, x, y, rate, time, comment):
+        for column, value in enumerate([f"{x:g}", f"{y:g}", f"{rate:.3g}", time, comment]):
+            self.table.setItem(row, column, QTableWidgetItem(value))
+
+    def save(self):
+        """Enregistre les mesures dans le fichier de l'intervention"""
+        if not self.path:
+            return
+        try:
+            write_measurements(self.store, self.path)
+        except OSError as e:
+            QMessageBox.critical(self, "Erreur d'écriture", f"Impossible d'enregistrer les mesures :\n{str(e)}")
+
+    def add_measurement(self):
+        """Ajoute le relevé saisi, horodaté à l'heure courante"""
+        time = QTime.currentTime().toString("HH:mm")
+        x, y, rate = self.x_input.value(), self.y_input.value(), self.rate_input.value()
+        comment = self.comment_input.text()
+        self.store.add(x, y, rate, time, comment)
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self._set_row(row, x, y, rate, time, comment)
+        self.comment_input.clear()
+        self.save()
+
+    def remove_measurements(self):
+        rows = sorted({index.row() for index in self.table.selectedIndexes()})
+        if not rows:
+            return
+        self.store.remove(rows)
+        for row in reversed(rows):
+            self.table.removeRow(row)
+        self.save()
+
+    def import_measurements(self):
+        """Ajoute les relevés d'un fichier CSV (colonnes x_m, y_m, debit_usvh[, heure, commentaire])"""
+        filename, _ = QFileDialog.getOpenFileName(self, "Importer des mesures", "", "Fichiers CSV (*.csv *.txt)")
+        if not filename:
+            return
+        try:
+            imported = read_measurements(filename)
+            self.store.add(imported.x, imported.y, imported.dose_rate, imported.times, imported.comments)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.critical(self, "Erreur", f"Impossible d'importer les mesures :\n{str(e)}")
+            return
+        self.fill_table()
+        self.save()
+        QMessageBox.information(self, "Import", f"{len(imported)} mesure(s) importée(s).")
+
+    def query_point(self):
+        """Mesure maximale dans le rayon et mesure la plus proche du point saisi"""
+        if not len(self.store):
+            self.query_label.setText("Aucune mesure")
+            return
+        x, y, radius = self.query_x.value(), self.query_y.value(), self.radius_input.value()
+        maximum, best = self.store.max_within(x, y, radius)
+        found = self.store.within(x, y, radius)
+        nearest, distance = self.store.nearest(x, y)
+        lines = []
+        if best >= 0:
+            lines.append(f"Maximum à moins de {radius:g} m : {maximum:.3g} µSv/h "
+                         f"en ({self.store.x[best]:g} ; {self.store.y[best]:g}) - {found.size} mesure(s)")
+        else:
+            lines.append(f"Aucune mesure à moins de {radius:g} m")
+        lines.append(f"Mesure la plus proche : {self.store.dose_rate[nearest[0]]:.3g} µSv/h à {distance[0]:.1f} m")
+        self.query_label.setText("\n".join(lines))
+        if best >= 0:
+            self.table.selectRow(best)
+
+    def compute_map(self):
+        """Interpole les mesures (IDW) et trace la carte de contamination"""
+        if len(self.store) < 2:
+            QMessageBox.warning(self, "Attention", "Au moins deux mesures sont nécessaires pour la carte")
+            return
+        try:
+            resolution = self.RESOLUTIONS[self.resolution_combo.currentIndex()]
+            extent = self.store.extent()
+            radius = self.store.default_radius()
+            xs, ys, dose = self.store.idw_grid(extent, (resolution, resolution), radius=radius)
+            self.plot_map(extent, xs, ys, dose, radius)
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur de calcul: {str(e)}")
+
+    def plot_map(self, extent, xs, ys, dose, radius):
+        """Trace le raster interpolé, les isolignes des zones et les points de mesure"""
+        self.figure.clear()
+        self.ax = self.figure.add_subplot(111)
+
+        positive = dose[dose > 0]
+        vmin = max(positive.min(), ZONES[0][0] * 1e-2) if positive.size else ZONES[0][0] * 1e-2
+        vmax = max(np.nanmax(dose) if positive.size else vmin, vmin * 10)
+        image = self.ax.imshow(np.clip(dose, vmin, None), extent=extent, origin='lower',
+                               norm=LogNorm(vmin=vmin, vmax=vmax), cmap='inferno', aspect='equal')
+        self.figure.colorbar(image, ax=self.ax, label="Débit de dose interpolé (µSv/h)")
+
+        # Isolignes sur la zone couverte par les mesures (hors rayon : pas de contour)
+        hottest = int(np.argmax(self.store.dose_rate))
+        contours = extract_contours(xs, ys, np.nan_to_num(dose, nan=0.0), [level for level, _, _ in ZONES],
+                                    center=(self.store.x[hottest], self.store.y[hottest]))
+        for contour, (level, label, color) in zip(contours, ZONES):
+            for i, polygon in enumerate(contour.polygons):
+                closed = np.vstack([polygon, polygon[:1]])
+                self.ax.plot(closed[:, 0], closed[:, 1], color=color, linestyle='--',
+                             label=f"{label} ({level:g} µSv/h)" if i == 0 else None)
+
+        self.ax.scatter(self.store.x, self.store.y, s=4, color='white', edgecolors='none',
+                        alpha=0.6, label='Mesures')
+        self.ax.set_xlabel("X (m)")
+        self.ax.set_ylabel("Y (m)")
+        self.ax.set_title("Carte de contamination")
+        self.ax.legend(loc='upper right', fontsize=9)
+        self.canvas.draw()
+
+        covered = np.isfinite(dose).mean() * 100
+        self.info_label.setText(
+            f"{len(self.store)} mesures, interpolation IDW dans un rayon de {radius:.1f} m "
+            f"({covered:.0f} % de la carte couverte)\n"
+            f"Débit maximal mesuré : {self.store.dose_rate.max():.3g} µSv/h"
+        )
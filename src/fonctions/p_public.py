@@ -5,7 +5,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt
 from ..utils.widgets import ClearingDoubleSpinBox
 from ..utils.database import save_to_history
-from math import sqrt
+from ..core.units import unit_registry
+from ..core.perimeter import public_perimeter
 
 class DistanceDialog(QDialog):
     def __init__(self, parent=None):
@@ -28,8 +29,8 @@ class PerimetrePublicDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Périmètre public")
-        self.setFixedSize(400, 300)  # Peut être trop grande/petite selon le contenu
-        self.setMinimumSize(400, 300)
+        self.setFixedSize(400, 380)  # Peut être trop grande/petite selon le contenu
+        self.setMinimumSize(400, 380)
         self.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Minimum)
 
         self.layout = QVBoxLayout(self)
@@ -96,6 +97,18 @@ class PerimetrePublicDialog(QDialog):
         info_label.setObjectName("infoLabel")
         info_label.setAlignment(Qt.AlignCenter)
         self.layout.addWidget(info_label)
+
+        # Carte 2D (plusieurs sources, murs)
+        map_button = QPushButton("Carte de dose")
+        map_button.setToolTip("Carte du débit de dose et zonage pour plusieurs sources et murs")
+        map_button.clicked.connect(self.show_dose_map)
+        self.layout.addWidget(map_button)
+
+        # Rejet atmosphérique (panache gaussien)
+        plume_button = QPushButton("Panache de rejet")
+        plume_button.setToolTip("Débit de dose au sol d'un rejet atmosphérique selon le vent et la stabilité")
+        plume_button.clicked.connect(self.show_plume)
+        self.layout.addWidget(plume_button)
         self.layout.addStretch(1)
 
         # Connexions des signaux
@@ -109,10 +122,7 @@ class PerimetrePublicDialog(QDialog):
             unit = self.ded_unit.currentText()
             
             # Conversion en µSv/h
-            if unit == "nSv/h":
-                ded1m_value *= 0.001  # nSv/h -> µSv/h
-            elif unit == "mSv/h":
-                ded1m_value *= 1000  # mSv/h -> µSv/h
+            ded1m_value = unit_registry.convert(ded1m_value, unit, "µSv/h")
 
             if not self._validate_input(ded1m_value):
                 return
@@ -137,7 +147,7 @@ class PerimetrePublicDialog(QDialog):
         if ded1m_value == 0:
             return 0.0
         else:
-            return sqrt(ded1m_value / 2.5)  # 2.5 µSv/h est la limite publique
+            return float(public_perimeter(ded1m_value))  # 2.5 µSv/h est la limite publique
 
     def _update_display(self, result):
         """Met à jour l'affichage du résultat."""
@@ -152,6 +162,21 @@ class PerimetrePublicDialog(QDialog):
             f"Perimetre: {result} m"
         ])
 
+    def show_dose_map(self):
+        """Affiche la carte de débit de dose, initialisée avec le DED 1 m saisi."""
+        from .plot_window import DoseMapDialog
+        from ..utils.dose_field import PointSource
+        ded1m_value = unit_registry.convert(self.ded1m_ppublic_input.value(), self.ded_unit.currentText(), "µSv/h")
+        sources = [PointSource(0.0, 0.0, ded1m_value)] if ded1m_value > 0 else []
+        dialog = DoseMapDialog(sources, parent=self)
+        dialog.exec()
+
+    def show_plume(self):
+        """Affiche le calcul de panache gaussien pour un rejet atmosphérique."""
+        from .panache import PlumeDialog
+        dialog = PlumeDialog(self)
+        dialog.exec()
+
     def _handle_error(self, e):
         """Gère l'affichage des erreurs."""
         QMessageBox.critical(self, "Erreur", f"Une erreur est survenue: {e}")
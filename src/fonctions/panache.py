@@ -0,0 +1,210 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox, QPushButton, QComboBox,
+    QLabel, QLineEdit, QDoubleSpinBox, QMessageBox
+)
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.colors import LogNorm
+import numpy as np
+from ..utils.widgets import ClearingDoubleSpinBox
+from ..utils.database import save_to_history
+from ..utils.isotope_catalog import isotope_catalog
+from ..utils.contours import extract_contours
+from ..core.units import unit_registry
+from ..core.ded import gamma_sum
+from ..core.plume import STABILITY_CLASSES, STABILITY_LABELS, ground_concentration, cloud_dose_rate
+from .plot_window import ZONES
+
+
+class PlumeDialog(QDialog):
+    """Panache gaussien d'un rejet atmosphérique : débit de dose d'immersion au sol"""
+
+    RESOLUTIONS = [250, 500, 1000]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Panache de rejet atmosphérique")
+        self.setMinimumSize(950, 650)
+        self.results = None
+
+        layout = QHBoxLayout(self)
+        inputs_layout = QVBoxLayout()
+
+        # Terme source
+        source_group = QGroupBox("Rejet")
+        source_form = QFormLayout()
+        self.isotope_combo = QComboBox()
+        self.isotope_combo.addItems(isotope_catalog.names())
+        if "Césium-137" in isotope_catalog:
+            self.isotope_combo.setCurrentText("Césium-137")
+        source_form.addRow("Isotope:", self.isotope_combo)
+
+        activity_layout = QHBoxLayout()
+        self.activity_input = ClearingDoubleSpinBox()
+        self.activity_input.setDecimals(3)
+        self.activity_input.setRange(0.0, 1e9)
+        self.activity_input.setValue(1.0)
+        self.activity_unit = QComboBox()
+        self.activity_unit.addItems(unit_registry.units("activity"))
+        self.activity_unit.setCurrentText("TBq")
+        activity_layout.addWidget(self.activity_input)
+        activity_layout.addWidget(self.activity_unit)
+        source_form.addRow("Activité rejetée:", activity_layout)
+
+        self.duration_input = self._spin(1.0, 1e5, 10.0, " min", 1)
+        self.duration_input.setToolTip("Durée du rejet, à débit constant")
+        source_form.addRow("Durée du rejet:", self.duration_input)
+        self.height_input = self._spin(0.0, 1000.0, 0.0, " m", 1)
+        self.height_input.setToolTip("Hauteur effective du rejet (0 = au sol)")
+        source_form.addRow("Hauteur:", self.height_input)
+        source_group.setLayout(source_form)
+        inputs_layout.addWidget(source_group)
+
+        # Météorologie
+        weather_group = QGroupBox("Météorologie")
+        weather_form = QFormLayout()
+        self.stability_combo = QComboBox()
+        self.stability_combo.addItems([STABILITY_LABELS[c] for c in STABILITY_CLASSES])
+        self.stability_combo.setCurrentIndex(STABILITY_CLASSES.index("D"))
+        self.stability_combo.setToolTip("Classe de stabilité de Pasquill-Gifford")
+        weather_form.addRow("Stabilité:", self.stability_combo)
+        self.wind_speed_input = self._spin(0.5, 50.0, 3.0, " m/s", 1)
+        weather_form.addRow("Vitesse du vent:", self.wind_speed_input)
+        self.wind_direction_input = self._spin(0.0, 359.0, 270.0, " °", 0)
+        self.wind_direction_input.setToolTip("Direction d'où vient le vent (0 = nord, 90 = est, 270 = ouest)")
+        weather_form.addRow("Vent venant de:", self.wind_direction_input)
+        weather_group.setLayout(weather_form)
+        inputs_layout.addWidget(weather_group)
+
+        # Calcul
+        map_group = QGroupBox("Carte")
+        map_form = QFormLayout()
+        self.times_input = QLineEdit("10, 30, 60")
+        self.times_input.setToolTip("Instants après le début du rejet (min), séparés par des virgules")
+        map_form.addRow("Instants (min):", self.times_input)
+        self.range_input = self._spin(100.0, 100000.0, 5000.0, " m", 0)
+        self.range_input.setToolTip("Demi-côté de la carte, centrée sur le point de rejet")
+        map_form.addRow("Étendue:", self.range_input)
+        self.resolution_combo = QComboBox()
+        self.resolution_combo.addItems([f"{n} × {n}" for n in self.RESOLUTIONS])
+        self.resolution_combo.setCurrentIndex(2)
+        map_form.addRow("Résolution:", self.resolution_combo)
+        compute_btn = QPushButton("Calculer le panache")
+        compute_btn.clicked.connect(self.compute_plume)
+        map_form.addRow(compute_btn)
+        self.time_combo = QComboBox()
+        self.time_combo.currentIndexChanged.connect(self.plot_selected_time)
+        map_form.addRow("Affichage:", self.time_combo)
+        map_group.setLayout(map_form)
+        inputs_layout.addWidget(map_group)
+
+        self.info_label = QLabel()
+        self.info_label.setWordWrap(True)
+        inputs_layout.addWidget(self.info_label)
+        inputs_layout.addStretch(1)
+        layout.addLayout(inputs_layout, 1)
+
+        self.figure, self.ax = plt.subplots()
+        self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(self.canvas, 2)
+
+    def _spin(self, minimum, maximum, value, suffix, decimals):
+        spin = QDoubleSpinBox()
+        spin.setDecimals(decimals)
+        spin.setRange(minimum, maximum)
+        spin.setValue(value)
+        spin.setSuffix(suffix)
+        return spin
+
+    def _read_times(self):
+        """Instants saisis, en minutes (ValueError si la liste est vide ou invalide)"""
+        times = sorted({float(text.strip().replace(",", ".")) for text in self.times_input.text().split(",")
+                        if text.strip()})
+        if not times or times[0] <= 0:
+            raise ValueError("Indiquez au moins un instant strictement positif")
+        return times
+
+    def compute_plume(self):
+        """Calcule le débit de dose au sol pour tous les instants demandés"""
+        isotope = isotope_catalog.get(self.isotope_combo.currentText())
+        if isotope is None:
+            QMessageBox.warning(self, "Attention", "Veuillez choisir un isotope du catalogue")
+            return
+        mean_energy = float(gamma_sum(isotope.energies, isotope.intensities)) / 100
+        if mean_energy <= 0:
+            QMessageBox.warning(self, "Attention", f"{isotope.name} n'a pas d'émission gamma exploitable")
+            return
+        try:
+            times = self._read_times()
+        except ValueError:
+            QMessageBox.critical(self, "Erreur Saisie", "Instants invalides : saisissez des minutes séparées par des virgules.")
+            return
+
+        activity = unit_registry.convert(self.activity_input.value(), self.activity_unit.currentText(), "Bq")
+        duration = self.duration_input.value() * 60
+        stability = STABILITY_CLASSES[self.stability_combo.currentIndex()]
+        extent_size = self.range_input.value()
+        extent = (-extent_size, extent_size, -extent_size, extent_size)
+        resolution = self.RESOLUTIONS[self.resolution_combo.currentIndex()]
+        try:
+            xs, ys, concentration = ground_concentration(
+                activity / duration, self.wind_speed_input.value(), stability, self.height_input.value(),
+                extent, (resolution, resolution), wind_direction=self.wind_direction_input.value(),
+                times=np.array(times) * 60, half_life=isotope.half_life, release_duration=duration)
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur de calcul: {str(e)}")
+            return
+
+        self.results = (extent, xs, ys, cloud_dose_rate(concentration, mean_energy), times)
+        self.time_combo.blockSignals(True)
+        self.time_combo.clear()
+        self.time_combo.addItems([f"{t:g} min" for t in times])
+        self.time_combo.blockSignals(False)
+        self.plot_selected_time(0)
+
+        save_to_history([
+            "Panache",
+            f"Rejet: {self.activity_input.value()} {self.activity_unit.currentText()} de {isotope.name} "
+            f"en {self.duration_input.value():g} min, hauteur {self.height_input.value():g} m",
+            f"Vent: {self.wind_speed_input.value():g} m/s venant de {self.wind_direction_input.value():g}°, "
+            f"stabilité {stability}"
+        ])
+
+    def plot_selected_time(self, index):
+        """Trace la carte de débit de dose de l'instant choisi et ses zones"""
+        if self.results is None or index < 0:
+            return
+        extent, xs, ys, dose_rates, times = self.results
+        dose = dose_rates[index]
+
+        self.figure.clear()
+        self.ax = self.figure.add_subplot(111)
+        positive = dose[dose > 0]
+        vmin = max(positive.min(), ZONES[0][0] * 1e-2) if positive.size else ZONES[0][0] * 1e-2
+        vmax = max(dose.max(), vmin * 10)
+        image = self.ax.imshow(np.where(dose > 0, np.clip(dose, vmin, None), np.nan), extent=extent,
+                               origin='lower', norm=LogNorm(vmin=vmin, vmax=vmax), cmap='inferno', aspect='equal')
+        self.figure.colorbar(image, ax=self.ax, label="Débit de dose d'immersion (µSv/h)")
+
+        contours = extract_contours(xs, ys, dose, [level for level, _, _ in ZONES], center=(0.0, 0.0))
+        for contour, (level, label, color) in zip(contours, ZONES):
+            for i, polygon in enumerate(contour.polygons):
+                closed = np.vstack([polygon, polygon[:1]])
+                self.ax.plot(closed[:, 0], closed[:, 1], color=color, linestyle='--',
+                             label=f"{label} ({level:g} µSv/h)" if i == 0 else None)
+        self.ax.scatter([0.0], [0.0], color='white', edgecolors='black', marker='*', s=150, label='Rejet')
+
+        self.ax.set_xlabel("X (m, est)")
+        self.ax.set_ylabel("Y (m, nord)")
+        self.ax.set_title(f"Panache à {times[index]:g} min")
+        self.ax.legend(loc='upper right', fontsize=9)
+        self.canvas.draw()
+
+        lines = [f"Débit maximal: {dose.max():.3g} µSv/h"]
+        for contour, (level, label, _) in zip(contours, ZONES):
+            if contour.polygons:
+                lines.append(f"{label} ({level:g} µSv/h): {contour.area / 1e4:.1f} ha, "
+                             f"jusqu'à {contour.max_distance:.0f} m du rejet")
+            else:
+                lines.append(f"{label} ({level:g} µSv/h): non atteint")
+        self.info_label.setText("\n".join(lines))
@@ -1,7 +1,20 @@
-from PySide6.QtWidgets import QDialog, QVBoxLayout
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGroupBox, QTableWidget, QTableWidgetItem,
+    QPushButton, QComboBox, QLabel, QMessageBox, QHeaderView
+)
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.colors import LogNorm
 import numpy as np
+from ..utils.dose_field import DoseField, PointSource, Wall
+from ..utils.contours import extract_contours, PUBLIC_LIMIT, REFLEX_ZONE_LIMIT
+from ..core.units import unit_registry
+
+# Zones tracées sur la carte : (seuil µSv/h, libellé, couleur)
+ZONES = [
+    (PUBLIC_LIMIT, "Périmètre public", 'cyan'),
+    (REFLEX_ZONE_LIMIT, "Zone réflexe", 'orange')
+]
 
 class PlotDialog(QDialog):
     def __init__(self, d1, d2, ded1, ded2, unit, parent=None):
@@ -9,25 +22,8 @@ class PlotDialog(QDialog):
         self.setWindowTitle("Visualisation des distances et débits")
         self.setMinimumSize(600, 400)
         
-        # Conversion des valeurs en µSv/h pour la comparaison
-        conversion_factors = {
-            "Sv/h": 1e6,
-            "mSv/h": 1e3,
-            "µSv/h": 1,
-            "nSv/h": 1e-3,
-            "pSv/h": 1e-6,
-            "R/h": 1e4,
-            "mR/h": 10,
-            "µR/h": 0.01,
-            "Rad/h": 1e4,
-            "mRad/h": 10,
-            "µRad/h": 0.01,
-            "Rem/h": 1e4,
-            "mRem/h": 10
-        }
-        
         # Conversion en µSv/h pour le calcul
-        factor = conversion_factors.get(unit, 1)
+        factor = unit_registry.factor(unit, "µSv/h")
         ded1_converted = ded1 * factor
         ded2_converted = ded2 * factor
         
@@ -103,4 +99,172 @@ class PlotDialog(QDialog):
         ax.tick_params(axis='both', which='major', labelsize=9)
         
         # Légende avec taille de police réduite
-        ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), fontsize=9)
\ No newline at end of file
+        ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), fontsize=9)
+
+
+class DoseMapDialog(QDialog):
+    """Carte de débit de dose 2D pour plusieurs sources ponctuelles et murs"""
+
+    RESOLUTIONS = [250, 500, 1000, 2000]
+
+    def __init__(self, sources=(), walls=(), parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Carte de débit de dose")
+        self.setMinimumSize(900, 650)
+
+        layout = QHBoxLayout(self)
+
+        # Panneau de saisie de la scène
+        scene_layout = QVBoxLayout()
+
+        sources_group = QGroupBox("Sources ponctuelles")
+        sources_layout = QVBoxLayout()
+        self.sources_table = self._create_table(["X (m)", "Y (m)", "DED 1 m (µSv/h)"])
+        sources_layout.addWidget(self.sources_table)
+        sources_layout.addLayout(self._table_buttons(self.sources_table, [0.0, 0.0, 100.0]))
+        sources_group.setLayout(sources_layout)
+
+        walls_group = QGroupBox("Murs")
+        walls_layout = QVBoxLayout()
+        self.walls_table = self._create_table(["X1", "Y1", "X2", "Y2", "Transmission (%)"])
+        walls_layout.addWidget(self.walls_table)
+        walls_layout.addLayout(self._table_buttons(self.walls_table, [1.0, -1.0, 1.0, 1.0, 10.0]))
+        walls_group.setLayout(walls_layout)
+
+        resolution_layout = QHBoxLayout()
+        resolution_layout.addWidget(QLabel("Résolution:"))
+        self.resolution_combo = QComboBox()
+        self.resolution_combo.addItems([f"{n} × {n}" for n in self.RESOLUTIONS])
+        self.resolution_combo.setCurrentIndex(1)
+        resolution_layout.addWidget(self.resolution_combo)
+
+        compute_btn = QPushButton("Calculer la carte")
+        compute_btn.clicked.connect(self.compute_map)
+
+        self.info_label = QLabel()
+        self.info_label.setWordWrap(True)
+
+        scene_layout.addWidget(sources_group)
+        scene_layout.addWidget(walls_group)
+        scene_layout.addLayout(resolution_layout)
+        scene_layout.addWidget(compute_btn)
+        scene_layout.addWidget(self.info_label)
+        layout.addLayout(scene_layout, 1)
+
+        # Carte
+        self.figure, self.ax = plt.subplots()
+        self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(self.canvas, 2)
+
+        for source in sources:
+            self._add_row(self.sources_table, [source.x, source.y, source.dose_rate_1m])
+        for wall in walls:
+            self._add_row(self.walls_table, [wall.x1, wall.y1, wall.x2, wall.y2, wall.transmission * 100])
+
+        if sources:
+            self.compute_map()
+
+    def _create_table(self, headers):
+        """Crée une table de saisie numérique"""
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.verticalHeader().setVisible(False)
+        return table
+
+    def _table_buttons(self, table, defaults):
+        """Boutons d'ajout et de suppression de lignes"""
+        buttons = QHBoxLayout()
+        add_btn = QPushButton("Ajouter")
+        add_btn.clicked.connect(lambda: self._add_row(table, defaults))
+        remove_btn = QPushButton("Supprimer")
+        remove_btn.clicked.connect(lambda: table.removeRow(table.currentRow()) if table.currentRow() >= 0 else None)
+        buttons.addWidget(add_btn)
+        buttons.addWidget(remove_btn)
+        return buttons
+
+    def _add_row(self, table, values):
+        """Ajoute une ligne de valeurs à une table"""
+        row = table.rowCount()
+        table.insertRow(row)
+        for column, value in enumerate(values):
+            table.setItem(row, column, QTableWidgetItem(f"{value:g}"))
+
+    def _read_table(self, table):
+        """Lit les valeurs d'une table (virgule ou point décimal)"""
+        rows = []
+        for row in range(table.rowCount()):
+            values = []
+            for column in range(table.columnCount()):
+                item = table.item(row, column)
+                text = item.text().strip().replace(',', '.') if item else ""
+                values.append(float(text))
+            rows.append(values)
+        return rows
+
+    def compute_map(self):
+        """Calcule et affiche la carte de débit de dose."""
+        try:
+            sources = [PointSource(x, y, rate) for x, y, rate in self._read_table(self.sources_table)]
+            walls = [Wall(x1, y1, x2, y2, transmission / 100)
+                     for x1, y1, x2, y2, transmission in self._read_table(self.walls_table)]
+        except ValueError:
+            QMessageBox.critical(self, "Erreur Saisie", "Veuillez entrer des valeurs numériques valides.")
+            return
+        if not sources:
+            QMessageBox.warning(self, "Attention", "Veuillez ajouter au moins une source")
+            return
+
+        try:
+            field = DoseField(sources, walls)
+            resolution = self.RESOLUTIONS[self.resolution_combo.currentIndex()]
+            # Pool de processus pour les grilles fines uniquement
+            workers = None if resolution >= 1000 else 1
+            extent = field.extent(level=PUBLIC_LIMIT)
+            xs, ys, dose = field.grid(extent, (resolution, resolution), workers=workers)
+            self.plot_map(field, extent, xs, ys, dose)
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur de calcul: {str(e)}")
+
+    def plot_map(self, field, extent, xs, ys, dose):
+        """Trace la carte de chaleur, les isolignes des zones, les sources et les murs"""
+        # La figure est recréée pour repartir d'une barre de couleurs neuve
+        self.figure.clear()
+        self.ax = self.figure.add_subplot(111)
+
+        positive = dose[dose > 0]
+        vmin = max(positive.min(), PUBLIC_LIMIT * 1e-2) if positive.size else PUBLIC_LIMIT * 1e-2
+        vmax = max(dose.max(), vmin * 10)
+        image = self.ax.imshow(np.clip(dose, vmin, None), extent=extent, origin='lower',
+                               norm=LogNorm(vmin=vmin, vmax=vmax), cmap='inferno', aspect='equal')
+        self.figure.colorbar(image, ax=self.ax, label="Débit de dose (µSv/h)")
+
+        # Isolignes des zones, distances mesurées depuis la source la plus intense
+        strongest = max(field.sources, key=lambda source: source.dose_rate_1m)
+        contours = extract_contours(xs, ys, dose, [level for level, _, _ in ZONES],
+                                    center=(strongest.x, strongest.y))
+        for contour, (level, label, color) in zip(contours, ZONES):
+            for i, polygon in enumerate(contour.polygons):
+                closed = np.vstack([polygon, polygon[:1]])
+                self.ax.plot(closed[:, 0], closed[:, 1], color=color, linestyle='--',
+                             label=f"{label} ({level:g} µSv/h)" if i == 0 else None)
+
+        for wall in field.walls:
+            self.ax.plot([wall.x1, wall.x2], [wall.y1, wall.y2], color='white', linewidth=3)
+        self.ax.scatter([s.x for s in field.sources], [s.y for s in field.sources],
+                        color='white', edgecolors='black', marker='*', s=150, label='Sources')
+
+        self.ax.set_xlabel("X (m)")
+        self.ax.set_ylabel("Y (m)")
+        self.ax.set_title("Débit de dose")
+        self.ax.legend(loc='upper right', fontsize=9)
+        self.canvas.draw()
+
+        lines = [f"Débit maximal: {dose.max():.3g} µSv/h"]
+        for contour, (level, label, _) in zip(contours, ZONES):
+            if contour.polygons:
+                lines.append(f"{label} ({level:g} µSv/h): {contour.area:.1f} m², "
+                             f"jusqu'à {contour.max_distance:.1f} m")
+            else:
+                lines.append(f"{label} ({level:g} µSv/h): non atteint")
+        self.info_label.setText("\n".join(lines))
@@ -0,0 +1,191 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, QPushButton, QSlider,
+    QComboBox, QDoubleSpinBox, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox
+)
+from PySide6.QtCore import Qt, QTimer
+from datetime import datetime
+import math
+from ..utils.recording import TelemetryRecording
+
+
+class ReplayDialog(QDialog):
+    """Rejeu d'une intervention enregistrée : état des agents à tout instant et agrégats."""
+
+    STATE_HEADERS = ["Agent", "Engagé", "Débit (µSv/h)", "Dose (µSv)", "Position (m)"]
+    SUMMARY_HEADERS = ["Agent", "Débit max (µSv/h)", "Au-dessus du seuil (min)"]
+    # Facteurs d'accélération proposés (secondes d'intervention par seconde réelle)
+    SPEEDS = [1, 10, 60, 300, 1800]
+    # Période de rafraîchissement pendant la lecture (ms)
+    TICK_MS = 100
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Rejeu de l'intervention")
+        self.setMinimumSize(700, 600)
+
+        self.recording = TelemetryRecording(path)
+        self.start, self.end = self.recording.time_range()
+        self.current = self.start
+
+        layout = QVBoxLayout(self)
+
+        # Navigation dans le temps
+        timeline_group = QGroupBox("Chronologie")
+        timeline_layout = QVBoxLayout()
+        self.time_label = QLabel()
+        self.time_label.setAlignment(Qt.AlignCenter)
+        self.time_label.setObjectName("resultLabel")
+        timeline_layout.addWidget(self.time_label)
+
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.valueChanged.connect(self.seek)
+        timeline_layout.addWidget(self.slider)
+
+        controls_layout = QHBoxLayout()
+        self.play_button = QPushButton("Lecture")
+        self.play_button.clicked.connect(self.toggle_play)
+        self.speed_combo = QComboBox()
+        self.speed_combo.addItems([f"×{speed}" for speed in self.SPEEDS])
+        self.speed_combo.setCurrentIndex(2)
+        self.speed_combo.setToolTip("Vitesse de lecture")
+        refresh_button = QPushButton("Actualiser")
+        refresh_button.setToolTip("Relit l'enregistrement (intervention en cours)")
+        refresh_button.clicked.connect(self.refresh)
+        controls_layout.addWidget(self.play_button)
+        controls_layout.addWidget(self.speed_combo)
+        controls_layout.addStretch()
+        controls_layout.addWidget(refresh_button)
+        timeline_layout.addLayout(controls_layout)
+        timeline_group.setLayout(timeline_layout)
+        layout.addWidget(timeline_group)
+
+        # État des agents à l'instant affiché
+        state_group = QGroupBox("Agents")
+        state_layout = QVBoxLayout()
+        self.state_table = QTableWidget(0, len(self.STATE_HEADERS))
+        self.state_table.setHorizontalHeaderLabels(self.STATE_HEADERS)
+        self.state_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.state_table.verticalHeader().setVisible(False)
+        self.state_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        state_layout.addWidget(self.state_table)
+        state_group.setLayout(state_layout)
+        layout.addWidget(state_group)
+
+        # Agrégats sur toute l'intervention
+        summary_group = QGroupBox("Bilan de l'intervention")
+        summary_layout = QVBoxLayout()
+        threshold_layout = QHBoxLayout()
+        threshold_layout.addWidget(QLabel("Seuil de débit:"))
+        self.threshold_input = QDoubleSpinBox()
+        self.threshold_input.setDecimals(1)
+        self.threshold_input.setRange(0.0, 1e9)
+        self.threshold_input.setValue(100.0)
+        self.threshold_input.setSuffix(" µSv/h")
+        threshold_layout.addWidget(self.threshold_input)
+        summary_button = QPushButton("Calculer")
+        summary_button.clicked.connect(self.compute_summary)
+        threshold_layout.addWidget(summary_button)
+        summary_layout.addLayout(threshold_layout)
+        self.summary_table = QTableWidget(0, len(self.SUMMARY_HEADERS))
+        self.summary_table.setHorizontalHeaderLabels(self.SUMMARY_HEADERS)
+        self.summary_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.summary_table.verticalHeader().setVisible(False)
+        self.summary_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        summary_layout.addWidget(self.summary_table)
+        summary_group.setLayout(summary_layout)
+        layout.addWidget(summary_group)
+
+        self.play_timer = QTimer()
+        self.play_timer.timeout.connect(self.advance)
+
+        self.update_slider_range()
+        self.show_state()
+
+    def update_slider_range(self):
+        """Une graduation par seconde d'intervention"""
+        self.slider.blockSignals(True)
+        self.slider.setRange(0, int(math.ceil(self.end - self.start)))
+        self.slider.setValue(int(self.current - self.start))
+        self.slider.blockSignals(False)
+
+    def refresh(self):
+        """Reprend les enregistrements ajoutés depuis l'ouverture"""
+        try:
+            self.recording.refresh()
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Erreur", f"Impossible de relire l'enregistrement :\n{str(e)}")
+            return
+        self.start, self.end = self.recording.time_range()
+        self.current = min(max(self.current, self.start), self.end)
+        self.update_slider_range()
+        self.show_state()
+
+    def seek(self, value):
+        """Déplacement manuel du curseur"""
+        self.current = self.start + value
+        self.show_state()
+
+    def toggle_play(self):
+        if self.play_timer.isActive():
+            self.play_timer.stop()
+            self.play_button.setText("Lecture")
+            return
+        if self.current >= self.end:
+            self.current = self.start
+        self.play_timer.start(self.TICK_MS)
+        self.play_button.setText("Pause")
+
+    def advance(self):
+        """Avance la lecture selon la vitesse choisie"""
+        speed = self.SPEEDS[self.speed_combo.currentIndex()]
+        self.current = min(self.current + speed * self.TICK_MS / 1000, self.end)
+        self.slider.blockSignals(True)
+        self.slider.setValue(int(self.current - self.start))
+        self.slider.blockSignals(False)
+        self.show_state()
+        if self.current >= self.end:
+            self.toggle_play()
+
+    def show_state(self):
+        """Affiche le dernier état connu de chaque agent à l'instant courant"""
+        self.time_label.setText(datetime.fromtimestamp(self.current).strftime("%d/%m/%Y %H:%M:%S")
+                                if len(self.recording) else "Aucun enregistrement")
+        state = self.recording.state_at(self.current)
+        engaged = self.recording.engaged_at(self.current)
+        agents = sorted(set(state) | engaged)
+
+        self.state_table.setRowCount(len(agents))
+        for row, agent in enumerate(agents):
+            reading = state.get(agent, {})
+            dose_rate = reading.get("dose_rate", math.nan)
+            dose = reading.get("dose", math.nan)
+            x, y = reading.get("x", math.nan), reading.get("y", math.nan)
+            values = [
+                agent,
+                "Oui" if agent in engaged else "Non",
+                "-" if math.isnan(dose_rate) else f"{dose_rate:.1f}",
+                "-" if math.isnan(dose) else f"{dose:.1f}",
+                "-" if math.isnan(x) else f"{x:.1f} ; {y:.1f}"
+            ]
+            for column, value in enumerate(values):
+                item = self.state_table.item(row, column)
+                if item is None:
+                    self.state_table.setItem(row, column, QTableWidgetItem(value))
+                else:
+                    item.setText(value)
+
+    def compute_summary(self):
+        """Débit maximal et durée au-dessus du seuil, calculés sur le fichier projeté"""
+        maxima = self.recording.max_dose_rate()
+        durations = self.recording.time_above(self.threshold_input.value())
+        agents = sorted(maxima)
+        self.summary_table.setRowCount(len(agents))
+        for row, agent in enumerate(agents):
+            self.summary_table.setItem(row, 0, QTableWidgetItem(agent))
+            self.summary_table.setItem(row, 1, QTableWidgetItem(f"{maxima[agent]:.1f}"))
+            self.summary_table.setItem(row, 2, QTableWidgetItem(f"{durations.get(agent, 0.0) / 60:.1f}"))
+
+    def closeEvent(self, event):
+        self.play_timer.stop()
+        self.recording.close()
+        event.accept()
@@ -0,0 +1,196 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox, QLabel,
+    QPushButton, QSpinBox, QDoubleSpinBox, QMessageBox, QTableWidget,
+    QTableWidgetItem, QHeaderView
+)
+from PySide6.QtCore import Qt
+import numpy as np
+from ..utils.stay_time import integrated_dose, max_stay_time, rotation_schedule
+
+
+class StayTimeDialog(QDialog):
+    """Dose intégrée et durée maximale de séjour des agents engagés."""
+
+    HEADERS = ["Agent", "Distance (m)", "Début (min)", "Durée (min)", "Dose (µSv)", "Durée max (min)"]
+    # Colonnes saisies par l'utilisateur, les suivantes sont calculées
+    INPUT_COLUMNS = 4
+
+    def __init__(self, dose_rate_1m=0.0, half_life=0.0, parent=None):
+        """``dose_rate_1m`` en µSv/h, ``half_life`` en secondes (0 = pas de décroissance)."""
+        super().__init__(parent)
+        self.setWindowTitle("Dose intégrée et durée de séjour")
+        self.setMinimumSize(650, 550)
+
+        layout = QVBoxLayout(self)
+
+        # Source et budget
+        source_group = QGroupBox("Source")
+        source_layout = QFormLayout()
+        self.dose_rate_input = QDoubleSpinBox()
+        self.dose_rate_input.setDecimals(2)
+        self.dose_rate_input.setRange(0.0, 1e12)
+        self.dose_rate_input.setValue(dose_rate_1m)
+        self.dose_rate_input.setSuffix(" µSv/h")
+        self.dose_rate_input.setToolTip("Débit de dose à 1 m au début de l'intervention")
+        source_layout.addRow("DED à 1m:", self.dose_rate_input)
+
+        self.half_life_input = QDoubleSpinBox()
+        self.half_life_input.setDecimals(3)
+        self.half_life_input.setRange(0.0, 1e12)
+        self.half_life_input.setValue(half_life / 3600)
+        self.half_life_input.setSuffix(" h")
+        self.half_life_input.setSpecialValueText("pas de décroissance")
+        source_layout.addRow("Période:", self.half_life_input)
+
+        self.budget_input = QDoubleSpinBox()
+        self.budget_input.setDecimals(1)
+        self.budget_input.setRange(0.1, 1e6)
+        self.budget_input.setValue(1000.0)
+        self.budget_input.setSuffix(" µSv")
+        self.budget_input.setToolTip("Dose maximale autorisée par agent")
+        source_layout.addRow("Budget de dose par agent:", self.budget_input)
+        source_group.setLayout(source_layout)
+        layout.addWidget(source_group)
+
+        # Agents engagés
+        agents_group = QGroupBox("Agents engagés")
+        agents_layout = QVBoxLayout()
+        self.agents_table = QTableWidget(0, len(self.HEADERS))
+        self.agents_table.setHorizontalHeaderLabels(self.HEADERS)
+        self.agents_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.agents_table.verticalHeader().setVisible(False)
+        agents_layout.addWidget(self.agents_table)
+
+        buttons_layout = QHBoxLayout()
+        add_btn = QPushButton("Ajouter")
+        add_btn.clicked.connect(lambda: self.add_agent(f"Agent {self.agents_table.rowCount() + 1}", 5.0, 0.0, 30.0))
+        remove_btn = QPushButton("Supprimer")
+        remove_btn.clicked.connect(self.remove_agent)
+        calculate_btn = QPushButton("Calculer")
+        calculate_btn.clicked.connect(self.calculate)
+        buttons_layout.addWidget(add_btn)
+        buttons_layout.addWidget(remove_btn)
+        buttons_layout.addWidget(calculate_btn)
+        agents_layout.addLayout(buttons_layout)
+        agents_group.setLayout(agents_layout)
+        layout.addWidget(agents_group)
+
+        # Relève au même poste
+        rotation_group = QGroupBox("Relève au même poste")
+        rotation_layout = QHBoxLayout()
+        rotation_layout.addWidget(QLabel("Agents:"))
+        self.rotation_count_input = QSpinBox()
+        self.rotation_count_input.setRange(1, 200)
+        self.rotation_count_input.setValue(30)
+        rotation_layout.addWidget(self.rotation_count_input)
+        rotation_layout.addWidget(QLabel("Distance:"))
+        self.rotation_distance_input = QDoubleSpinBox()
+        self.rotation_distance_input.setDecimals(2)
+        self.rotation_distance_input.setRange(0.1, 10000.0)
+        self.rotation_distance_input.setValue(5.0)
+        self.rotation_distance_input.setSuffix(" m")
+        rotation_layout.addWidget(self.rotation_distance_input)
+        rotation_btn = QPushButton("Planifier la relève")
+        rotation_btn.setToolTip("Chaque agent reste jusqu'à atteindre son budget, puis est relevé")
+        rotation_btn.clicked.connect(self.plan_rotation)
+        rotation_layout.addWidget(rotation_btn)
+        rotation_group.setLayout(rotation_layout)
+        layout.addWidget(rotation_group)
+
+        self.info_label = QLabel()
+        self.info_label.setWordWrap(True)
+        layout.addWidget(self.info_label)
+
+        close_btn = QPushButton("Fermer")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+
+    def add_agent(self, name, distance, start, duration):
+        """Ajoute un agent (distance en m, début et durée en minutes)."""
+        row = self.agents_table.rowCount()
+        self.agents_table.insertRow(row)
+        self.agents_table.setItem(row, 0, QTableWidgetItem(name))
+        for column, value in enumerate((distance, start, duration), start=1):
+            self.agents_table.setItem(row, column, QTableWidgetItem(f"{value:g}"))
+
+    def remove_agent(self):
+        """Supprime l'agent sélectionné."""
+        row = self.agents_table.currentRow()
+        if row >= 0:
+            self.agents_table.removeRow(row)
+
+    def read_agents(self):
+        """Lit la table : noms et tableau (agents, 3) distance, début, durée."""
+        names, values = [], []
+        for row in range(self.agents_table.rowCount()):
+            item = self.agents_table.item(row, 0)
+            names.append(item.text() if item else "")
+            row_values = []
+            for column in range(1, self.INPUT_COLUMNS):
+                item = self.agents_table.item(row, column)
+                row_values.append(float(item.text().strip().replace(',', '.') if item else ""))
+            values.append(row_values)
+        return names, np.array(values, dtype=float).reshape(-1, 3)
+
+    def set_result(self, row, column, value):
+        """Écrit une valeur calculée (non éditable) dans la table."""
+        item = QTableWidgetItem("∞" if not np.isfinite(value) else f"{value:.1f}")
+        item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+        self.agents_table.setItem(row, column, item)
+
+    def calculate(self):
+        """Calcule la dose de chaque agent et sa durée maximale de séjour."""
+        try:
+            names, values = self.read_agents()
+        except ValueError:
+            QMessageBox.critical(self, "Erreur Saisie", "Veuillez entrer des valeurs numériques valides.")
+            return
+        if len(names) == 0:
+            QMessageBox.warning(self, "Attention", "Veuillez ajouter au moins un agent")
+            return
+        distances, starts, durations = values.T
+        if np.any(distances <= 0):
+            QMessageBox.warning(self, "Attention", "Les distances doivent être strictement positives.")
+            return
+
+        dose_rate = self.dose_rate_input.value()
+        half_life = self.half_life_input.value() * 3600
+        budget = self.budget_input.value()
+        # Tous les agents en une seule évaluation (temps en heures)
+        doses = integrated_dose(dose_rate, distances, durations / 60, half_life, starts / 60)
+        max_stays = max_stay_time(budget, dose_rate, distances, half_life, starts / 60) * 60
+
+        for row, (dose, max_stay) in enumerate(zip(doses, max_stays)):
+            self.set_result(row, 4, dose)
+            self.set_result(row, 5, max_stay)
+
+        # Tolérance de 0.1 % : les durées saisies sont arrondies à l'affichage
+        over = [name for name, dose in zip(names, doses) if dose > budget * 1.001]
+        text = f"Dose collective: {doses.sum():.1f} µSv - dose maximale: {doses.max():.1f} µSv"
+        if over:
+            text += f"\nBudget dépassé pour: {', '.join(over)}"
+        self.info_label.setText(text)
+
+    def plan_rotation(self):
+        """Remplit la table avec une relève d'agents au même poste."""
+        dose_rate = self.dose_rate_input.value()
+        if dose_rate <= 0:
+            QMessageBox.warning(self, "Attention", "Veuillez saisir le débit de dose à 1 m")
+            return
+        count = self.rotation_count_input.value()
+        distance = self.rotation_distance_input.value()
+        starts, ends = rotation_schedule(count, self.budget_input.value(), dose_rate, distance,
+                                         self.half_life_input.value() * 3600)
+
+        self.agents_table.setRowCount(0)
+        for index, (start, end) in enumerate(zip(starts, ends)):
+            if not np.isfinite(start):
+                break
+            # Le dernier agent utile peut rester indéfiniment (décroissance) : durée laissée à 0
+            duration = (end - start) * 60 if np.isfinite(end) else 0.0
+            self.add_agent(f"Agent {index + 1}", distance, start * 60, duration)
+        self.calculate()
+        engaged = self.agents_table.rowCount()
+        if engaged < count:
+            self.info_label.setText(self.info_label.text()
+                                    + f"\nLa décroissance rend inutile la relève au-delà de {engaged} agents")
@@ -1,18 +1,29 @@
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
-    QLabel, QPushButton, QMessageBox, QLineEdit
+    QLabel, QPushButton, QMessageBox, QLineEdit, QFileDialog
 )
 from PySide6.QtCore import Qt
+import os
 from ..utils.widgets import ClearingDoubleSpinBox
 from ..utils.database import save_to_history
+from ..core.tmr import category_of, transport_index, classify_manifest, CATEGORIES, INVALID
 
 class TMRDialog(QDialog):
     """Dialog pour le calcul du TMR."""
     
+    # Couleurs (fond, texte) de l'étiquette par catégorie
+    CATEGORY_STYLES = {
+        "I": ("#EAF5E4", "#00824B"),
+        "II": ("#FFF8E1", "#D37000"),
+        "III": ("#FFECB3", "#FC0909"),
+        "EX": ("#FFEBEE", "#020202"),
+        "N/A": ("#e2e3e5", "#383d41")
+    }
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Calcul TMR")
-        self.setFixedSize(300, 200)
+        self.setFixedSize(300, 230)
 
         self.layout = QVBoxLayout(self)
 
@@ -61,6 +72,12 @@ class TMRDialog(QDialog):
         calculate_layout.addLayout(it_layout)
         self.layout.addLayout(calculate_layout)
 
+        # Traitement d'un manifeste complet
+        self.batch_button = QPushButton("Manifeste CSV...")
+        self.batch_button.setToolTip("Classe tous les colis d'un manifeste CSV (identifiant, contact, 1m)")
+        self.batch_button.clicked.connect(self.process_manifest)
+        self.layout.addWidget(self.batch_button)
+
         self.layout.addStretch(1)
 
     def calculate_tmr(self):
@@ -76,20 +93,12 @@ class TMRDialog(QDialog):
             )
 
             # Calcul de l'IT
-            it = round(ded_1m / 10, 2)
+            it = float(transport_index(ded_1m))
             self.it_value_label.setText(str(it))
 
             # Détermination de la catégorie
-            if ded_contact < 5 and ded_1m == 0:
-                self._set_tmr_category("I", "#EAF5E4", "#00824B")
-            elif 5 <= ded_contact <= 500 and 0 < ded_1m <= 10:
-                self._set_tmr_category("II", "#FFF8E1", "#D37000")
-            elif 500 < ded_contact <= 2000 and 10 < ded_1m <= 100:
-                self._set_tmr_category("III", "#FFECB3", "#FC0909")
-            elif 2000 < ded_contact <= 10000 :
-                self._set_tmr_category("EX", "#FFEBEE", "#020202")
-            else:
-                self._set_tmr_category("N/A", "#e2e3e5", "#383d41")
+            category = category_of(ded_contact, ded_1m)
+            self._set_tmr_category(category, *self.CATEGORY_STYLES[category])
 
             # Sauvegarde dans l'historique
             save_to_history([
@@ -103,6 +112,47 @@ class TMRDialog(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Erreur", str(e))
 
+    def process_manifest(self):
+        """Classe un manifeste CSV et écrit le manifeste annoté (catégorie, IT)."""
+        input_path, _ = QFileDialog.getOpenFileName(
+            self, "Ouvrir un manifeste", "", "Fichiers CSV (*.csv);;Tous les fichiers (*)"
+        )
+        if not input_path:
+            return
+        base, _ = os.path.splitext(input_path)
+        output_path, _ = QFileDialog.getSaveFileName(
+            self, "Enregistrer le manifeste annoté", f"{base}_tmr.csv", "Fichiers CSV (*.csv)"
+        )
+        if not output_path:
+            return
+        if os.path.abspath(output_path) == os.path.abspath(input_path):
+            QMessageBox.warning(self, "Attention", "Le manifeste annoté doit être un fichier différent.")
+            return
+        
+        try:
+            summary = classify_manifest(input_path, output_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Erreur", f"Erreur lors du traitement du manifeste: {str(e)}")
+            return
+        
+        counts = " - ".join(f"{name}: {summary.counts[name]}" for name in CATEGORIES)
+        text = (f"{summary.packages} colis traités\n{counts}\n"
+                f"IT total: {summary.total_transport_index:.2f} - IT max: {summary.max_transport_index:.2f}\n"
+                f"Débit au contact max: {summary.max_contact:g} µSv/h")
+        if summary.counts[INVALID]:
+            lines = ", ".join(map(str, summary.invalid_rows[:20]))
+            text += f"\n{summary.counts[INVALID]} lignes invalides (lignes {lines}...)"
+        text += f"\n\nManifeste annoté: {output_path}"
+        QMessageBox.information(self, "Manifeste TMR", text)
+        
+        save_to_history([
+            "TMR (manifeste)",
+            f"Fichier: {os.path.basename(input_path)}",
+            f"Colis: {summary.packages}",
+            counts,
+            f"IT total: {summary.total_transport_index:.2f}"
+        ])
+
     def _set_tmr_category(self, category, bg_color, text_color):
         """Définit la catégorie TMR avec le style approprié."""
         self.tmr_label_display.setText(category)
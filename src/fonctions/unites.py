@@ -3,6 +3,7 @@ from PySide6.QtWidgets import (
     QPushButton, QLabel, QComboBox, QGroupBox
 )
 from PySide6.QtCore import Qt
+from ..core.units import unit_registry
 
 class UnitesRadDialog(QDialog):
     def __init__(self, parent=None):
@@ -19,6 +20,7 @@ class UnitesRadDialog(QDialog):
         
         # Widgets pour la valeur d'entrée
         self.input_value = QLineEdit()
+        self.input_value.setToolTip("Valeur, éventuellement suivie de son unité (ex: 12,5 mSv/h)")
         self.input_unit = QComboBox()
         self.input_unit.addItems(["µSv/h", "mSv/h", "Sv/h", "mR/h", "R/h"])
         
@@ -45,29 +47,10 @@ class UnitesRadDialog(QDialog):
     def convert(self):
         """Effectue la conversion entre les unités"""
         try:
-            value = float(self.input_value.text())
-            from_unit = self.input_unit.currentText()
             to_unit = self.output_unit.currentText()
-            
-            # Conversion en µSv/h comme unité intermédiaire
-            if from_unit == "mSv/h":
-                value *= 1000
-            elif from_unit == "Sv/h":
-                value *= 1000000
-            elif from_unit == "mR/h":
-                value *= 10
-            elif from_unit == "R/h":
-                value *= 10000
-            
-            # Conversion vers l'unité cible
-            if to_unit == "mSv/h":
-                value /= 1000
-            elif to_unit == "Sv/h":
-                value /= 1000000
-            elif to_unit == "mR/h":
-                value /= 10
-            elif to_unit == "R/h":
-                value /= 10000
+            # Une unité saisie avec la valeur prime sur celle du menu
+            value = unit_registry.parse_to(self.input_value.text(), to_unit,
+                                           default_unit=self.input_unit.currentText())
             
             self.result_label.setText(f"Résultat: {value:.6f} {to_unit}")
         except ValueError:
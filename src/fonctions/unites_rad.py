@@ -4,43 +4,15 @@ from PySide6.QtWidgets import (
 )
 from ..utils.widgets import ClearingDoubleSpinBox
 from ..utils.database import save_to_history
+from ..core.units import unit_registry
 
 class UnitesRadDialog(QDialog):
-    # Constantes de classe pour les unités et facteurs de conversion
+    # Unités proposées, facteurs de conversion issus du registre des unités
     DOSE_UNITS = ["Sv/h", "mSv/h", "µSv/h", "nSv/h", "pSv/h", 
                   "R/h", "mR/h", "µR/h", "Rad/h", "mRad/h", 
                   "µRad/h", "Rem/h", "mRem/h"]
     
-    ACTIVITY_UNITS = ["Bq", "kBq", "MBq", "GBq", "TBq", 
-                      "Ci", "mCi", "µCi", "nCi"]
-    
-    DOSE_CONVERSIONS = {
-        "Sv/h": (1000, 1/1000), 
-        "mSv/h": (1, 1),
-        "µSv/h": (0.001, 1000),
-        "nSv/h": (0.000001, 1000000),
-        "pSv/h": (0.000000001, 1000000000),
-        "R/h": (8.77, 1/8.77),
-        "mR/h": (0.00877, 1/0.00877),
-        "µR/h": (0.00000877, 1/0.00000877),
-        "Rad/h": (10, 1/10),
-        "mRad/h": (0.01, 1/0.01),
-        "µRad/h": (0.00001, 1/0.00001),
-        "Rem/h": (10, 1/10),
-        "mRem/h": (0.01, 1/0.01)
-    }
-    
-    ACTIVITY_CONVERSIONS = {
-        "Bq": (1, 1),
-        "kBq": (1e3, 1e-3),
-        "MBq": (1e6, 1e-6),
-        "GBq": (1e9, 1e-9),
-        "TBq": (1e12, 1e-12),
-        "Ci": (3.7e10, 1/3.7e10),
-        "mCi": (3.7e7, 1/3.7e7),
-        "µCi": (3.7e4, 1/3.7e4),
-        "nCi": (3.7e1, 1/3.7e1)
-    }
+    ACTIVITY_UNITS = unit_registry.units("activity")
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -88,16 +60,15 @@ class UnitesRadDialog(QDialog):
         
         return value_input, unit_combo
 
-    def _convert_value(self, value, from_unit, to_unit, conversions):
+    def _convert_value(self, value, from_unit, to_unit):
         """Convertit une valeur entre deux unités."""
         if value < 0:
             raise ValueError("Valeur négative")
             
-        to_base, from_base = conversions[from_unit][0], conversions[to_unit][1]
-        return value * to_base * from_base
+        return unit_registry.convert(value, from_unit, to_unit)
 
     def calculate_conversion(self, value_input, unit_from_combo, unit_to_combo, 
-                       result_label, conversions, history_type):
+                       result_label, history_type):
         """Calcule et affiche une conversion."""
         try:
             value = value_input.value()
@@ -108,7 +79,7 @@ class UnitesRadDialog(QDialog):
                 result_label.setText("Valeur négative")
                 return
 
-            result = self._convert_value(value, from_unit, to_unit, conversions)
+            result = self._convert_value(value, from_unit, to_unit)
             
             # Formatage du résultat sans notation scientifique
             if result >= 1000000:
@@ -134,7 +105,6 @@ class UnitesRadDialog(QDialog):
             self.ded_unit_origin_combo,
             self.ded_unit_target_combo,
             self.ded_conversion_result_label,
-            self.DOSE_CONVERSIONS,
             "Conversion Debit de Dose"
         )
 
@@ -145,7 +115,6 @@ class UnitesRadDialog(QDialog):
             self.activity_unit_origin_combo,
             self.activity_unit_target_combo,
             self.activity_conversion_result_label,
-            self.ACTIVITY_CONVERSIONS,
             "Conversion Activite"
         )
 
@@ -2,13 +2,36 @@
 Utilitaires pour l'application EasyCMIR
 """
 
-from .database import load_isotopes, save_to_history
-from .widgets import ClearingDoubleSpinBox, ClearingSpinBox, ClearingLineEdit
+from importlib import import_module
+from .isotope_catalog import IsotopeCatalog, isotope_catalog
+from .attenuation import AttenuationLibrary, attenuation_library
+from .buildup import BuildupLibrary, buildup_library
 
 __all__ = [
     'load_isotopes',
     'save_to_history',
     'ClearingDoubleSpinBox',
     'ClearingSpinBox',
-    'ClearingLineEdit'
-]
\ No newline at end of file
+    'ClearingLineEdit',
+    'IsotopeCatalog',
+    'isotope_catalog',
+    'AttenuationLibrary',
+    'attenuation_library',
+    'BuildupLibrary',
+    'buildup_library'
+]
+
+# Modules dépendant de Qt (widgets, QMessageBox), chargés à la demande
+_QT_ATTRIBUTES = {
+    'load_isotopes': '.database',
+    'save_to_history': '.database',
+    'ClearingDoubleSpinBox': '.widgets',
+    'ClearingSpinBox': '.widgets',
+    'ClearingLineEdit': '.widgets',
+}
+
+
+def __getattr__(name):
+    if name in _QT_ATTRIBUTES:
+        return getattr(import_module(_QT_ATTRIBUTES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
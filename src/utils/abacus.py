@@ -0,0 +1,266 @@
+"""
+Abaques pré-calculés pour EasyCMIR
+Balaye des grilles cartésiennes complètes (activité × épaisseur d'écran ×
+distance → débit de dose, activité × épaisseur → périmètre public) pour un ou
+plusieurs isotopes et les écrit en CSV (un fichier par isotope) ou en PDF
+imprimable. Les formules sont celles du noyau de calcul : DED 1 m générique,
+transmission multi-raies en faisceau large et loi de l'inverse du carré.
+
+Le débit est séparable : DED 1m(A) × T(x) / d². Chaque isotope ne demande
+donc qu'une transmission par épaisseur, le reste est un produit extérieur
+évalué par blocs d'activités. Les isotopes sont répartis sur un pool de
+processus, chacun écrivant ses propres fichiers.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+import numpy as np
+from ..core import ded, distance, perimeter
+from ..core.shielding import line_weights, transmission
+from .isotope_catalog import isotope_catalog
+from .attenuation import attenuation_library
+from .buildup import buildup_library
+from .formatting import activity_unit
+
+# Nombre maximal de valeurs (activités × épaisseurs × distances) d'un bloc
+BLOCK_VALUES = 1_000_000
+# Mise en page PDF : colonnes de distances et lignes d'activités par page
+PDF_COLUMNS = 12
+PDF_ROWS = 30
+
+
+@dataclass
+class AbacusGrid:
+    """Axes de l'abaque : activités (Bq), distances (m) et épaisseurs d'écran (cm)"""
+    activities: np.ndarray
+    distances: np.ndarray
+    thicknesses: np.ndarray = field(default_factory=lambda: np.zeros(1))
+    material: Optional[str] = None          # Clé du matériau d'écran (None : sans écran)
+    limit: float = perimeter.PUBLIC_LIMIT_USVH   # Débit du périmètre (µSv/h)
+
+    def __post_init__(self):
+        self.activities = np.asarray(self.activities, dtype=float).ravel()
+        self.distances = np.asarray(self.distances, dtype=float).ravel()
+        self.thicknesses = np.asarray(self.thicknesses, dtype=float).ravel()
+        if self.material is None:
+            self.thicknesses = np.zeros(1)
+        for name, axis in (("activités", self.activities), ("distances", self.distances),
+                           ("épaisseurs", self.thicknesses)):
+            if axis.size == 0 or not np.all(np.isfinite(axis)):
+                raise ValueError(f"Grille des {name} vide ou invalide")
+        if np.any(self.activities < 0) or np.any(self.thicknesses < 0):
+            raise ValueError("Les activités et épaisseurs ne peuvent pas être négatives")
+        if np.any(self.distances <= 0) or not self.limit > 0:
+            raise ValueError("Les distances et la limite doivent être strictement positives")
+
+    @property
+    def shape(self):
+        """(activités, épaisseurs, distances)"""
+        return self.activities.size, self.thicknesses.size, self.distances.size
+
+
+@dataclass
+class AbacusSummary:
+    """Bilan d'un calcul d'abaques"""
+    isotopes: int = 0
+    values: int = 0                                         # Débits calculés
+    files: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)        # Isotopes sans émission gamma
+
+
+def parse_axis(text, log=False) -> np.ndarray:
+    """Axe saisi en liste (« 1, 2, 5 ») ou en plage « min:max:nombre ».
+
+    Les plages sont réparties linéairement, ou géométriquement avec ``log``.
+    Lève ValueError si le texte est invalide.
+    """
+    text = text.strip()
+    if ":" in text:
+        parts = [p.strip() for p in text.split(":")]
+        if len(parts) != 3:
+            raise ValueError(f"Plage invalide : {text} (attendu min:max:nombre)")
+        start, stop, count = float(parts[0]), float(parts[1]), int(parts[2])
+        if count < 1:
+            raise ValueError(f"Nombre de valeurs invalide : {text}")
+        if log:
+            if start <= 0 or stop <= 0:
+                raise ValueError(f"Une plage logarithmique doit être strictement positive : {text}")
+            return np.geomspace(start, stop, count)
+        return np.linspace(start, stop, count)
+    values = [float(p) for p in re.split(r"[;,\s]+", text) if p]
+    if not values:
+        raise ValueError("Axe vide")
+    return np.array(values)
+
+
+def shield_factors(energies, intensities, thicknesses, material=None) -> np.ndarray:
+    """Transmission en faisceau large pour chaque épaisseur (1 sans matériau)"""
+    thicknesses = np.asarray(thicknesses, dtype=float)
+    if material is None:
+        return np.ones(thicknesses.shape)
+    if material not in attenuation_library:
+        raise ValueError(f"Matériau inconnu : {material}")
+    shield_energies = buildup_library.shielding_energies(material, energies)
+    return transmission(thicknesses, attenuation_library.mu(material, shield_energies),
+                        line_weights(energies, intensities), buildup_library.table(material, shield_energies))
+
+
+def dose_rate_blocks(energies, intensities, factors, grid: AbacusGrid):
+    """Blocs (tranche d'activités, débits µSv/h, périmètres m) de l'abaque d'un isotope.
+
+    Débits de forme (activités du bloc, épaisseurs, distances), périmètres de
+    forme (activités du bloc, épaisseurs). ``factors`` vient de ``shield_factors``.
+    """
+    _, n_thicknesses, n_distances = grid.shape
+    step = max(1, BLOCK_VALUES // (n_thicknesses * n_distances))
+    for start in range(0, grid.activities.size, step):
+        rows = slice(start, start + step)
+        # DED 1 m en µSv/h derrière chaque écran : (activités, épaisseurs)
+        shielded = ded.ded1m(grid.activities[rows], energies, intensities)[:, None] * 1e3 * factors
+        dose_rates = distance.dose_rate_at(shielded[..., None], 1.0, grid.distances)
+        yield rows, dose_rates, perimeter.public_perimeter(shielded, grid.limit)
+
+
+def abacus_filename(isotope_name, extension) -> str:
+    """Nom de fichier de l'abaque d'un isotope (caractères spéciaux remplacés)"""
+    safe_name = re.sub(r"[^\w.-]+", "_", isotope_name)
+    return f"abaque_{safe_name}.{extension}"
+
+
+def write_csv(path, isotope_name, energies, intensities, factors, grid: AbacusGrid) -> int:
+    """Abaque CSV « ; » : une ligne par (activité, épaisseur), une colonne par distance.
+
+    Retourne le nombre de débits écrits.
+    """
+    thickness_column = f"epaisseur_{grid.material}_cm" if grid.material else "epaisseur_cm"
+    columns = ["activite_bq", thickness_column, "perimetre_m"] + [f"debit_usvh_{d:g}m" for d in grid.distances]
+    row_format = ";".join(["%.4g"] * len(columns)) + "\n"
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(";".join(columns) + "\n")
+        for rows, dose_rates, radii in dose_rate_blocks(energies, intensities, factors, grid):
+            n_activities, n_thicknesses, n_distances = dose_rates.shape
+            table = np.empty((n_activities, n_thicknesses, n_distances + 3))
+            table[..., 0] = grid.activities[rows, None]
+            table[..., 1] = grid.thicknesses
+            table[..., 2] = radii
+            table[..., 3:] = dose_rates
+            f.writelines(row_format % values for values in map(tuple, table.reshape(-1, n_distances + 3).tolist()))
+            count += dose_rates.size
+    return count
+
+
+def write_pdf(path, isotope_name, energies, intensities, factors, grid: AbacusGrid) -> int:
+    """Abaque PDF imprimable : périmètres puis, par épaisseur, débits activité × distance.
+
+    Les tableaux sont découpés en pages de ``PDF_ROWS`` activités sur
+    ``PDF_COLUMNS`` distances ; une grille réduite reste préférable à l'impression.
+    """
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.units import cm
+
+    blocks = list(dose_rate_blocks(energies, intensities, factors, grid))
+    dose_rates = np.concatenate([block for _, block, _ in blocks])
+    radii = np.concatenate([block for _, _, block in blocks])
+    factor, unit = activity_unit(grid.activities)
+    activity_labels = [f"{a * factor:.3g} {unit}" for a in grid.activities]
+    material = grid.material or "aucun"
+
+    c = canvas.Canvas(path, pagesize=landscape(A4))
+    width, height = landscape(A4)
+
+    def draw_table(title, column_titles, values):
+        """Tableau (activités × colonnes) découpé en pages"""
+        for first_column in range(0, len(column_titles), PDF_COLUMNS):
+            columns = slice(first_column, first_column + PDF_COLUMNS)
+            for first_row in range(0, len(activity_labels), PDF_ROWS):
+                c.setFont("Helvetica-Bold", 13)
+                c.drawString(2 * cm, height - 1.5 * cm, f"Abaque {isotope_name}")
+                c.setFont("Helvetica", 10)
+                c.drawString(2 * cm, height - 2.2 * cm, title)
+                y = height - 3.2 * cm
+                c.setFont("Helvetica-Bold", 8)
+                c.drawString(2 * cm, y, "Activité")
+                for i, column_title in enumerate(column_titles[columns]):
+                    c.drawRightString(6 * cm + i * 1.9 * cm, y, column_title)
+                c.setFont("Helvetica", 8)
+                for row in range(first_row, min(first_row + PDF_ROWS, len(activity_labels))):
+                    y -= 0.5 * cm
+                    c.drawString(2 * cm, y, activity_labels[row])
+                    for i, value in enumerate(values[row, columns]):
+                        c.drawRightString(6 * cm + i * 1.9 * cm, y, f"{value:.3g}")
+                c.showPage()
+
+    draw_table(f"Périmètre (m) à {grid.limit:g} µSv/h - écran {material}",
+               [f"{x:g} cm" for x in grid.thicknesses], radii)
+    for index, thickness in enumerate(grid.thicknesses):
+        screen = f"écran {material} {thickness:g} cm" if grid.material else "sans écran"
+        draw_table(f"Débit de dose (µSv/h) selon la distance - {screen}",
+                   [f"{d:g} m" for d in grid.distances], dose_rates[:, index, :])
+    c.save()
+    return dose_rates.size
+
+
+WRITERS = {"csv": write_csv, "pdf": write_pdf}
+
+
+def _abacus_task(task):
+    """Écrit les abaques d'un isotope ; retourne (fichiers, nombre de débits)"""
+    name, energies, intensities, factors, grid, directory, formats = task
+    files, count = [], 0
+    for extension in formats:
+        path = os.path.join(directory, abacus_filename(name, extension))
+        count = WRITERS[extension](path, name, energies, intensities, factors, grid)
+        files.append(path)
+    return files, count
+
+
+def run_abacus(grid: AbacusGrid, directory, isotopes=None, formats=("csv",), workers=1) -> AbacusSummary:
+    """Calcule et écrit les abaques de ``isotopes`` (noms, par défaut tout le catalogue).
+
+    Les fichiers sont créés dans ``directory`` ; les isotopes sont répartis
+    sur ``workers`` processus (None : tous les cœurs). Lève ValueError pour un
+    isotope, un matériau ou un format inconnu, RuntimeError si reportlab
+    manque pour le format PDF.
+    """
+    unknown = [extension for extension in formats if extension not in WRITERS]
+    if unknown:
+        raise ValueError(f"Format inconnu : {', '.join(unknown)}")
+    if "pdf" in formats:
+        # Vérifié avant d'écrire le moindre fichier : pas de CSV orphelins
+        try:
+            import reportlab
+        except ImportError:
+            raise RuntimeError("Le module reportlab est requis pour les abaques PDF (pip install reportlab)")
+    names = list(isotopes) if isotopes else isotope_catalog.names()
+    summary = AbacusSummary()
+    tasks = []
+    for name in names:
+        isotope = isotope_catalog.get(name)
+        if isotope is None:
+            raise ValueError(f"Isotope inconnu : {name}")
+        if not isotope.gamma_lines:
+            summary.skipped.append(name)
+            continue
+        energies, intensities = np.array(isotope.energies), np.array(isotope.intensities)
+        # Transmissions calculées ici : les processus n'ont pas à relire les bibliothèques
+        factors = shield_factors(energies, intensities, grid.thicknesses, grid.material)
+        tasks.append((name, energies, intensities, factors, grid, directory, tuple(formats)))
+
+    os.makedirs(directory, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_abacus_task, tasks))
+    else:
+        results = [_abacus_task(task) for task in tasks]
+
+    for files, count in results:
+        summary.isotopes += 1
+        summary.values += count
+        summary.files.extend(files)
+    return summary
@@ -0,0 +1,149 @@
+"""
+Bibliothèque des coefficients d'atténuation pour EasyCMIR
+Charge les coefficients massiques μ/ρ des matériaux d'écran depuis
+data/attenuation.txt et les interpole en log-log sur des tableaux d'énergies.
+Les coefficients interpolés sont mis en cache par (matériau, grille d'énergies).
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .config_manager import config_manager
+
+
+@dataclass(frozen=True)
+class Material:
+    """Matériau d'écran : masse volumique et table μ/ρ en fonction de l'énergie"""
+    key: str                    # Clé utilisée dans les calculs (ex: "plomb")
+    label: str                  # Libellé affiché (ex: "Plomb")
+    density: float              # Masse volumique (g/cm³)
+    energies: np.ndarray        # Énergies (MeV), croissantes
+    mass_attenuation: np.ndarray  # μ/ρ (cm²/g)
+
+    @property
+    def energy_range(self) -> Tuple[float, float]:
+        """Domaine d'énergie couvert par la table (MeV)"""
+        return float(self.energies[0]), float(self.energies[-1])
+
+
+def parse_attenuation_file(path) -> Dict[str, Material]:
+    """Analyse le fichier des coefficients d'atténuation.
+
+    Une ligne « materiau;clé;libellé;masse volumique » ouvre un matériau, les
+    lignes suivantes « énergie;μ/ρ » forment sa table. Lève ValueError si une
+    ligne est malformée ou si les énergies ne sont pas croissantes.
+    """
+    tables = {}
+    current = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith('//') or line.startswith('#'):
+                continue
+            parts = [p.strip() for p in line.split(';')]
+            try:
+                if parts[0] == 'materiau':
+                    key, label, density = parts[1], parts[2], float(parts[3])
+                    current = tables[key] = (label, density, [])
+                elif current is None:
+                    raise ValueError("données avant la première ligne materiau")
+                else:
+                    current[2].append((float(parts[0]), float(parts[1])))
+            except (IndexError, ValueError) as e:
+                raise ValueError(f"Ligne {line_number} invalide dans {path} ({e}): {line}")
+
+    materials = {}
+    for key, (label, density, points) in tables.items():
+        energies = np.array([p[0] for p in points], dtype=float)
+        values = np.array([p[1] for p in points], dtype=float)
+        if len(energies) < 2 or np.any(np.diff(energies) <= 0) or np.any(values <= 0):
+            raise ValueError(f"Table d'atténuation invalide pour {key}")
+        for array in (energies, values):
+            array.flags.writeable = False
+        materials[key] = Material(key, label, density, energies, values)
+    return materials
+
+
+class AttenuationLibrary:
+    """Coefficients d'atténuation des matériaux d'écran avec cache d'interpolation"""
+
+    # Nombre de grilles d'énergies gardées en cache avant purge
+    max_cache_entries = 256
+
+    def __init__(self, path: Optional[str] = None):
+        self._fixed_path = path
+        self._lock = threading.RLock()
+        self._materials: Optional[Dict[str, Material]] = None
+        self._loaded_path = None
+        # Coefficients interpolés : (clé, grille d'énergies) -> μ (cm⁻¹)
+        self._cache: Dict[tuple, np.ndarray] = {}
+
+    @property
+    def path(self) -> str:
+        """Chemin du fichier des coefficients utilisé"""
+        return self._fixed_path or config_manager.get_attenuation_path()
+
+    def _get_materials(self) -> Dict[str, Material]:
+        """Charge le fichier au premier accès ou après un changement de chemin"""
+        path = self.path
+        if self._materials is None or path != self._loaded_path:
+            with self._lock:
+                self._materials = parse_attenuation_file(path)
+                self._loaded_path = path
+                self._cache.clear()
+        return self._materials
+
+    def reload(self):
+        """Force la relecture du fichier"""
+        with self._lock:
+            self._materials = None
+        self._get_materials()
+
+    def __contains__(self, key) -> bool:
+        return key in self._get_materials()
+
+    def keys(self) -> List[str]:
+        """Clés des matériaux dans l'ordre du fichier"""
+        return list(self._get_materials().keys())
+
+    def materials(self) -> List[Material]:
+        """Matériaux dans l'ordre du fichier"""
+        return list(self._get_materials().values())
+
+    def get(self, key: str) -> Optional[Material]:
+        """Retourne un matériau par sa clé, ou None"""
+        return self._get_materials().get(key)
+
+    def mass_attenuation(self, key: str, energies) -> np.ndarray:
+        """μ/ρ (cm²/g) d'un matériau pour un tableau d'énergies (MeV).
+
+        Interpolation linéaire entre les logarithmes ; hors du domaine de la
+        table, la valeur de la borne la plus proche est retenue.
+        """
+        return self.mu(key, energies) / self._get_materials()[key].density
+
+    def mu(self, key: str, energies) -> np.ndarray:
+        """Coefficient d'atténuation linéique μ (cm⁻¹) pour un tableau d'énergies (MeV).
+
+        Le résultat a la forme de ``energies`` ; il est mis en cache par
+        (matériau, grille d'énergies) et renvoyé en lecture seule.
+        """
+        material = self._get_materials()[key]
+        energies = np.asarray(energies, dtype=float)
+        cache_key = (key, energies.shape, energies.tobytes())
+        mu = self._cache.get(cache_key)
+        if mu is None:
+            log_energies = np.log(np.clip(energies, *material.energy_range))
+            mu = np.array(material.density * np.exp(np.interp(
+                log_energies, np.log(material.energies), np.log(material.mass_attenuation)
+            )))
+            mu.flags.writeable = False
+            if len(self._cache) >= self.max_cache_entries:
+                self._cache.clear()
+            self._cache[cache_key] = mu
+        return mu
+
+
+# Instance globale de la bibliothèque des coefficients d'atténuation
+attenuation_library = AttenuationLibrary()
@@ -0,0 +1,418 @@
+"""
+Calcul par lot pour EasyCMIR
+Lit des enregistrements CSV ou JSONL ligne à ligne (décroissance, DED 1 m,
+distance, périmètre public, écran, TMR), les calcule par blocs avec le noyau
+de calcul et écrit les résultats au fil de l'eau. La mémoire reste bornée
+quelle que soit la taille du fichier : seuls quelques blocs sont en cours à
+un instant donné, y compris avec un pool de processus.
+"""
+
+import csv
+import json
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Dict
+import numpy as np
+from ..core import decay, ded, distance, perimeter, tmr
+from ..core.shielding import line_weights, transmission
+from ..core.units import unit_registry
+from .isotope_catalog import isotope_catalog
+from .attenuation import attenuation_library
+from .buildup import buildup_library
+
+DEFAULT_CHUNK_SIZE = 5_000
+# Colonne du type de calcul et colonne des erreurs dans la sortie
+TYPE_FIELD = "calcul"
+ERROR_FIELD = "erreur"
+# Erreur de lecture (ligne JSON invalide), non recopiée dans la sortie
+_READ_ERROR = "_erreur_lecture"
+
+# Colonnes de résultat ajoutées par type de calcul
+RESULT_FIELDS = {
+    "decroissance": ("activite_bq",),
+    "ded1m": ("ded1m_msvh", "constante_gamma"),
+    "distance": ("debit_usvh",),
+    "perimetre": ("perimetre_m",),
+    "ecran": ("debit_initial_msvh", "transmission", "debit_ecran_msvh"),
+    "tmr": ("categorie", "IT"),
+}
+# Noms de calcul acceptés en plus des noms français
+CALCULATION_ALIASES = {
+    "decay": "decroissance", "décroissance": "decroissance", "ded": "ded1m",
+    "perimeter": "perimetre", "périmètre": "perimetre", "shielding": "ecran", "écran": "ecran",
+}
+# « .json » : tableau d'objets ou JSON Lines, voir ``read_jsonl``
+JSONL_EXTENSIONS = (".jsonl", ".ndjson", ".json")
+
+
+def _number(record, key, unit=None, default=None):
+    """Valeur numérique finie d'un champ ; une unité peut accompagner le texte (« 3 GBq »)"""
+    value = record.get(key)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if default is None:
+            raise ValueError(f"Champ manquant : {key}")
+        return default
+    if isinstance(value, (int, float)):
+        try:
+            number = float(value)
+        except OverflowError:
+            raise ValueError(f"Valeur hors limites : {key}")
+    else:
+        text = str(value)
+        try:
+            number = float(text.replace(',', '.'))
+        except ValueError:
+            if unit is None:
+                raise
+            number = unit_registry.parse_to(text, unit)
+    if not math.isfinite(number):
+        raise ValueError(f"Valeur non finie : {key}")
+    return number
+
+
+def _positive(value, key):
+    if not value > 0:
+        raise ValueError(f"{key} doit être strictement positif")
+    return value
+
+
+def _non_negative(value, key):
+    if not value >= 0:
+        raise ValueError(f"{key} ne peut pas être négatif")
+    return value
+
+
+def _isotope(record):
+    name = record.get("isotope")
+    isotope = isotope_catalog.get(str(name).strip()) if name else None
+    if isotope is None:
+        raise ValueError(f"Isotope inconnu : {name}")
+    return isotope
+
+
+def _gamma_lines(record):
+    """(E1, E2, E3, Q1, Q2, Q3) de l'isotope nommé ou des champs e1..e3 (MeV), q1..q3 (%)"""
+    if record.get("isotope"):
+        isotope = _isotope(record)
+        return (*isotope.energies, *isotope.intensities)
+    energies = [_number(record, "e1")] + [_number(record, f"e{i}", default=0.0) for i in (2, 3)]
+    intensities = [_number(record, "q1")] + [_number(record, f"q{i}", default=0.0) for i in (2, 3)]
+    return (*energies, *intensities)
+
+
+def _parse_all(records, parse, width):
+    """Applique ``parse`` (``width`` valeurs par enregistrement) à chaque enregistrement.
+
+    Retourne (résultats avec les erreurs déjà renseignées, indices valides,
+    tableau (valides, width) des valeurs lues).
+    """
+    results = [None] * len(records)
+    valid, rows = [], []
+    for index, record in enumerate(records):
+        try:
+            rows.append(parse(record))
+            valid.append(index)
+        except (ValueError, TypeError, OverflowError) as e:
+            results[index] = {ERROR_FIELD: str(e)}
+    return results, valid, np.array(rows, dtype=float).reshape(len(valid), width)
+
+
+def _decay(records):
+    def parse(record):
+        activity = _non_negative(_number(record, "activite", "Bq"), "activite")
+        if record.get("periode") not in (None, ""):
+            half_life = _non_negative(_number(record, "periode", "s"), "periode")
+        else:
+            half_life = _isotope(record).half_life
+        return activity, half_life, _non_negative(_number(record, "duree", "s"), "duree")
+
+    results, valid, values = _parse_all(records, parse, 3)
+    activities = decay.activity_at(values[:, 0], values[:, 1], values[:, 2])
+    for index, activity in zip(valid, activities):
+        results[index] = {"activite_bq": float(activity)}
+    return results
+
+
+def _ded1m(records):
+    def parse(record):
+        return (_non_negative(_number(record, "activite", "Bq"), "activite"), *_gamma_lines(record))
+
+    results, valid, values = _parse_all(records, parse, 7)
+    energies, intensities = values[:, 1:4], values[:, 4:7]
+    dose_rates = ded.ded1m(values[:, 0], energies, intensities)
+    gammas = ded.gamma_constant(energies, intensities)
+    for index, dose_rate, gamma in zip(valid, dose_rates, gammas):
+        results[index] = {"ded1m_msvh": float(dose_rate), "constante_gamma": float(gamma)}
+    return results
+
+
+def _distance(records):
+    def parse(record):
+        return (_non_negative(_number(record, "debit", "µSv/h"), "debit"),
+                _positive(_number(record, "distance", "m"), "distance"),
+                _positive(_number(record, "nouvelle_distance", "m"), "nouvelle_distance"))
+
+    results, valid, values = _parse_all(records, parse, 3)
+    dose_rates = distance.dose_rate_at(values[:, 0], values[:, 1], values[:, 2])
+    for index, dose_rate in zip(valid, dose_rates):
+        results[index] = {"debit_usvh": float(dose_rate)}
+    return results
+
+
+def _perimeter(records):
+    def parse(record):
+        return (_non_negative(_number(record, "ded1m", "µSv/h"), "ded1m"),
+                _positive(_number(record, "limite", "µSv/h", perimeter.PUBLIC_LIMIT_USVH), "limite"))
+
+    results, valid, values = _parse_all(records, parse, 2)
+    radii = perimeter.public_perimeter(values[:, 0], values[:, 1])
+    for index, radius in zip(valid, radii):
+        results[index] = {"perimetre_m": float(radius)}
+    return results
+
+
+def _shielding(records):
+    def parse(record):
+        material = str(record.get("materiau") or "").strip()
+        if material not in attenuation_library:
+            raise ValueError(f"Matériau inconnu : {material}")
+        return (_non_negative(_number(record, "activite", "Bq"), "activite"),
+                _non_negative(_number(record, "epaisseur", "cm"), "epaisseur"), *_gamma_lines(record))
+
+    results, valid, values = _parse_all(records, parse, 8)
+    # Un appel à la bibliothèque par couple (matériau, raies), toutes épaisseurs confondues
+    groups = {}
+    for row, index in enumerate(valid):
+        material = str(records[index]["materiau"]).strip()
+        groups.setdefault((material, tuple(values[row, 2:])), []).append(row)
+    for (material, lines), rows in groups.items():
+        energies, intensities = np.array(lines[:3]), np.array(lines[3:])
+        shield_energies = buildup_library.shielding_energies(material, energies)
+        mu = attenuation_library.mu(material, shield_energies)
+        buildup = buildup_library.table(material, shield_energies)
+        factors = transmission(values[rows, 1], mu, line_weights(energies, intensities), buildup)
+        initial = ded.ded1m(values[rows, 0], energies, intensities)
+        for row, dose_rate, factor in zip(rows, initial, factors):
+            results[valid[row]] = {"debit_initial_msvh": float(dose_rate), "transmission": float(factor),
+                                   "debit_ecran_msvh": float(dose_rate * factor)}
+    return results
+
+
+def _tmr(records):
+    def parse(record):
+        return (_non_negative(_number(record, "contact", "µSv/h"), "contact"),
+                _non_negative(_number(record, "ded_1m", "µSv/h"), "ded_1m"))
+
+    results, valid, values = _parse_all(records, parse, 2)
+    codes = tmr.classify(values[:, 0], values[:, 1])
+    indices = tmr.transport_index(values[:, 1])
+    for index, code, transport_index in zip(valid, codes, indices):
+        results[index] = {"categorie": tmr.CATEGORIES[code], "IT": float(transport_index)}
+    return results
+
+
+CALCULATIONS = {
+    "decroissance": _decay,
+    "ded1m": _ded1m,
+    "distance": _distance,
+    "perimetre": _perimeter,
+    "ecran": _shielding,
+    "tmr": _tmr,
+}
+
+
+def _checked(result):
+    """Résultat dont les valeurs non finies (dépassement de capacité) deviennent une erreur"""
+    overflow = [key for key, value in result.items() if isinstance(value, float) and not math.isfinite(value)]
+    if not overflow:
+        return result
+    return {**result, **dict.fromkeys(overflow), ERROR_FIELD: f"Résultat hors limites : {', '.join(overflow)}"}
+
+
+def calculation_name(record, default=None) -> str:
+    """Type de calcul d'un enregistrement (colonne « calcul » ou ``default``)"""
+    name = str(record.get(TYPE_FIELD) or default or "").strip().lower()
+    return CALCULATION_ALIASES.get(name, name)
+
+
+def process_chunk(records, calculation=None):
+    """Calcule un bloc d'enregistrements ; retourne un dictionnaire de résultats par enregistrement.
+
+    Les enregistrements sont regroupés par type de calcul et chaque groupe est
+    évalué en une opération NumPy. Une erreur ne concerne que son enregistrement.
+    """
+    results = [None] * len(records)
+    groups = {}
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            results[index] = {ERROR_FIELD: "Un objet JSON est attendu"}
+            continue
+        name = calculation_name(record, calculation)
+        if _READ_ERROR in record:
+            results[index] = {ERROR_FIELD: record[_READ_ERROR]}
+        elif name not in CALCULATIONS:
+            results[index] = {ERROR_FIELD: f"Type de calcul inconnu : {name or '(vide)'}"}
+        else:
+            groups.setdefault(name, []).append(index)
+    for name, indices in groups.items():
+        for index, result in zip(indices, CALCULATIONS[name]([records[i] for i in indices])):
+            results[index] = _checked(result)
+    return results
+
+
+def _process_chunk_task(task):
+    return process_chunk(*task)
+
+
+def format_of(path) -> str:
+    """« jsonl » ou « csv » selon l'extension du fichier"""
+    return "jsonl" if str(path).lower().endswith(JSONL_EXTENSIONS) else "csv"
+
+
+def read_csv(source):
+    """En-tête et générateur des lignes (dictionnaires) d'un CSV « ; », « , » ou tabulation"""
+    sample = source.read(4096)
+    if source.seekable():
+        source.seek(0)
+        remainder = source
+    else:
+        # Entrée standard : l'échantillon lu est réinjecté devant le flux
+        remainder = _chain_text(sample, source)
+    try:
+        delimiter = csv.Sniffer().sniff(sample, delimiters=";,\t").delimiter
+    except csv.Error:
+        delimiter = ';'
+    reader = csv.DictReader(remainder, delimiter=delimiter)
+    header = reader.fieldnames or []
+    rows = (row for row in reader if any(isinstance(value, str) and value.strip() for value in row.values()))
+    return header, delimiter, rows
+
+
+def _chain_text(sample, source):
+    lines = sample.splitlines(keepends=True)
+    if lines and not lines[-1].endswith(("\n", "\r")):
+        lines[-1] += source.readline()
+    yield from lines
+    yield from source
+
+
+def _finite_or_text(text):
+    """Nombre JSON ; hors limites (1e400), il reste en texte et se recopie tel quel en sortie"""
+    value = float(text)
+    return value if math.isfinite(value) else text
+
+
+def _loads(text):
+    # NaN, Infinity et nombres hors limites restent du texte : la sortie reste du JSON strict
+    return json.loads(text, parse_float=_finite_or_text, parse_constant=str)
+
+
+def read_jsonl(source):
+    """Générateur des enregistrements d'un fichier JSON Lines (un objet par ligne).
+
+    Un fichier commençant par « [ » est lu comme un tableau JSON d'objets.
+    """
+    first, skipped = source.read(1), 0
+    while first.isspace():
+        skipped += first == "\n"
+        first = source.read(1)
+    if first == "[":
+        try:
+            records = _loads(first + source.read())
+        except (ValueError, RecursionError) as e:
+            yield {_READ_ERROR: f"JSON invalide : {e}"}
+            return
+        for number, record in enumerate(records, start=1):
+            if not isinstance(record, dict):
+                record = {_READ_ERROR: f"Élément {number} : un objet JSON est attendu"}
+            yield record
+        return
+
+    for number, line in enumerate(_chain_text(first, source), start=skipped + 1):
+        if not line.strip():
+            continue
+        try:
+            record = _loads(line)
+        except (ValueError, RecursionError) as e:
+            record = {_READ_ERROR: f"JSON invalide ligne {number} : {e}"}
+        if not isinstance(record, dict):
+            record = {_READ_ERROR: f"Ligne {number} : un objet JSON est attendu"}
+        yield record
+
+
+def _format_value(value):
+    return f"{value:.6g}" if isinstance(value, float) else value
+
+
+@dataclass
+class BatchSummary:
+    """Bilan d'un calcul par lot"""
+    records: int = 0
+    errors: int = 0
+    counts: Dict[str, int] = field(default_factory=dict)   # Enregistrements calculés par type
+
+
+def _results(chunks, calculation, workers):
+    """(bloc, résultats) dans l'ordre d'entrée, au plus 2 blocs par processus en cours"""
+    if workers <= 1:
+        for chunk in chunks:
+            yield chunk, process_chunk(chunk, calculation)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(_process_chunk_task, (chunk, calculation))))
+            if len(pending) >= 2 * workers:
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+
+
+def run_batch(source, target, input_format="csv", calculation=None,
+              chunk_size=DEFAULT_CHUNK_SIZE, workers=1) -> BatchSummary:
+    """Calcule tous les enregistrements de ``source`` et écrit les résultats dans ``target``.
+
+    ``source`` et ``target`` sont des flux texte ; la sortie reprend le format
+    d'entrée, chaque ligne complétée de ses résultats (ou de la colonne
+    « erreur »). ``calculation`` s'applique aux
+    enregistrements sans colonne « calcul ». Les blocs de ``chunk_size``
+    enregistrements sont répartis sur ``workers`` processus (None : tous les
+    cœurs) ; l'ordre des lignes est conservé.
+    """
+    workers = workers or os.cpu_count() or 1
+    if input_format == "jsonl":
+        header, delimiter, records = [], ';', read_jsonl(source)
+    else:
+        header, delimiter, records = read_csv(source)
+
+    default = CALCULATION_ALIASES.get(calculation, calculation)
+    if input_format == "csv":
+        names = [default] if default in RESULT_FIELDS and TYPE_FIELD not in header else RESULT_FIELDS
+        added = [name for calc in names for name in RESULT_FIELDS[calc]]
+        fieldnames = list(header) + [name for name in dict.fromkeys(added + [ERROR_FIELD]) if name not in header]
+        writer = csv.DictWriter(target, fieldnames=fieldnames, delimiter=delimiter,
+                                restval="", extrasaction='ignore', lineterminator="\n")
+        writer.writeheader()
+
+    summary = BatchSummary()
+    chunks = iter(lambda: list(islice(records, chunk_size)), [])
+    for chunk, results in _results(chunks, default, workers):
+        for record, result in zip(chunk, results):
+            summary.records += 1
+            if ERROR_FIELD in result:
+                summary.errors += 1
+            else:
+                name = calculation_name(record, default)
+                summary.counts[name] = summary.counts.get(name, 0) + 1
+            if input_format == "csv":
+                writer.writerow({**record, **{key: _format_value(value) for key, value in result.items()}})
+            else:
+                record.pop(_READ_ERROR, None)
+                target.write(json.dumps({**record, **result}, ensure_ascii=False, allow_nan=False) + "\n")
+    return summary
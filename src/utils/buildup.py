@@ -0,0 +1,173 @@
+"""
+Facteurs d'accumulation (build-up) pour EasyCMIR
+Charge les paramètres G-P (progression géométrique) par matériau depuis
+data/buildup.txt. Les coefficients sont préparés une seule fois par
+(matériau, grille d'énergies) puis évalués en bloc sur des tableaux
+d'épaisseurs × énergies.
+
+Sous la première énergie tabulée, le facteur d'accumulation des matériaux
+légers croît fortement : figer les paramètres G-P y sous-estimerait la dose.
+Pour les tables marquées « sous_table;majorant », les raies concernées sont
+traitées à l'énergie de la première ligne (μ et B), ce qui majore leur
+transmission (voir ``shielding_energies``).
+"""
+
+import threading
+from typing import Dict, List, Optional
+import numpy as np
+from .config_manager import config_manager
+from ..core.shielding import gp_buildup
+
+
+def parse_buildup_file(path) -> Dict[str, tuple]:
+    """Analyse le fichier des paramètres G-P.
+
+    Une ligne « materiau;clé[;clé...] » ouvre une table partagée par les
+    matériaux cités, les lignes suivantes « énergie;b;c;a;Xk;d » la remplissent.
+    Une ligne « sous_table;majorant » (ou « figee », par défaut) fixe le
+    traitement des énergies inférieures à la table.
+    Retourne {clé: (énergies (k,), paramètres (5, k), majorant sous la table)}.
+    """
+    tables = []
+    current = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith('//') or line.startswith('#'):
+                continue
+            parts = [p.strip() for p in line.split(';')]
+            try:
+                if parts[0] == 'materiau':
+                    current = [[p for p in parts[1:] if p], [], False]
+                    tables.append(current)
+                elif current is None:
+                    raise ValueError("données avant la première ligne materiau")
+                elif parts[0] == 'sous_table':
+                    if len(parts) != 2 or parts[1] not in ('majorant', 'figee'):
+                        raise ValueError("« sous_table;majorant » ou « sous_table;figee » attendu")
+                    current[2] = parts[1] == 'majorant'
+                else:
+                    if len(parts) != 6:
+                        raise ValueError(f"6 champs attendus, {len(parts)} trouvés")
+                    current[1].append([float(x) for x in parts])
+            except ValueError as e:
+                raise ValueError(f"Ligne {line_number} invalide dans {path} ({e}): {line}")
+
+    parameters = {}
+    for keys, rows, bound_below in tables:
+        rows = np.array(rows, dtype=float)
+        if len(rows) == 0 or np.any(np.diff(rows[:, 0]) <= 0):
+            raise ValueError(f"Table G-P invalide pour {', '.join(keys)}")
+        for key in keys:
+            parameters[key] = (rows[:, 0], rows[:, 1:].T, bound_below)
+    return parameters
+
+
+class BuildupTable:
+    """Coefficients G-P d'un matériau préparés pour une grille d'énergies.
+
+    Chaque énergie est encadrée par deux énergies tabulées ; le facteur
+    d'accumulation est interpolé linéairement en log B / log E entre elles.
+    """
+
+    def __init__(self, table_energies, parameters, energies):
+        energies = np.asarray(energies, dtype=float)
+        log_table = np.log(table_energies)
+        log_energies = np.log(np.clip(energies, table_energies[0], table_energies[-1]))
+
+        if len(table_energies) == 1:
+            upper = np.zeros(energies.shape, dtype=int)
+        else:
+            upper = np.clip(np.searchsorted(log_table, log_energies), 1, len(table_energies) - 1)
+        lower = np.maximum(upper - 1, 0)
+        span = log_table[upper] - log_table[lower]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.weight = np.where(span > 0, (log_energies - log_table[lower]) / span, 0.0)
+
+        # Paramètres (b, c, a, Xk, d) de part et d'autre de chaque énergie : (5, m)
+        self.lower = parameters[:, lower]
+        self.upper = parameters[:, upper]
+
+    def __call__(self, mfp):
+        """Facteurs d'accumulation pour des libres parcours moyens (..., m)"""
+        log_lower = np.log(gp_buildup(mfp, *self.lower))
+        log_upper = np.log(gp_buildup(mfp, *self.upper))
+        return np.exp(log_lower + self.weight * (log_upper - log_lower))
+
+
+class BuildupLibrary:
+    """Paramètres G-P des matériaux d'écran avec cache par grille d'énergies"""
+
+    # Nombre de grilles d'énergies gardées en cache avant purge
+    max_cache_entries = 256
+
+    def __init__(self, path: Optional[str] = None):
+        self._fixed_path = path
+        self._lock = threading.RLock()
+        self._parameters: Optional[Dict[str, tuple]] = None
+        self._loaded_path = None
+        self._cache: Dict[tuple, BuildupTable] = {}
+
+    @property
+    def path(self) -> str:
+        """Chemin du fichier des paramètres G-P utilisé"""
+        return self._fixed_path or config_manager.get_buildup_path()
+
+    def _get_parameters(self) -> Dict[str, tuple]:
+        """Charge le fichier au premier accès ou après un changement de chemin"""
+        path = self.path
+        if self._parameters is None or path != self._loaded_path:
+            with self._lock:
+                self._parameters = parse_buildup_file(path)
+                self._loaded_path = path
+                self._cache.clear()
+        return self._parameters
+
+    def reload(self):
+        """Force la relecture du fichier"""
+        with self._lock:
+            self._parameters = None
+        self._get_parameters()
+
+    def __contains__(self, key) -> bool:
+        return key in self._get_parameters()
+
+    def keys(self) -> List[str]:
+        """Clés des matériaux disposant de paramètres G-P"""
+        return list(self._get_parameters().keys())
+
+    def shielding_energies(self, key: str, energies) -> np.ndarray:
+        """Énergies (MeV) auxquelles évaluer μ et B en faisceau large.
+
+        Les énergies inférieures à la première énergie de la table G-P du
+        matériau sont relevées à celle-ci : à épaisseur égale, la transmission
+        d'une raie plus molle, accumulation comprise, est plus faible, donc ce
+        choix est conservatif. Les poids des raies restent calculés avec les
+        énergies réelles. Seules les tables « sous_table;majorant » sont
+        concernées : pour les matériaux lourds, où l'accumulation décroît sous
+        la table, figer les paramètres G-P majore déjà la dose.
+        """
+        energies = np.asarray(energies, dtype=float)
+        parameters = self._get_parameters().get(key)
+        if parameters is None or not parameters[2]:
+            return energies
+        return np.maximum(energies, parameters[0][0])
+
+    def table(self, key: str, energies) -> Optional[BuildupTable]:
+        """Table G-P d'un matériau pour une grille d'énergies (MeV), ou None"""
+        parameters = self._get_parameters().get(key)
+        if parameters is None:
+            return None
+        energies = np.asarray(energies, dtype=float)
+        cache_key = (key, energies.shape, energies.tobytes())
+        table = self._cache.get(cache_key)
+        if table is None:
+            table = BuildupTable(parameters[0], parameters[1], energies)
+            if len(self._cache) >= self.max_cache_entries:
+                self._cache.clear()
+            self._cache[cache_key] = table
+        return table
+
+
+# Instance globale de la bibliothèque des facteurs d'accumulation
+buildup_library = BuildupLibrary()
@@ -17,7 +17,11 @@ class ConfigManager:
                 "isotopes": os.path.join(self.config_dir, "isotopes.txt"),
                 "interventions": os.path.join(os.path.dirname(self.config_dir), "interventions"),
                 "rh_database": os.path.join(self.config_dir, "RH.db"),
-                "auth_database": os.path.join(self.config_dir, "users.db")
+                "auth_database": os.path.join(self.config_dir, "users.db"),
+                "sources": os.path.join(self.config_dir, "sources.json"),
+                "exemption_thresholds": os.path.join(self.config_dir, "seuils_exemption.txt"),
+                "attenuation": os.path.join(self.config_dir, "attenuation.txt"),
+                "buildup": os.path.join(self.config_dir, "buildup.txt")
             },
             "general": {
                 "language": "Français",
@@ -115,6 +119,22 @@ class ConfigManager:
         """Récupère le chemin de la base de données d'authentification"""
         return self.get_value("paths", "auth_database", self.default_config["paths"]["auth_database"])
 
+    def get_sources_path(self):
+        """Récupère le chemin du registre des sources scellées"""
+        return self.get_value("paths", "sources", self.default_config["paths"]["sources"])
+    
+    def get_exemption_thresholds_path(self):
+        """Récupère le chemin du fichier des seuils d'exemption"""
+        return self.get_value("paths", "exemption_thresholds", self.default_config["paths"]["exemption_thresholds"])
+    
+    def get_attenuation_path(self):
+        """Récupère le chemin du fichier des coefficients d'atténuation"""
+        return self.get_value("paths", "attenuation", self.default_config["paths"]["attenuation"])
+    
+    def get_buildup_path(self):
+        """Récupère le chemin du fichier des paramètres de facteur d'accumulation"""
+        return self.get_value("paths", "buildup", self.default_config["paths"]["buildup"])
+
     def set_database_path(self, path):
         """Définit le chemin de la base de données"""
         self.set_value("paths", "database", path)
@@ -139,6 +159,10 @@ class ConfigManager:
         """Définit le chemin de la base de données d'authentification"""
         self.set_value("paths", "auth_database", path)
 
+    def set_sources_path(self, path):
+        """Définit le chemin du registre des sources scellées"""
+        self.set_value("paths", "sources", path)
+
     def _merge_configs(self, default, loaded):
         """Fusionne la configuration chargée avec la configuration par défaut"""
         merged = default.copy()
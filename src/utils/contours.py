@@ -0,0 +1,173 @@
+"""
+Extraction d'isolignes de débit de dose pour EasyCMIR
+Marching squares vectorisé sur un champ maillé : polygones fermés de l'isoligne
+(périmètre public 2.5 µSv/h, zone réflexe 25 µSv/h...), surface de la zone et
+distance la plus éloignée.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+
+# Seuils usuels (µSv/h)
+PUBLIC_LIMIT = 2.5
+REFLEX_ZONE_LIMIT = 25.0
+
+# Segments par configuration de cellule (coins bas-gauche = 1, bas-droit = 2,
+# haut-droit = 4, haut-gauche = 8 au-dessus du seuil), orientés pour laisser
+# la zone au-dessus du seuil à droite. B, R, T, L : arêtes bas, droite, haut, gauche.
+# Les cas ambigus 5 et 10 (coins opposés) sont résolus par la valeur moyenne au
+# centre de la cellule : 16 et 17 correspondent à 5 et 10 avec centre au-dessus.
+SEGMENTS = {
+    1: (("L", "B"),),
+    2: (("B", "R"),),
+    3: (("L", "R"),),
+    4: (("R", "T"),),
+    5: (("L", "B"), ("R", "T")),
+    6: (("B", "T"),),
+    7: (("L", "T"),),
+    8: (("T", "L"),),
+    9: (("T", "B"),),
+    10: (("B", "R"), ("T", "L")),
+    11: (("T", "R"),),
+    12: (("R", "L"),),
+    13: (("R", "B"),),
+    14: (("B", "L"),),
+    16: (("R", "B"), ("L", "T")),
+    17: (("B", "L"), ("T", "R")),
+}
+
+EDGE_CODES = {"B": 0, "R": 1, "T": 2, "L": 3}
+# Extrémités (décalage ligne, décalage colonne) de chaque arête d'une cellule
+EDGE_ENDS = np.array([
+    [[0, 0], [0, 1]],   # B
+    [[0, 1], [1, 1]],   # R
+    [[1, 0], [1, 1]],   # T
+    [[0, 0], [1, 0]],   # L
+])
+
+# Tables (cas, segment) -> code d'arête de départ / d'arrivée (-1 : pas de segment)
+SEGMENT_STARTS = np.full((18, 2), -1)
+SEGMENT_ENDS = np.full((18, 2), -1)
+for _case, _segments in SEGMENTS.items():
+    for _slot, (_start, _end) in enumerate(_segments):
+        SEGMENT_STARTS[_case, _slot] = EDGE_CODES[_start]
+        SEGMENT_ENDS[_case, _slot] = EDGE_CODES[_end]
+
+
+@dataclass
+class IsoContour:
+    """Isoligne d'un niveau : polygones, surface et distance maximale"""
+    level: float
+    polygons: List[np.ndarray] = field(default_factory=list)  # Tableaux (k, 2) fermés
+    area: float = 0.0                   # Surface au-dessus du niveau (m²)
+    max_distance: float = 0.0           # Distance du point le plus éloigné (m)
+    farthest_point: Optional[Tuple[float, float]] = None
+
+
+def polygon_area(polygon) -> float:
+    """Aire signée d'un polygone (formule du lacet), positive dans le sens trigonométrique"""
+    x, y = polygon[:, 0], polygon[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1)))
+
+
+def marching_squares(xs, ys, values, level) -> List[np.ndarray]:
+    """Polygones fermés de l'isoligne ``level`` d'un champ ``values`` (ny, nx).
+
+    Le champ est bordé de -inf : les zones coupées par le
+    bord de la grille sont refermées le long de celui-ci. Les contours
+    extérieurs tournent dans le sens horaire, les trous dans le sens inverse.
+    """
+    values = np.asarray(values, dtype=float)
+    ny, nx = values.shape[0] + 2, values.shape[1] + 2
+    padded = np.full((ny, nx), -np.inf)
+    padded[1:-1, 1:-1] = values
+    values = padded
+    # Coordonnées de la bordure confondues avec celles du bord : contour sur le bord
+    xs = np.concatenate([[xs[0]], xs, [xs[-1]]]).astype(float)
+    ys = np.concatenate([[ys[0]], ys, [ys[-1]]]).astype(float)
+
+    # Les valeurs NaN comptent comme sous le seuil
+    above = (values >= level).view(np.uint8)
+    cases = (above[:-1, :-1] | (above[:-1, 1:] << 1)
+             | (above[1:, 1:] << 2) | (above[1:, :-1] << 3))
+
+    # Seules les cellules traversées par l'isoligne sont traitées ensuite (cas 1 à 14)
+    i, j = np.nonzero((cases - 1) < 14)
+    if len(i) == 0:
+        return []
+    case = cases[i, j]
+    saddle = (case == 5) | (case == 10)
+    center = (values[i, j] + values[i, j + 1] + values[i + 1, j] + values[i + 1, j + 1]) / 4 >= level
+    case = np.where(saddle & center, np.where(case == 5, 16, 17), case)
+
+    n_horizontal = ny * (nx - 1)
+
+    def edge_ids(code, row, col):
+        # Arêtes horizontales numérotées avant les verticales
+        return np.select(
+            [code == 0, code == 1, code == 2],
+            [row * (nx - 1) + col, n_horizontal + row * nx + col + 1, (row + 1) * (nx - 1) + col],
+            n_horizontal + row * nx + col
+        )
+
+    starts, ends, start_codes, rows, cols = [], [], [], [], []
+    for slot in (0, 1):
+        start_code = SEGMENT_STARTS[case, slot]
+        selected = start_code >= 0
+        row, col, start_code = i[selected], j[selected], start_code[selected]
+        end_code = SEGMENT_ENDS[case[selected], slot]
+        starts.append(edge_ids(start_code, row, col))
+        ends.append(edge_ids(end_code, row, col))
+        start_codes.append(start_code)
+        rows.append(row)
+        cols.append(col)
+    starts, ends = np.concatenate(starts), np.concatenate(ends)
+    start_codes, rows, cols = np.concatenate(start_codes), np.concatenate(rows), np.concatenate(cols)
+
+    # Point d'intersection de l'arête de départ de chaque segment
+    ends_a = EDGE_ENDS[start_codes, 0]
+    ends_b = EDGE_ENDS[start_codes, 1]
+    row_a, col_a = rows + ends_a[:, 0], cols + ends_a[:, 1]
+    row_b, col_b = rows + ends_b[:, 0], cols + ends_b[:, 1]
+    value_a, value_b = values[row_a, col_a], values[row_b, col_b]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.nan_to_num(np.clip((level - value_a) / (value_b - value_a), 0, 1))
+    points_x = xs[col_a] + t * (xs[col_b] - xs[col_a])
+    points_y = ys[row_a] + t * (ys[row_b] - ys[row_a])
+
+    # Chaînage : chaque point d'arête est la fin d'un segment et le début d'un autre
+    position = dict(zip(starts.tolist(), range(len(starts))))
+    following = dict(zip(starts.tolist(), ends.tolist()))
+    polygons = []
+    while following:
+        first, current = following.popitem()
+        chain = [position[first]]
+        while current != first and current in following:
+            chain.append(position[current])
+            current = following.pop(current)
+        polygons.append(np.column_stack([points_x[chain], points_y[chain]]))
+    return polygons
+
+
+def extract_contour(xs, ys, values, level, center=(0.0, 0.0)) -> IsoContour:
+    """Isoligne ``level`` avec surface au-dessus du seuil et distance maximale à ``center``"""
+    polygons = marching_squares(xs, ys, values, level)
+    contour = IsoContour(level=level, polygons=polygons)
+    if not polygons:
+        return contour
+
+    # Extérieurs en sens horaire (aire négative), trous en sens trigonométrique
+    contour.area = max(-sum(polygon_area(p) for p in polygons), 0.0)
+    points = np.concatenate(polygons)
+    distances = np.hypot(points[:, 0] - center[0], points[:, 1] - center[1])
+    index = int(np.argmax(distances))
+    contour.max_distance = float(distances[index])
+    contour.farthest_point = (float(points[index, 0]), float(points[index, 1]))
+    return contour
+
+
+def extract_contours(xs, ys, values, levels: Sequence[float] = (PUBLIC_LIMIT, REFLEX_ZONE_LIMIT),
+                     center=(0.0, 0.0)) -> List[IsoContour]:
+    """Isolignes de plusieurs niveaux (par défaut périmètre public et zone réflexe)"""
+    return [extract_contour(xs, ys, values, level, center) for level in levels]
@@ -1,37 +1,30 @@
 import os
 from datetime import datetime
 from PySide6.QtWidgets import QMessageBox
-from src.config import ISOTOPES_FILE, HISTORY_FILE
+from src.config import HISTORY_FILE
+from src.utils.isotope_catalog import isotope_catalog
 
 def load_isotopes():
-    """Charge les isotopes depuis le fichier texte."""
+    """Charge les isotopes depuis le catalogue partagé."""
     isotopes_data = {}
     try:
-        with open(ISOTOPES_FILE, "r", encoding='utf-8') as f:
-            for line in f:
-                parts = line.strip().split(';')
-                if len(parts) == 9:
-                    try:
-                        name = parts[0]
-                        isotopes_data[name] = {
-                            'activite': float(parts[1]),
-                            'periode': float(parts[2]),
-                            'e1': float(parts[3]),
-                            'e2': float(parts[4]),
-                            'e3': float(parts[5]),
-                            'q1': float(parts[6]),
-                            'q2': float(parts[7]),
-                            'q3': float(parts[8])
-                        }
-                    except ValueError:
-                        QMessageBox.warning(None, "Ligne Malformée", 
-                            f"Ligne malformée ignorée dans isotopes.txt: {line.strip()}")
-                else:
-                    QMessageBox.warning(None, "Ligne Malformée", 
-                        f"Ligne malformée ignorée dans isotopes.txt (nombre incorrect de champs): {line.strip()}")
+        for isotope in isotope_catalog:
+            isotopes_data[isotope.name] = {
+                'activite': isotope.specific_activity,
+                'periode': isotope.half_life,
+                'e1': isotope.energies[0],
+                'e2': isotope.energies[1],
+                'e3': isotope.energies[2],
+                'q1': isotope.intensities[0],
+                'q2': isotope.intensities[1],
+                'q3': isotope.intensities[2]
+            }
+        for _, line, error in isotope_catalog.errors:
+            QMessageBox.warning(None, "Ligne Malformée", 
+                f"Ligne malformée ignorée dans isotopes.txt ({error}): {line}")
     except FileNotFoundError:
         QMessageBox.critical(None, "Fichier Non Trouvé", 
-            f"Base de données isotopes '{ISOTOPES_FILE}' non trouvée.")
+            f"Base de données isotopes '{isotope_catalog.path}' non trouvée.")
     return isotopes_data
 
 def save_to_history(data_list):
@@ -0,0 +1,140 @@
+"""
+Chaînes de décroissance (équations de Bateman) pour EasyCMIR
+Calcule la croissance des descendants (Sr-90/Y-90, Cs-137/Ba-137m,
+Mo-99/Tc-99m...) par décomposition en éléments propres de la matrice de la
+chaîne. La décomposition est mise en cache par chaîne : une nouvelle courbe ne
+coûte qu'un produit matriciel.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+import numpy as np
+from .isotope_catalog import isotope_catalog
+from ..core.ded import DED1M_FACTOR
+
+
+@dataclass(frozen=True)
+class ChainMember:
+    """Membre d'une chaîne de décroissance.
+
+    ``half_life`` (s) et ``gamma_lines`` ((E MeV, I %), ...) remplacent les
+    valeurs du catalogue lorsqu'ils sont renseignés. ``branching`` est la
+    fraction des désintégrations de ce membre qui alimente le suivant.
+    """
+    name: str
+    half_life: Optional[float] = None
+    gamma_lines: Optional[Tuple[Tuple[float, float], ...]] = None
+    branching: float = 1.0
+
+
+# Chaînes connues, indexées par le nom du parent dans isotopes.txt.
+# Pour Cs-137, la raie à 662 keV du catalogue (85.1 %) provient du Ba-137m à
+# l'équilibre : elle est attribuée au descendant (89.9 % par désintégration).
+DECAY_CHAINS = {
+    "Strontium-90": (
+        ChainMember("Strontium-90"),
+        ChainMember("Yttrium-90"),
+    ),
+    "Césium-137": (
+        ChainMember("Césium-137", gamma_lines=(), branching=0.946),
+        ChainMember("Baryum-137m", half_life=153.12, gamma_lines=((0.662, 89.9),)),
+    ),
+    "Molybdène-99": (
+        ChainMember("Molybdène-99", branching=0.876),
+        ChainMember("Technétium-99m"),
+    ),
+}
+
+
+@lru_cache(maxsize=64)
+def chain_decomposition(decay_constants, branchings):
+    """Décomposition M = V diag(-λ) V⁻¹ de la matrice de Bateman d'une chaîne.
+
+    M[i, i] = -λi et M[i+1, i] = bi × λi. Mise en cache par chaîne
+    (constantes de décroissance et rapports d'embranchement).
+    """
+    lam = np.array(decay_constants, dtype=float)
+    if len(set(decay_constants)) != len(decay_constants):
+        raise ValueError("Constantes de décroissance identiques : chaîne non diagonalisable")
+
+    n = len(lam)
+    matrix = np.diag(-lam)
+    for i in range(n - 1):
+        matrix[i + 1, i] = branchings[i] * lam[i]
+
+    # M est triangulaire inférieure : ses valeurs propres sont exactement -λi
+    vectors = np.zeros((n, n))
+    for j in range(n):
+        # Vecteur propre associé à -λj : nul avant j, récurrence ensuite
+        vectors[j, j] = 1.0
+        for i in range(j + 1, n):
+            vectors[i, j] = matrix[i, i - 1] * vectors[i - 1, j] / (lam[i] - lam[j])
+    return vectors, np.linalg.inv(vectors)
+
+
+class DecayChain:
+    """Chaîne de décroissance résolue à partir du catalogue des isotopes"""
+
+    def __init__(self, members):
+        self.members = tuple(members)
+        self.names = [m.name for m in self.members]
+
+        half_lives = []
+        gamma_sums = []
+        for member in self.members:
+            isotope = isotope_catalog.get(member.name)
+            half_life = member.half_life if member.half_life is not None else (
+                isotope.half_life if isotope is not None else None)
+            if not half_life:
+                raise ValueError(f"Période inconnue pour {member.name}")
+            half_lives.append(half_life)
+
+            lines = member.gamma_lines
+            if lines is None:
+                lines = isotope.gamma_lines if isotope is not None else ()
+            gamma_sums.append(sum(e * q for e, q in lines))
+
+        self.half_lives = np.array(half_lives, dtype=float)
+        self.decay_constants = np.log(2) / self.half_lives
+        self.branchings = tuple(m.branching for m in self.members[:-1])
+        # Σ(E × Q%) par membre
+        self.gamma_sums = np.array(gamma_sums, dtype=float)
+        self.catalog_version = isotope_catalog.version
+
+    def activities(self, times_seconds, initial_activities):
+        """Activités (Bq) de tous les membres aux instants demandés.
+
+        ``initial_activities`` est l'activité du parent (scalaire) ou un vecteur
+        d'activités initiales par membre. Retourne un tableau (k, n_membres)
+        pour k instants.
+        """
+        initial = np.zeros(len(self.members))
+        initial_activities = np.atleast_1d(np.asarray(initial_activities, dtype=float))
+        initial[:len(initial_activities)] = initial_activities
+
+        vectors, inverse = chain_decomposition(tuple(self.decay_constants), self.branchings)
+        # Nombres d'atomes initiaux projetés dans la base propre
+        coefficients = inverse @ (initial / self.decay_constants)
+
+        times = np.atleast_1d(np.asarray(times_seconds, dtype=float))
+        exponentials = np.exp(-np.outer(times, self.decay_constants))
+        atoms = (exponentials * coefficients) @ vectors.T
+        return np.clip(atoms, 0, None) * self.decay_constants
+
+    def dose_rate(self, activities):
+        """DED à 1m (mSv/h) à partir des activités des membres, raies des descendants comprises"""
+        return DED1M_FACTOR * np.asarray(activities) @ (self.gamma_sums / 100)
+
+
+_chains = {}
+
+def get_decay_chain(parent_name) -> Optional[DecayChain]:
+    """Retourne la chaîne de décroissance d'un parent, ou None s'il n'en a pas"""
+    members = DECAY_CHAINS.get(parent_name)
+    if members is None:
+        return None
+    chain = _chains.get(parent_name)
+    if chain is None or chain.catalog_version != isotope_catalog.version:
+        chain = _chains[parent_name] = DecayChain(members)
+    return chain
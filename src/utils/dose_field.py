@@ -0,0 +1,137 @@
+"""
+Champ de débit de dose 2D pour EasyCMIR
+Somme, sur une grille (jusqu'à 2000 × 2000 mailles), des contributions en 1/r²
+de plusieurs sources ponctuelles, atténuées par des murs traversés par le
+trajet source → point. Le calcul est découpé en tuiles de taille bornée,
+réparties sur un pool de processus si demandé.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+import numpy as np
+
+# Nombre maximal d'éléments (sources × points) d'un tableau intermédiaire
+TILE_ELEMENTS = 2_000_000
+
+
+@dataclass(frozen=True)
+class PointSource:
+    """Source ponctuelle : position (m) et débit de dose à 1 m (µSv/h)"""
+    x: float
+    y: float
+    dose_rate_1m: float
+    label: str = ""
+
+
+@dataclass(frozen=True)
+class Wall:
+    """Mur assimilé à un segment (m) de transmission donnée (0 à 1)"""
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+    transmission: float
+
+
+def _cross(ax, ay, bx, by):
+    """Produit vectoriel 2D a × b"""
+    return ax * by - ay * bx
+
+
+def _field_tile(task):
+    """Débit de dose (µSv/h) sur une tuile de points.
+
+    ``task`` = (x, y, sources (N, 3), murs (W, 5), distance minimale). Un mur
+    atténue une contribution quand il coupe strictement le segment source → point.
+    """
+    x, y, sources, walls, min_distance = task
+    sx, sy, rate = (sources[:, i:i + 1] for i in range(3))      # (N, 1)
+    px, py = x.ravel()[None, :], y.ravel()[None, :]             # (1, P)
+
+    dx, dy = px - sx, py - sy                                   # (N, P)
+    r2 = np.maximum(dx * dx + dy * dy, min_distance ** 2)
+    contributions = rate / r2
+
+    for x1, y1, x2, y2, transmission in walls:
+        wx, wy = x2 - x1, y2 - y1
+        # Côté du mur où se trouvent la source et le point
+        side_source = _cross(wx, wy, sx - x1, sy - y1)
+        side_point = _cross(wx, wy, px - x1, py - y1)
+        # Côté du trajet où se trouvent les extrémités du mur
+        side_1 = _cross(dx, dy, x1 - sx, y1 - sy)
+        side_2 = _cross(dx, dy, x2 - sx, y2 - sy)
+        crossed = (side_source * side_point < 0) & (side_1 * side_2 < 0)
+        contributions = np.where(crossed, contributions * transmission, contributions)
+
+    return contributions.sum(axis=0).reshape(np.shape(x))
+
+
+def _grid_tile(task):
+    """Tuile de lignes d'une grille : (xs, ys de la tuile, sources, murs, distance minimale)"""
+    xs, ys, sources, walls, min_distance = task
+    x, y = np.meshgrid(xs, ys)
+    return _field_tile((x, y, sources, walls, min_distance))
+
+
+class DoseField:
+    """Scène de sources ponctuelles et de murs évaluée sur des grilles 2D"""
+
+    def __init__(self, sources: Sequence[PointSource], walls: Sequence[Wall] = (), min_distance=0.1):
+        self.sources = list(sources)
+        self.walls = list(walls)
+        # En deçà de cette distance (m), le débit est plafonné (pas de singularité)
+        self.min_distance = min_distance
+        self._source_array = np.array([(s.x, s.y, s.dose_rate_1m) for s in self.sources],
+                                      dtype=float).reshape(-1, 3)
+        self._wall_array = np.array([(w.x1, w.y1, w.x2, w.y2, w.transmission) for w in self.walls],
+                                    dtype=float).reshape(-1, 5)
+
+    def evaluate(self, x, y):
+        """Débit de dose (µSv/h) en des points quelconques (tableaux de même forme)"""
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        return _field_tile((x, y, self._source_array, self._wall_array, self.min_distance))
+
+    def extent(self, margin=0.2, minimum_size=10.0, level=None) -> Tuple[float, float, float, float]:
+        """Emprise (xmin, xmax, ymin, ymax) englobant sources et murs avec une marge relative.
+
+        Avec ``level`` (µSv/h), l'emprise couvre aussi, autour de chaque source,
+        la distance à laquelle son débit seul redescend à ce niveau.
+        """
+        points = [self._source_array[:, :2], self._wall_array[:, 0:2], self._wall_array[:, 2:4]]
+        if level:
+            radius = np.sqrt(np.maximum(self._source_array[:, 2], 0) / level)[:, None]
+            points += [self._source_array[:, :2] - radius, self._source_array[:, :2] + radius]
+        points = np.concatenate(points) if len(self.sources) or len(self.walls) else np.zeros((1, 2))
+        low, high = points.min(axis=0), points.max(axis=0)
+        size = np.maximum((high - low) * (1 + 2 * margin), minimum_size)
+        center = (low + high) / 2
+        return (center[0] - size[0] / 2, center[0] + size[0] / 2,
+                center[1] - size[1] / 2, center[1] + size[1] / 2)
+
+    def grid(self, extent=None, shape=(500, 500), workers=1):
+        """Évalue le champ sur une grille régulière.
+
+        ``extent`` = (xmin, xmax, ymin, ymax) en m (par défaut ``self.extent()``),
+        ``shape`` = (ny, nx). Les lignes de la grille sont traitées par tuiles
+        d'au plus TILE_ELEMENTS couples source × point ; avec ``workers`` > 1 (ou
+        None pour tous les cœurs) les tuiles sont réparties sur un pool de
+        processus. Retourne (xs, ys, débits (ny, nx)).
+        """
+        xmin, xmax, ymin, ymax = extent or self.extent()
+        ny, nx = shape
+        xs = np.linspace(xmin, xmax, nx)
+        ys = np.linspace(ymin, ymax, ny)
+
+        rows_per_tile = max(1, TILE_ELEMENTS // (max(len(self.sources), 1) * nx))
+        tasks = [(xs, ys[start:start + rows_per_tile], self._source_array, self._wall_array, self.min_distance)
+                 for start in range(0, ny, rows_per_tile)]
+
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+                tiles = list(executor.map(_grid_tile, tasks))
+        else:
+            tiles = [_grid_tile(task) for task in tasks]
+        return xs, ys, np.vstack(tiles)
@@ -0,0 +1,54 @@
+"""
+Fonctions de formatage des résultats pour EasyCMIR
+Choix automatique de l'unité d'affichage des activités et débits de dose
+"""
+
+import numpy as np
+
+# Paliers (seuil, facteur, unité) du plus grand au plus petit
+ACTIVITY_STEPS = [
+    (1e12, 1e-12, "TBq"),
+    (1e9, 1e-9, "GBq"),
+    (1e6, 1e-6, "MBq"),
+    (1e3, 1e-3, "kBq"),
+    (0, 1, "Bq")
+]
+
+# Débits de dose exprimés en mSv/h
+DOSE_RATE_STEPS = [
+    (1000, 1e-3, "Sv/h"),
+    (1, 1, "mSv/h"),
+    (0.001, 1e3, "µSv/h"),
+    (0, 1e6, "nSv/h")
+]
+
+
+def _pick_step(value, steps):
+    """Retourne le palier (facteur, unité) adapté à la valeur"""
+    for threshold, factor, unit in steps:
+        if value >= threshold:
+            return factor, unit
+    # Valeurs négatives : plus petit palier
+    return steps[-1][1], steps[-1][2]
+
+
+def activity_unit(activity_bq):
+    """Facteur et unité adaptés à une activité en Bq (ou au maximum d'un tableau)"""
+    return _pick_step(float(np.max(activity_bq)), ACTIVITY_STEPS)
+
+
+def dose_rate_unit(dose_rate_msvh):
+    """Facteur et unité adaptés à un débit de dose en mSv/h (ou au maximum d'un tableau)"""
+    return _pick_step(float(np.max(dose_rate_msvh)), DOSE_RATE_STEPS)
+
+
+def format_activity(activity_bq, decimals=1):
+    """Formate une activité en Bq avec l'unité appropriée (ex: "12.3 GBq")"""
+    factor, unit = activity_unit(activity_bq)
+    return f"{activity_bq * factor:.{decimals}f} {unit}"
+
+
+def format_dose_rate(dose_rate_msvh, decimals=1):
+    """Formate un débit de dose en mSv/h avec l'unité appropriée (ex: "2.5 µSv/h")"""
+    factor, unit = dose_rate_unit(dose_rate_msvh)
+    return f"{dose_rate_msvh * factor:.{decimals}f} {unit}"
@@ -0,0 +1,229 @@
+"""
+Catalogue des isotopes pour EasyCMIR
+Analyse le fichier isotopes.txt une seule fois et garde les données en mémoire.
+Le fichier n'est relu que si sa date de modification ou sa taille change.
+"""
+
+import os
+import time
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from .config_manager import config_manager
+from ..core.library import IsotopeTable
+
+# Libellés des types d'usage (dernier champ de chaque ligne : ",Med", ",Ind", ",Mil")
+USAGE_LABELS = {
+    "Med": "Médical",
+    "Ind": "Industriel",
+    "Mil": "Militaire"
+}
+
+
+@dataclass(frozen=True)
+class Isotope:
+    """Données d'un isotope telles que décrites dans isotopes.txt"""
+    name: str
+    specific_activity: float            # Activité spécifique (Bq/g)
+    half_life: float                    # Période (s)
+    energies: Tuple[float, float, float]     # Énergies gamma E1..E3 (MeV)
+    intensities: Tuple[float, float, float]  # Intensités Q1..Q3 (%)
+    usage: str                          # "Med", "Ind", "Mil" ou "N/A"
+    element: str                        # Nom de l'élément (ex: "Cobalt")
+
+    @property
+    def usage_label(self) -> str:
+        """Libellé du type d'usage"""
+        return USAGE_LABELS.get(self.usage, "Non spécifié")
+
+    @property
+    def gamma_lines(self) -> List[Tuple[float, float]]:
+        """Raies gamma exploitables (énergie en MeV, intensité en %)"""
+        return [(e, q) for e, q in zip(self.energies, self.intensities) if e > 0 and q > 0]
+
+    def as_list(self) -> list:
+        """Retourne les valeurs au format historique [A, T, E1, E2, E3, Q1, Q2, Q3, usage]"""
+        return [self.specific_activity, self.half_life, *self.energies, *self.intensities, self.usage]
+
+
+def element_of(isotope_name: str) -> str:
+    """Extrait le nom de l'élément d'un nom d'isotope (avant le tiret ou la parenthèse)"""
+    return isotope_name.split('-')[0].split('(')[0].strip()
+
+
+def parse_isotope_line(line: str) -> Optional[Isotope]:
+    """Analyse une ligne de isotopes.txt.
+
+    Retourne None pour les lignes vides ou de commentaire, lève ValueError
+    pour les lignes malformées.
+    """
+    line = line.strip()
+    if not line or line.startswith('//') or line.startswith('#'):
+        return None
+
+    parts = line.split(';')
+    if len(parts) < 9:
+        raise ValueError(f"nombre incorrect de champs ({len(parts)})")
+
+    # Le dernier champ contient Q3 suivi du type d'usage : "0.0,Med"
+    q3_field, _, usage = parts[8].partition(',')
+    values = [float(x) for x in parts[1:8]] + [float(q3_field)]
+
+    name = parts[0].strip()
+    return Isotope(
+        name=name,
+        specific_activity=values[0],
+        half_life=values[1],
+        energies=tuple(values[2:5]),
+        intensities=tuple(values[5:8]),
+        usage=usage.strip() or "N/A",
+        element=element_of(name)
+    )
+
+
+class IsotopeCatalog:
+    """Catalogue partagé des isotopes avec cache en mémoire invalidé par mtime/taille"""
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 1.0):
+        # Si aucun chemin n'est imposé, on suit celui de la configuration
+        self._fixed_path = path
+        # Délai minimal (s) entre deux vérifications du fichier sur le disque
+        self.check_interval = check_interval
+
+        self._lock = threading.RLock()
+        self._signature = None
+        self._last_check = 0.0
+        self._loaded_path = None
+
+        self._records: Dict[str, Isotope] = {}
+        self._by_element: Dict[str, List[Isotope]] = {}
+        self._by_usage: Dict[str, List[Isotope]] = {}
+
+        # Lignes ignorées lors du dernier chargement : [(numéro, ligne, erreur)]
+        self.errors: List[Tuple[int, str, str]] = []
+        # Incrémenté à chaque rechargement, permet d'invalider les caches dérivés
+        self.version = 0
+        # Table en colonnes et version du catalogue dont elle est issue
+        self._table = None
+        self._table_version = None
+
+    @property
+    def path(self) -> str:
+        """Chemin du fichier isotopes utilisé"""
+        return self._fixed_path or config_manager.get_isotopes_path()
+
+    def _refresh(self):
+        """Recharge le fichier si nécessaire (changement de chemin, mtime ou taille)"""
+        path = self.path
+        now = time.monotonic()
+        if (path == self._loaded_path and self._signature is not None
+                and now - self._last_check < self.check_interval):
+            return
+
+        with self._lock:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # On continue à servir les données en cache si le fichier disparaît
+                if path == self._loaded_path and self._signature is not None:
+                    self._last_check = now
+                    return
+                raise FileNotFoundError(f"Fichier isotopes non trouvé : {path}")
+
+            signature = (stat.st_mtime_ns, stat.st_size)
+            if path != self._loaded_path or signature != self._signature:
+                self._load(path)
+                self._signature = signature
+                self._loaded_path = path
+            self._last_check = now
+
+    def _load(self, path: str):
+        """Analyse complète du fichier et reconstruction des index"""
+        records = {}
+        by_element = {}
+        by_usage = {}
+        errors = []
+
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, start=1):
+                try:
+                    isotope = parse_isotope_line(line)
+                except ValueError as e:
+                    errors.append((line_number, line.strip(), str(e)))
+                    continue
+                if isotope is None:
+                    continue
+
+                records[isotope.name] = isotope
+                by_element.setdefault(isotope.element.casefold(), []).append(isotope)
+                by_usage.setdefault(isotope.usage, []).append(isotope)
+
+        self._records = records
+        self._by_element = by_element
+        self._by_usage = by_usage
+        self.errors = errors
+        self.version += 1
+
+        for line_number, line, error in errors:
+            print(f"Ligne {line_number} ignorée dans isotopes.txt ({error}): {line}")
+
+    def reload(self):
+        """Force la relecture du fichier au prochain accès"""
+        with self._lock:
+            self._signature = None
+            self._loaded_path = None
+        self._refresh()
+
+    def get(self, name: str) -> Optional[Isotope]:
+        """Retourne l'isotope par son nom, ou None"""
+        self._refresh()
+        return self._records.get(name)
+
+    def __getitem__(self, name: str) -> Isotope:
+        self._refresh()
+        return self._records[name]
+
+    def __contains__(self, name) -> bool:
+        self._refresh()
+        return name in self._records
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._records)
+
+    def __iter__(self):
+        self._refresh()
+        return iter(list(self._records.values()))
+
+    def names(self) -> List[str]:
+        """Noms des isotopes dans l'ordre du fichier"""
+        self._refresh()
+        return list(self._records.keys())
+
+    def records(self) -> List[Isotope]:
+        """Isotopes dans l'ordre du fichier"""
+        self._refresh()
+        return list(self._records.values())
+
+    def table(self) -> IsotopeTable:
+        """Table en colonnes NumPy, reconstruite si le catalogue a été rechargé"""
+        self._refresh()
+        with self._lock:
+            if self._table is None or self._table_version != self.version:
+                self._table = IsotopeTable(list(self._records.values()))
+                self._table_version = self.version
+            return self._table
+
+    def by_element(self, element: str) -> List[Isotope]:
+        """Isotopes d'un élément (ex: "Iode")"""
+        self._refresh()
+        return list(self._by_element.get(element.strip().casefold(), []))
+
+    def by_usage(self, usage: str) -> List[Isotope]:
+        """Isotopes d'un type d'usage ("Med", "Ind" ou "Mil")"""
+        self._refresh()
+        return list(self._by_usage.get(usage, []))
+
+
+# Instance globale du catalogue des isotopes
+isotope_catalog = IsotopeCatalog()
@@ -0,0 +1,148 @@
+"""
+Localisation d'une source ponctuelle à partir de mesures multiples pour EasyCMIR
+Ajuste conjointement la position de la source et son débit de dose à 1 m sur
+un ensemble de mesures (x, y, débit) par moindres carrés pondérés : recherche
+grossière sur une grille puis affinage de Gauss-Newton, avec intervalles de
+confiance issus de la matrice de covariance.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import numpy as np
+
+# Quantile de la loi normale pour un intervalle de confiance à 95 %
+Z_95 = 1.959964
+
+
+@dataclass
+class LocalizationResult:
+    """Estimation de la source : position (m), débit à 1 m (µSv/h) et incertitudes"""
+    x: float
+    y: float
+    dose_rate_1m: float
+    background: float
+    covariance: np.ndarray              # Covariance des paramètres (x, y, débit à 1 m[, fond])
+    residual_rms: float                 # Écart relatif quadratique moyen mesures / modèle
+    iterations: int
+    converged: bool
+
+    @property
+    def standard_errors(self) -> np.ndarray:
+        """Écarts-types des paramètres"""
+        return np.sqrt(np.clip(np.diag(self.covariance), 0, None))
+
+    def confidence_interval(self, index, z=Z_95) -> Tuple[float, float]:
+        """Intervalle de confiance (95 % par défaut) du paramètre ``index`` (0 = x, 1 = y, 2 = débit)"""
+        value = (self.x, self.y, self.dose_rate_1m, self.background)[index]
+        half_width = z * self.standard_errors[index]
+        return value - half_width, value + half_width
+
+
+def _design(x, y, readings_x, readings_y, height):
+    """Inverse du carré des distances (n,) ou (G, n) et écarts de position"""
+    dx = readings_x - x
+    dy = readings_y - y
+    r2 = np.maximum(dx * dx + dy * dy + height * height, 1e-4)
+    return 1.0 / r2, dx, dy
+
+
+def locate_source(readings_x, readings_y, dose_rates, relative_error=0.1, height=0.0,
+                  fit_background=False, grid_size=100, margin=0.5, max_iterations=50,
+                  tolerance=1e-8) -> Optional[LocalizationResult]:
+    """Localise une source ponctuelle à partir de mesures de débit de dose.
+
+    Modèle : D(xi, yi) = S / ((xi - x)² + (yi - y)² + h²) [+ fond], S étant le
+    débit de dose à 1 m. Chaque mesure est pondérée par son incertitude
+    (``relative_error`` × mesure). Pour chaque nœud d'une grille couvrant les
+    mesures (élargie de ``margin`` × leur étendue), le S optimal est obtenu en
+    forme close ; le meilleur nœud initialise un Gauss-Newton amorti sur
+    (x, y, S[, fond]). Retourne None s'il y a moins de mesures que de paramètres.
+    """
+    readings_x = np.asarray(readings_x, dtype=float)
+    readings_y = np.asarray(readings_y, dtype=float)
+    dose_rates = np.asarray(dose_rates, dtype=float)
+    n_params = 4 if fit_background else 3
+    if len(dose_rates) < n_params:
+        return None
+
+    sigma = np.maximum(relative_error * np.abs(dose_rates), 1e-12)
+    weights = 1.0 / sigma ** 2
+
+    # Recherche grossière : S optimal en forme close pour chaque nœud de la grille
+    span = max(np.ptp(readings_x), np.ptp(readings_y), 1.0)
+    grid_x = np.linspace(readings_x.min() - margin * span, readings_x.max() + margin * span, grid_size)
+    grid_y = np.linspace(readings_y.min() - margin * span, readings_y.max() + margin * span, grid_size)
+    gx, gy = np.meshgrid(grid_x, grid_y)
+    g, _, _ = _design(gx.ravel()[:, None], gy.ravel()[:, None], readings_x, readings_y, height)
+    background = np.min(dose_rates) * 0.5 if fit_background else 0.0
+    signal = dose_rates - background
+    strengths = np.maximum((g * weights) @ signal / ((g * g) @ weights), 0.0)
+    chi2 = ((strengths[:, None] * g - signal) ** 2) @ weights
+    best = int(np.argmin(chi2))
+    params = np.array([gx.ravel()[best], gy.ravel()[best], strengths[best], background][:n_params])
+
+    def residuals_and_jacobian(p):
+        inv_r2, dx, dy = _design(p[0], p[1], readings_x, readings_y, height)
+        model = p[2] * inv_r2 + (p[3] if fit_background else 0.0)
+        jacobian = np.empty((len(dose_rates), n_params))
+        jacobian[:, 0] = 2 * p[2] * dx * inv_r2 ** 2
+        jacobian[:, 1] = 2 * p[2] * dy * inv_r2 ** 2
+        jacobian[:, 2] = inv_r2
+        if fit_background:
+            jacobian[:, 3] = 1.0
+        return (dose_rates - model) / sigma, jacobian / sigma[:, None]
+
+    # Gauss-Newton amorti (Levenberg-Marquardt) : le pas est réduit tant que χ² augmente
+    damping = 1e-3
+    residuals, jacobian = residuals_and_jacobian(params)
+    cost = residuals @ residuals
+    converged = False
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        normal = jacobian.T @ jacobian
+        gradient = jacobian.T @ residuals
+        improved = False
+        while damping < 1e10:
+            try:
+                step = np.linalg.solve(normal + damping * np.diag(np.diag(normal) + 1e-12), gradient)
+            except np.linalg.LinAlgError:
+                damping *= 10
+                continue
+            candidate = params + step
+            candidate[2] = max(candidate[2], 0.0)
+            new_residuals, new_jacobian = residuals_and_jacobian(candidate)
+            new_cost = new_residuals @ new_residuals
+            if new_cost <= cost:
+                improved = True
+                break
+            damping *= 10
+        if not improved:
+            converged = True
+            break
+        relative_change = (cost - new_cost) / max(cost, 1e-300)
+        params, residuals, jacobian, cost = candidate, new_residuals, new_jacobian, new_cost
+        damping = max(damping / 10, 1e-12)
+        if relative_change < tolerance:
+            converged = True
+            break
+
+    # Covariance mise à l'échelle par le χ² réduit (erreur relative estimée sur les données)
+    degrees_of_freedom = max(len(dose_rates) - n_params, 1)
+    scale = cost / degrees_of_freedom
+    try:
+        covariance = np.linalg.inv(jacobian.T @ jacobian) * scale
+    except np.linalg.LinAlgError:
+        covariance = np.full((n_params, n_params), np.nan)
+    if not fit_background:
+        covariance = np.pad(covariance, (0, 1))
+
+    return LocalizationResult(
+        x=float(params[0]),
+        y=float(params[1]),
+        dose_rate_1m=float(params[2]),
+        background=float(params[3]) if fit_background else 0.0,
+        covariance=covariance,
+        residual_rms=float(np.sqrt(cost / len(dose_rates)) * relative_error),
+        iterations=iteration,
+        converged=converged
+    )
@@ -0,0 +1,277 @@
+"""
+Mesures de débit de dose géolocalisées pour EasyCMIR
+Les relevés des équipes de reconnaissance (position en m dans le repère local
+de l'intervention, débit en µSv/h) sont rangés dans un index spatial en
+grille régulière : les points sont triés par maille, et une ligne de mailles
+est une tranche contiguë du tableau trié. Une recherche dans un rayon ne lit
+donc que quelques tranches, et l'interpolation par inverse de la distance
+(IDW) sur un raster est calculée par tuiles, chaque tuile ne voyant que les
+mesures des mailles voisines.
+"""
+
+import csv
+import math
+import os
+from typing import Tuple
+import numpy as np
+
+# Nombre moyen de mesures par maille de l'index
+POINTS_PER_CELL = 4
+# Nombre maximal d'éléments (points du raster × mesures) d'un tableau intermédiaire
+TILE_ELEMENTS = 2_000_000
+# Côté (en points du raster) des tuiles d'interpolation
+RASTER_TILE = 32
+DEFAULT_POWER = 2.0
+CSV_FIELDS = ["x_m", "y_m", "debit_usvh", "heure", "commentaire"]
+
+
+def measurements_path(intervention_file):
+    """Fichier des mesures terrain associé au fichier historique d'une intervention"""
+    return os.path.splitext(intervention_file)[0] + "_mesures.csv"
+
+
+class GridIndex:
+    """Index spatial en grille régulière (mailles carrées de côté ``cell_size``)"""
+
+    def __init__(self, x, y, cell_size=None):
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        n = self.x.size
+        if n:
+            self.xmin, self.ymin = float(self.x.min()), float(self.y.min())
+            width = float(self.x.max()) - self.xmin
+            height = float(self.y.max()) - self.ymin
+        else:
+            self.xmin = self.ymin = width = height = 0.0
+        if cell_size is None:
+            # Environ POINTS_PER_CELL mesures par maille pour une répartition uniforme
+            area = max(width, 1.0) * max(height, 1.0)
+            cell_size = math.sqrt(area * POINTS_PER_CELL / max(n, 1))
+        self.cell_size = float(cell_size)
+        self.nx = int(width // self.cell_size) + 1
+        self.ny = int(height // self.cell_size) + 1
+
+        cell_x = np.clip(((self.x - self.xmin) // self.cell_size).astype(int), 0, self.nx - 1)
+        cell_y = np.clip(((self.y - self.ymin) // self.cell_size).astype(int), 0, self.ny - 1)
+        cells = cell_y * self.nx + cell_x
+        self.order = np.argsort(cells, kind="stable")
+        # Mesures de la maille c : order[starts[c]:starts[c + 1]]
+        self.starts = np.searchsorted(cells[self.order], np.arange(self.nx * self.ny + 1)).tolist()
+        self.sorted_x = self.x[self.order]
+        self.sorted_y = self.y[self.order]
+
+    def _box_slices(self, xmin, xmax, ymin, ymax):
+        """Tranches du tableau trié couvrant les mailles du rectangle (une par ligne de mailles)"""
+        # Arithmétique scalaire : une requête ponctuelle ne crée aucun tableau intermédiaire
+        ix0 = max(int((xmin - self.xmin) // self.cell_size), 0)
+        ix1 = min(int((xmax - self.xmin) // self.cell_size), self.nx - 1)
+        iy0 = max(int((ymin - self.ymin) // self.cell_size), 0)
+        iy1 = min(int((ymax - self.ymin) // self.cell_size), self.ny - 1)
+        if ix0 > ix1 or iy0 > iy1:
+            return []
+        starts = self.starts
+        return [(starts[row + ix0], starts[row + ix1 + 1])
+                for row in range(iy0 * self.nx, iy1 * self.nx + 1, self.nx)]
+
+    def candidates(self, xmin, xmax, ymin, ymax):
+        """Positions (dans le tableau trié) des mesures des mailles touchant le rectangle"""
+        slices = self._box_slices(xmin, xmax, ymin, ymax)
+        if not slices:
+            return np.zeros(0, dtype=int)
+        return np.concatenate([np.arange(start, end) for start, end in slices])
+
+    def within(self, x, y, radius):
+        """Indices des mesures à moins de ``radius`` (m) du point (x, y)"""
+        positions = self.candidates(x - radius, x + radius, y - radius, y + radius)
+        dx = self.sorted_x[positions] - x
+        dy = self.sorted_y[positions] - y
+        return self.order[positions[dx * dx + dy * dy <= radius * radius]]
+
+    def nearest(self, x, y, k=1):
+        """Indices et distances des ``k`` mesures les plus proches de (x, y), de la plus proche à la plus lointaine"""
+        k = min(k, self.x.size)
+        if not k:
+            return np.zeros(0, int), np.zeros(0)
+        # Rayon élargi jusqu'à contenir k mesures dont la plus lointaine est dans le cercle exploré
+        radius = self.cell_size
+        diagonal = math.hypot(self.nx, self.ny) * self.cell_size
+        far = math.hypot(x - self.xmin, y - self.ymin) + diagonal
+        while True:
+            positions = self.candidates(x - radius, x + radius, y - radius, y + radius)
+            if positions.size >= k or radius > far:
+                distances = np.hypot(self.sorted_x[positions] - x, self.sorted_y[positions] - y)
+                if positions.size >= k:
+                    closest = np.argpartition(distances, k - 1)[:k]
+                    closest = closest[np.argsort(distances[closest])]
+                    if distances[closest[-1]] <= radius or radius > far:
+                        return self.order[positions[closest]], distances[closest]
+            radius *= 2
+
+
+class MeasurementStore:
+    """Relevés géolocalisés : position (m), débit de dose (µSv/h), heure et commentaire"""
+
+    def __init__(self):
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.dose_rate = np.zeros(0)
+        self.times = []
+        self.comments = []
+        self._index = None
+
+    def __len__(self):
+        return self.x.size
+
+    def add(self, x, y, dose_rate, time="", comment=""):
+        """Ajoute une mesure ou un lot de mesures (tableaux de même longueur)"""
+        x, y, dose_rate = (np.atleast_1d(np.asarray(v, dtype=float)) for v in (x, y, dose_rate))
+        if not (np.isfinite(x).all() and np.isfinite(y).all() and np.isfinite(dose_rate).all()):
+            raise ValueError("Position ou débit non fini")
+        if (dose_rate < 0).any():
+            raise ValueError("Débit de dose négatif")
+        count = x.size
+        self.x = np.concatenate((self.x, x))
+        self.y = np.concatenate((self.y, y))
+        self.dose_rate = np.concatenate((self.dose_rate, dose_rate))
+        self.times += [time] * count if isinstance(time, str) else list(time)
+        self.comments += [comment] * count if isinstance(comment, str) else list(comment)
+        self._index = None
+
+    def remove(self, index):
+        keep = np.ones(len(self), dtype=bool)
+        keep[index] = False
+        self.x, self.y, self.dose_rate = self.x[keep], self.y[keep], self.dose_rate[keep]
+        self.times = [t for t, k in zip(self.times, keep) if k]
+        self.comments = [c for c, k in zip(self.comments, keep) if k]
+        self._index = None
+
+    @property
+    def index(self):
+        """Index spatial, reconstruit après modification des mesures"""
+        if self._index is None:
+            self._index = GridIndex(self.x, self.y)
+        return self._index
+
+    def within(self, x, y, radius):
+        """Indices des mesures à moins de ``radius`` m de (x, y)"""
+        return self.index.within(x, y, radius)
+
+    def max_within(self, x, y, radius):
+        """Mesure maximale (µSv/h) à moins de ``radius`` m de (x, y), et son indice (NaN, -1 si aucune)"""
+        found = self.within(x, y, radius)
+        if not found.size:
+            return math.nan, -1
+        best = found[np.argmax(self.dose_rate[found])]
+        return float(self.dose_rate[best]), int(best)
+
+    def nearest(self, x, y, k=1):
+        """Indices et distances (m) des ``k`` mesures les plus proches"""
+        return self.index.nearest(x, y, k)
+
+    def extent(self, margin=0.1, minimum_size=10.0) -> Tuple[float, float, float, float]:
+        """Emprise (xmin, xmax, ymin, ymax) des mesures avec une marge relative"""
+        if not len(self):
+            return (-minimum_size / 2, minimum_size / 2, -minimum_size / 2, minimum_size / 2)
+        low = np.array([self.x.min(), self.y.min()])
+        high = np.array([self.x.max(), self.y.max()])
+        size = np.maximum((high - low) * (1 + 2 * margin), minimum_size)
+        center = (low + high) / 2
+        return (center[0] - size[0] / 2, center[0] + size[0] / 2,
+                center[1] - size[1] / 2, center[1] + size[1] / 2)
+
+    def default_radius(self):
+        """Rayon d'interpolation par défaut : ~16 mesures voisines pour une répartition uniforme"""
+        return 2.0 * self.index.cell_size
+
+    def idw_grid(self, extent=None, shape=(500, 500), radius=None, power=DEFAULT_POWER):
+        """Interpolation IDW du débit de dose sur une grille régulière.
+
+        Chaque point du raster est la moyenne des mesures à moins de ``radius``
+        m, pondérées par 1/d^``power`` ; il vaut NaN sans mesure dans le rayon
+        (pas d'extrapolation loin des relevés) et la mesure elle-même quand il
+        coïncide avec un relevé. Retourne (xs, ys, débits (ny, nx)).
+        """
+        xmin, xmax, ymin, ymax = extent or self.extent()
+        ny, nx = shape
+        xs = np.linspace(xmin, xmax, nx)
+        ys = np.linspace(ymin, ymax, ny)
+        grid = np.full((ny, nx), np.nan)
+        if not len(self):
+            return xs, ys, grid
+        radius = radius or self.default_radius()
+        index = self.index
+        values = self.dose_rate[index.order]
+
+        for row in range(0, ny, RASTER_TILE):
+            tile_y = ys[row:row + RASTER_TILE]
+            for column in range(0, nx, RASTER_TILE):
+                tile_x = xs[column:column + RASTER_TILE]
+                positions = index.candidates(tile_x[0] - radius, tile_x[-1] + radius,
+                                             tile_y[0] - radius, tile_y[-1] + radius)
+                if not positions.size:
+                    continue
+                grid[row:row + tile_y.size, column:column + tile_x.size] = _idw_tile(
+                    tile_x, tile_y, index.sorted_x[positions], index.sorted_y[positions],
+                    values[positions], radius, power)
+        return xs, ys, grid
+
+
+def _idw_tile(xs, ys, px, py, values, radius, power):
+    """IDW sur une tuile (ny, nx) à partir des mesures candidates, par blocs bornés"""
+    X, Y = np.meshgrid(xs, ys)
+    X, Y = X.ravel(), Y.ravel()
+    result = np.full(X.size, np.nan)
+    step = max(1, TILE_ELEMENTS // px.size)
+    for start in range(0, X.size, step):
+        dx = X[start:start + step, None] - px
+        dy = Y[start:start + step, None] - py
+        d2 = dx * dx + dy * dy
+        with np.errstate(divide="ignore"):
+            # 1/d² évite une puissance flottante pour l'exposant usuel
+            weights = 1.0 / d2 if power == 2 else d2 ** (-power / 2)
+        weights[d2 > radius * radius] = 0.0
+        # Point confondu avec une mesure : la mesure est reprise telle quelle
+        exact = np.isinf(weights)
+        if exact.any():
+            weights = np.where(exact.any(axis=1, keepdims=True), exact.astype(float), weights)
+        total = weights.sum(axis=1)
+        with np.errstate(invalid="ignore"):
+            result[start:start + step] = np.where(total > 0, weights @ values / total, np.nan)
+    return result.reshape(ys.size, xs.size)
+
+
+def read_measurements(path):
+    """Lit un fichier de mesures (séparateur ; ou ,) dans un nouveau MeasurementStore.
+
+    Le séparateur est déterminé par la ligne d'en-tête seule : les virgules
+    des commentaires ne comptent pas (fichier de l'application : toujours ;).
+    """
+    store = MeasurementStore()
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        header = f.readline()
+        f.seek(0)
+        delimiter = "," if header.count(",") > header.count(";") else ";"
+        rows = list(csv.DictReader(f, delimiter=delimiter))
+    if not rows:
+        return store
+    missing = [field for field in CSV_FIELDS[:3] if field not in rows[0]]
+    if missing:
+        raise ValueError(f"Colonnes manquantes : {', '.join(missing)}")
+
+    def number(text):
+        return float(text.strip().replace(",", ".")) if delimiter == ";" else float(text)
+
+    store.add([number(row["x_m"]) for row in rows], [number(row["y_m"]) for row in rows],
+              [number(row["debit_usvh"]) for row in rows],
+              [row.get("heure") or "" for row in rows], [row.get("commentaire") or "" for row in rows])
+    return store
+
+
+def write_measurements(store, path):
+    """Enregistre les mesures au format lu par ``read_measurements``"""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(CSV_FIELDS)
+        for x, y, rate, time, comment in zip(store.x, store.y, store.dose_rate, store.times, store.comments):
+            # 10 chiffres significatifs : pas d'arrondi des grandes coordonnées (123456.7 m)
+            writer.writerow([f"{x:.10g}", f"{y:.10g}", f"{rate:.10g}", time, comment])
@@ -0,0 +1,335 @@
+"""
+Enregistrement binaire des interventions pour EasyCMIR
+Chaque mesure de débit de dose et position est ajoutée à la fin d'un fichier
+binaire (``.tlm``) en enregistrements de largeur fixe :
+
+    temps (f8, s epoch) | agent (u2) | type (u1) | valeur (f4) | valeur2 (f4)
+
+    MESURE    valeur = débit (µSv/h), valeur2 = dose du dosimètre (µSv, NaN si absente)
+    POSITION  valeur = x (m), valeur2 = y (m)
+
+Les noms d'agents sont indexés dans un fichier voisin (``.tlm.agents``, JSON).
+Les entrées et sorties, horodatées à l'heure saisie par l'opérateur (souvent
+antidatée), sont écrites dans un autre fichier voisin (``.tlm.events``, une
+ligne JSON par événement) pour ne pas rompre l'ordre du flux binaire :
+
+    ENTREE / SORTIE   dose = dose saisie (µSv)
+
+La lecture projette le fichier avec ``numpy.memmap`` : chaque champ est une
+colonne sans copie, les recherches dans le temps sont dichotomiques et les
+agrégats parcourent le fichier par blocs, sans jamais le charger entier.
+Les enregistrements sont ajoutés dans l'ordre de réception : le temps est
+croissant à l'horloge des dosimètres près (``MAX_CLOCK_SKEW``).
+"""
+
+import bisect
+import json
+import os
+import threading
+import numpy as np
+
+MAGIC = b"EZCMIRTL"
+VERSION = 1
+HEADER_SIZE = 32
+RECORD_DTYPE = np.dtype([
+    ("time", "<f8"),
+    ("agent", "<u2"),
+    ("kind", "u1"),
+    ("value", "<f4"),
+    ("value2", "<f4")
+])
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("version", "<u4"), ("record_size", "<u4"), ("reserved", "V16")])
+
+SAMPLE, ENTRY, EXIT, POSITION = 0, 1, 2, 3
+KIND_NAMES = {SAMPLE: "Mesure", ENTRY: "Entrée", EXIT: "Sortie", POSITION: "Position"}
+
+# Écart d'horloge toléré entre dosimètres (s) pour les recherches dans le temps
+MAX_CLOCK_SKEW = 60.0
+# Au-delà de cet intervalle entre deux mesures (s), l'agent est considéré hors liaison
+MAX_SAMPLE_GAP = 60.0
+# Taille des blocs parcourus par les agrégats (~19 Mo)
+CHUNK_RECORDS = 1_000_000
+# Enregistrements de tête et de queue parcourus pour les bornes temporelles
+EDGE_RECORDS = 4096
+
+
+def recording_path(intervention_file):
+    """Fichier d'enregistrement associé au fichier historique d'une intervention"""
+    return os.path.splitext(intervention_file)[0] + ".tlm"
+
+
+def _agents_path(path):
+    return path + ".agents"
+
+
+def _events_path(path):
+    return path + ".events"
+
+
+class TelemetryRecorder:
+    """Écriture en ajout seul ; utilisable depuis le thread de réception et l'interface"""
+
+    def __init__(self, path):
+        self.path = path
+        self.agents = []
+        self._index = {}
+        self._lock = threading.Lock()
+        if os.path.exists(_agents_path(path)):
+            with open(_agents_path(path), "r", encoding="utf-8") as f:
+                self.agents = json.load(f)
+            self._index = {name: i for i, name in enumerate(self.agents)}
+
+        new_file = not os.path.exists(path) or os.path.getsize(path) < HEADER_SIZE
+        if not new_file:
+            _check_header(path)
+        self.file = open(path, "ab")
+        if new_file:
+            self.file.truncate(0)
+            header = np.zeros(1, dtype=HEADER_DTYPE)
+            header["magic"], header["version"], header["record_size"] = MAGIC, VERSION, RECORD_DTYPE.itemsize
+            self.file.write(header.tobytes())
+        else:
+            # Enregistrement incomplet (arrêt brutal) : on repart d'une frontière d'enregistrement
+            size = os.path.getsize(path)
+            partial = (size - HEADER_SIZE) % RECORD_DTYPE.itemsize
+            if partial:
+                self.file.truncate(size - partial)
+        self.file.flush()
+
+    def _agent_ids(self, names):
+        """Index des agents, en enregistrant les nouveaux noms dans le fichier voisin"""
+        added = False
+        ids = []
+        for name in names:
+            index = self._index.get(name)
+            if index is None:
+                index = self._index[name] = len(self.agents)
+                self.agents.append(name)
+                added = True
+            ids.append(index)
+        if added:
+            temporary = _agents_path(self.path) + ".tmp"
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump(self.agents, f, ensure_ascii=False)
+            os.replace(temporary, _agents_path(self.path))
+        return np.array(ids, dtype=np.uint16)
+
+    def write(self, times, agents, kinds, values, values2=np.nan):
+        """Ajoute un lot d'enregistrements, triés par temps (``agents`` : noms)"""
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        records = np.empty(times.size, dtype=RECORD_DTYPE)
+        with self._lock:
+            if self.file is None:
+                return
+            records["time"] = times
+            records["agent"] = self._agent_ids(agents)
+            records["kind"] = kinds
+            records["value"] = values
+            records["value2"] = values2
+            records = records[np.argsort(records["time"], kind="stable")]
+            self.file.write(records.tobytes())
+            # Visible aussitôt par un rejeu ouvert pendant l'intervention
+            self.file.flush()
+
+    def record_readings(self, agents, times, dose_rates, doses, xs, ys):
+        """Mesures décodées par la télémétrie, et positions lorsqu'elles sont transmises"""
+        located = ~(np.isnan(xs) | np.isnan(ys))
+        if located.any():
+            count = int(np.count_nonzero(located))
+            all_agents = list(agents) + [agent for agent, keep in zip(agents, located) if keep]
+            self.write(
+                np.concatenate((times, times[located])), all_agents,
+                np.concatenate((np.full(len(agents), SAMPLE), np.full(count, POSITION))),
+                np.concatenate((dose_rates, xs[located])), np.concatenate((doses, ys[located]))
+            )
+        else:
+            self.write(times, agents, SAMPLE, dose_rates, doses)
+
+    def record_event(self, kind, agent, time, dose=0.0):
+        """Entrée ou sortie d'un agent (``time`` en s epoch, éventuellement antidaté).
+
+        L'événement va dans le fichier ``.events`` : le flux binaire reste trié
+        par temps pour les recherches dichotomiques.
+        """
+        with self._lock:
+            if self.file is None:
+                return
+            agent_id = int(self._agent_ids([agent])[0])
+            with open(_events_path(self.path), "a", encoding="utf-8") as f:
+                f.write(json.dumps({"temps": float(time), "agent": agent_id, "type": int(kind),
+                                    "dose": float(dose)}) + "\n")
+
+    def close(self):
+        with self._lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+def _check_header(path):
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if header.size != 1 or header["magic"][0] != MAGIC:
+        raise ValueError(f"Fichier d'enregistrement invalide : {path}")
+    if header["record_size"][0] != RECORD_DTYPE.itemsize:
+        raise ValueError(f"Version d'enregistrement non prise en charge : {header['version'][0]}")
+
+
+class TelemetryRecording:
+    """Lecture d'un enregistrement projeté en mémoire"""
+
+    def __init__(self, path):
+        self.path = path
+        self.records = None
+        self._events = None
+        self.refresh()
+
+    def refresh(self):
+        """Reprojette le fichier (utile pendant que l'intervention est encore enregistrée)"""
+        _check_header(self.path)
+        count = (os.path.getsize(self.path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if count:
+            self.records = np.memmap(self.path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+        self._events = None
+        self.agents = []
+        if os.path.exists(_agents_path(self.path)):
+            with open(_agents_path(self.path), "r", encoding="utf-8") as f:
+                self.agents = json.load(f)
+
+    def __len__(self):
+        return len(self.records)
+
+    def time_range(self):
+        """Premier et dernier instants enregistrés, entrées et sorties comprises (s epoch).
+
+        Le flux n'est trié qu'à ``MAX_CLOCK_SKEW`` près : les bornes sont les
+        extrêmes des ``EDGE_RECORDS`` premiers et derniers enregistrements.
+        """
+        bounds = []
+        if len(self.records):
+            times = self.records["time"]
+            bounds += [float(times[:EDGE_RECORDS].min()), float(times[-EDGE_RECORDS:].max())]
+        events = self.events()
+        if events.size:
+            bounds += [float(events["time"][0]), float(events["time"][-1])]
+        if not bounds:
+            return 0.0, 0.0
+        return min(bounds), max(bounds)
+
+    def seek(self, time):
+        """Position du premier enregistrement à l'instant ``time`` (recherche dichotomique)"""
+        # bisect ne lit que ~25 pages du fichier, np.searchsorted copierait la colonne entière
+        return bisect.bisect_left(self.records["time"], time)
+
+    def window(self, start, end):
+        """Enregistrements de l'intervalle [start, end] (copie limitée à la fenêtre)"""
+        first = self.seek(start - MAX_CLOCK_SKEW)
+        last = self.seek(end + MAX_CLOCK_SKEW)
+        records = np.asarray(self.records[first:last])
+        return records[(records["time"] >= start) & (records["time"] <= end)]
+
+    def state_at(self, time, lookback=MAX_SAMPLE_GAP):
+        """Dernière mesure et dernière position de chaque agent à l'instant ``time``.
+
+        Retourne {agent: {"dose_rate", "dose", "x", "y", "time"}} pour les agents
+        mesurés dans les ``lookback`` secondes précédentes.
+        """
+        records = self.window(time - lookback, time)
+        state = {}
+        # Parcours à rebours : le premier enregistrement rencontré est le plus récent
+        for kind in (SAMPLE, POSITION):
+            selected = records[records["kind"] == kind][::-1]
+            agents, first = np.unique(selected["agent"], return_index=True)
+            for agent, index in zip(agents, first):
+                record = selected[index]
+                entry = state.setdefault(self.agents[agent], {
+                    "dose_rate": np.nan, "dose": np.nan, "x": np.nan, "y": np.nan, "time": np.nan
+                })
+                if kind == SAMPLE:
+                    entry.update(dose_rate=float(record["value"]), dose=float(record["value2"]),
+                                 time=float(record["time"]))
+                else:
+                    entry.update(x=float(record["value"]), y=float(record["value2"]))
+        return state
+
+    def chunks(self, size=CHUNK_RECORDS):
+        """Blocs successifs du fichier projeté"""
+        for start in range(0, len(self.records), size):
+            yield self.records[start:start + size]
+
+    def events(self):
+        """Entrées et sorties des agents, dans l'ordre (petit tableau en mémoire, lu une fois)"""
+        if self._events is None:
+            # Les premiers enregistrements gardaient les événements dans le flux binaire
+            selected = [chunk[(chunk["kind"] == ENTRY) | (chunk["kind"] == EXIT)] for chunk in self.chunks()]
+            path = _events_path(self.path)
+            if os.path.exists(path):
+                rows = []
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            event = json.loads(line)
+                            rows.append((event["temps"], event["agent"], event["type"], event["dose"], np.nan))
+                        except (ValueError, KeyError, TypeError):
+                            continue  # Ligne tronquée (arrêt brutal)
+                selected.append(np.array(rows, dtype=RECORD_DTYPE))
+            events = np.concatenate(selected) if selected else np.zeros(0, dtype=RECORD_DTYPE)
+            self._events = events[np.argsort(events["time"], kind="stable")]
+        return self._events
+
+    def engaged_at(self, time):
+        """Agents entrés et non ressortis à l'instant ``time``"""
+        events = self.events()
+        events = events[events["time"] <= time]
+        engaged = set()
+        for record in events:
+            name = self.agents[record["agent"]]
+            if record["kind"] == ENTRY:
+                engaged.add(name)
+            else:
+                engaged.discard(name)
+        return engaged
+
+    def max_dose_rate(self):
+        """Débit de dose maximal (µSv/h) mesuré pour chaque agent"""
+        maxima = np.full(len(self.agents), -np.inf)
+        for chunk in self.chunks():
+            samples = chunk[chunk["kind"] == SAMPLE]
+            np.maximum.at(maxima, samples["agent"], samples["value"])
+        return {name: float(value) for name, value in zip(self.agents, maxima) if np.isfinite(value)}
+
+    def time_above(self, threshold, max_gap=MAX_SAMPLE_GAP):
+        """Durée (s) passée par chaque agent au-dessus de ``threshold`` (µSv/h).
+
+        Chaque mesure vaut jusqu'à la suivante du même agent ; un intervalle
+        plus long que ``max_gap`` (perte de liaison) n'est pas compté.
+        """
+        n_agents = len(self.agents)
+        durations = np.zeros(n_agents)
+        # Dernière mesure de chaque agent dans le bloc précédent
+        carry_time = np.full(n_agents, np.nan)
+        carry_rate = np.zeros(n_agents)
+        for chunk in self.chunks():
+            samples = chunk[chunk["kind"] == SAMPLE]
+            if not samples.size:
+                continue
+            carried = np.flatnonzero(~np.isnan(carry_time))
+            agents = np.concatenate((carried, samples["agent"]))
+            times = np.concatenate((carry_time[carried], samples["time"]))
+            rates = np.concatenate((carry_rate[carried], samples["value"]))
+            # Regroupement par agent en conservant l'ordre chronologique
+            order = np.lexsort((times, agents))
+            agents, times, rates = agents[order], times[order], rates[order]
+
+            gaps = np.diff(times)
+            counted = (agents[1:] == agents[:-1]) & (gaps <= max_gap) & (rates[:-1] > threshold)
+            durations += np.bincount(agents[1:][counted], weights=gaps[counted], minlength=n_agents)
+
+            last = np.flatnonzero(np.append(agents[1:] != agents[:-1], True))
+            carry_time[agents[last]] = times[last]
+            carry_rate[agents[last]] = rates[last]
+        return {name: float(value) for name, value in zip(self.agents, durations)}
+
+    def close(self):
+        self.records = None
@@ -0,0 +1,166 @@
+"""
+Service de calcul local pour EasyCMIR
+Serveur HTTP/JSON (127.0.0.1 par défaut) donnant accès aux calculs du noyau
+sans lancer l'interface : décroissance, DED 1 m, distance, écran, périmètre
+public et TMR. Les connexions persistantes (HTTP/1.1 keep-alive) sont
+servies chacune par un thread ; une requête peut regrouper de nombreux
+calculs, répartis sur un pool de processus au-delà d'un certain volume.
+
+    GET  /sante                 état du service et calculs disponibles
+    GET  /calculs               colonnes de résultat par calcul
+    POST /calcul[?calcul=tmr]   un objet JSON ou une liste d'objets
+"""
+
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from .batch import CALCULATIONS, DEFAULT_CHUNK_SIZE, ERROR_FIELD, RESULT_FIELDS, process_chunk
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Taille maximale d'une requête (octets)
+MAX_BODY_BYTES = 32 * 1024 * 1024
+# En dessous de ce nombre d'enregistrements, le calcul reste dans le thread de la connexion
+PARALLEL_THRESHOLD = 20_000
+
+
+def _calculate_task(task):
+    return process_chunk(*task)
+
+
+def _reject_constant(name):
+    raise ValueError(f"Valeur non admise : {name}")
+
+
+def _finite_float(text):
+    """Nombre JSON fini (les réponses restent du JSON strict)"""
+    value = float(text)
+    if not math.isfinite(value):
+        _reject_constant(text)
+    return value
+
+
+class CalculationServer(ThreadingHTTPServer):
+    """Serveur HTTP de calcul ; ``workers`` > 1 ajoute un pool de processus pour les gros lots"""
+
+    daemon_threads = True
+
+    def __init__(self, address=(DEFAULT_HOST, DEFAULT_PORT), workers=1, chunk_size=DEFAULT_CHUNK_SIZE,
+                 parallel_threshold=PARALLEL_THRESHOLD, verbose=False):
+        self.executor = None
+        super().__init__(address, CalculationHandler)
+        if workers > 1:
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.chunk_size = chunk_size
+        self.parallel_threshold = parallel_threshold
+        self.verbose = verbose
+
+    def calculate(self, records, calculation=None):
+        """Résultats (un dictionnaire par enregistrement), dans l'ordre de ``records``"""
+        if self.executor is None or len(records) < self.parallel_threshold:
+            return process_chunk(records, calculation)
+        tasks = [(records[start:start + self.chunk_size], calculation)
+                 for start in range(0, len(records), self.chunk_size)]
+        results = []
+        for part in self.executor.map(_calculate_task, tasks):
+            results.extend(part)
+        return results
+
+    def server_close(self):
+        super().server_close()
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+
+
+class CalculationHandler(BaseHTTPRequestHandler):
+    """Requêtes JSON du service de calcul"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "EasyCMIR"
+    # Sans TCP_NODELAY, en-têtes et corps envoyés séparément attendent l'acquittement différé (~40 ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload):
+        try:
+            # JSON strict : ni NaN ni Infinity dans les réponses
+            body = json.dumps(payload, ensure_ascii=False, allow_nan=False).encode("utf-8")
+        except (ValueError, RecursionError) as e:
+            status = 500
+            body = json.dumps({ERROR_FIELD: f"Réponse non représentable en JSON : {e}"},
+                              ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        # Pages locales (export web autonome) servies depuis une autre origine
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, {ERROR_FIELD: message})
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        path = urlsplit(self.path).path.rstrip("/")
+        if path == "/sante":
+            self._send(200, {"statut": "ok", "calculs": sorted(CALCULATIONS)})
+        elif path == "/calculs":
+            self._send(200, {name: list(fields) for name, fields in RESULT_FIELDS.items()})
+        else:
+            self._error(404, f"Ressource inconnue : {path or '/'}")
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") != "/calcul":
+            self._error(404, f"Ressource inconnue : {url.path}")
+            return
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self._error(411, "En-tête Content-Length requis")
+            self.close_connection = True
+            return
+        if length < 0:
+            self._error(400, "En-tête Content-Length invalide")
+            self.close_connection = True
+            return
+        if length > MAX_BODY_BYTES:
+            self._error(413, f"Requête trop volumineuse (maximum {MAX_BODY_BYTES} octets)")
+            self.close_connection = True
+            return
+        try:
+            payload = json.loads(self.rfile.read(length), parse_float=_finite_float, parse_constant=_reject_constant)
+        except ValueError as e:
+            self._error(400, f"JSON invalide : {e}")
+            return
+        except RecursionError:
+            self._error(400, "JSON invalide : imbrication trop profonde")
+            return
+        if not isinstance(payload, (dict, list)):
+            self._error(400, "Un objet ou une liste d'objets JSON est attendu")
+            return
+
+        calculation = parse_qs(url.query).get("calcul", [None])[0]
+        records = [payload] if isinstance(payload, dict) else payload
+        try:
+            results = self.server.calculate(records, calculation)
+        except Exception as e:
+            self._error(500, f"Erreur lors du calcul : {e}")
+            return
+        results = [{**record, **result} if isinstance(record, dict) else result
+                   for record, result in zip(records, results)]
+        self._send(200, results[0] if isinstance(payload, dict) else results)
+
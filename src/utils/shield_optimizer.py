@@ -0,0 +1,197 @@
+"""
+Optimisation d'écrans multicouches pour EasyCMIR
+Recherche, parmi les empilements d'une à trois couches de matériaux, celui qui
+atteint une transmission cible à masse surfacique ou épaisseur totale minimale.
+Chaque empilement est évalué en bloc sur sa grille d'épaisseurs ; les
+empilements sont répartis sur un pool de processus quand la grille est grande.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import combinations
+from typing import List, Optional, Tuple
+import numpy as np
+from .attenuation import attenuation_library
+from .buildup import buildup_library
+from ..core.shielding import line_weights, GP_MAX_MFP
+
+OBJECTIVES = ("mass", "thickness")
+
+# Pas (libres parcours moyens) de la table des facteurs d'accumulation d'un empilement
+BUILDUP_STEP = 0.01
+
+# En dessous de ce nombre de combinaisons, le calcul reste dans le processus courant
+PARALLEL_THRESHOLD = 2_000_000
+
+
+@dataclass(frozen=True)
+class Layer:
+    """Matériau candidat et bornes de son épaisseur (cm).
+
+    Une couche présente a une épaisseur non nulle : les empilements sans ce
+    matériau sont essayés séparément.
+    """
+    material: str
+    min_thickness: float = 0.0
+    max_thickness: float = 20.0
+    step: float = 0.5
+
+    def grid(self) -> np.ndarray:
+        """Épaisseurs essayées pour cette couche"""
+        count = int(np.floor((self.max_thickness - self.min_thickness) / self.step + 1e-9)) + 1
+        grid = self.min_thickness + self.step * np.arange(max(count, 1))
+        return grid[grid > 0]
+
+
+@dataclass
+class StackResult:
+    """Meilleur empilement trouvé (le modèle ne dépend pas de l'ordre des couches)"""
+    materials: Tuple[str, ...]
+    thicknesses: Tuple[float, ...]      # cm
+    total_thickness: float              # cm
+    areal_mass: float                   # g/cm²
+    transmission: float                 # Faisceau large
+
+
+def _evaluate_stack(task):
+    """Meilleure combinaison d'épaisseurs pour un empilement donné.
+
+    ``task`` contient les grilles d'épaisseurs, les μ (couche × raie), les
+    masses volumiques, la table log B (libres parcours moyens × raie) de
+    l'empilement, les poids des raies, la transmission cible, l'objectif et la
+    taille des blocs.
+
+    La transmission décroît avec l'épaisseur de la dernière couche et le coût
+    croît avec elle : pour chaque combinaison des couches intérieures, seule la
+    plus petite épaisseur extérieure suffisante est retenue. Elle est trouvée par
+    dichotomie menée en parallèle sur un bloc de combinaisons.
+    Retourne (objectif, épaisseurs, transmission) ou None.
+    """
+    grids, mu, densities, log_buildup, weights, target, objective, chunk_size = task
+    costs = densities if objective == "mass" else np.ones(len(grids))
+    inner_grids, outer_grid = grids[:-1], grids[-1]
+    shape = tuple(len(g) for g in inner_grids)
+    total = int(np.prod(shape))
+    lines = np.arange(len(weights))
+    best = None
+
+    def transmission_at(inner_mfp, outer_index):
+        mfp = inner_mfp + np.multiply.outer(outer_grid[outer_index], mu[-1])
+        # Interpolation linéaire dans la table log B à pas constant
+        position = np.minimum(mfp, GP_MAX_MFP) / BUILDUP_STEP
+        lower = np.minimum(position.astype(int), len(log_buildup) - 2)
+        fraction = position - lower
+        log_b = log_buildup[lower, lines] * (1 - fraction) + log_buildup[lower + 1, lines] * fraction
+        return np.exp(log_b - mfp) @ weights
+
+    for start in range(0, total, chunk_size):
+        if inner_grids:
+            indices = np.unravel_index(np.arange(start, min(start + chunk_size, total)), shape)
+            inner = np.stack([g[i] for g, i in zip(inner_grids, indices)], axis=1)
+        else:
+            inner = np.zeros((1, 0))
+        inner_mfp = inner @ mu[:-1]                                          # (n, raies)
+
+        low = np.zeros(len(inner), dtype=int)
+        high = np.full(len(inner), len(outer_grid) - 1)
+        feasible = transmission_at(inner_mfp, high) <= target
+        while np.any(low < high):
+            middle = (low + high) // 2
+            ok = transmission_at(inner_mfp, middle) <= target
+            high = np.where(ok, middle, high)
+            low = np.where(ok, low, middle + 1)
+        if not feasible.any():
+            continue
+
+        thicknesses = np.column_stack([inner, outer_grid[high]])
+        scores = np.where(feasible, thicknesses @ costs, np.inf)
+        index = int(np.argmin(scores))
+        if best is None or scores[index] < best[0]:
+            transmission = float(transmission_at(inner_mfp[index:index + 1], high[index:index + 1])[0])
+            best = (float(scores[index]), tuple(float(t) for t in thicknesses[index]), transmission)
+    return best
+
+
+def _stack_buildup(tables, line_count):
+    """Table log B (libres parcours moyens × raie) d'un empilement.
+
+    Le facteur d'accumulation de l'empilement est le plus grand de ceux de ses
+    couches, évalués sur le nombre total de libres parcours moyens :
+    approximation conservatrice qui ne dépend pas de l'ordre des couches.
+    """
+    mfp = np.arange(0, GP_MAX_MFP + BUILDUP_STEP / 2, BUILDUP_STEP)
+    grid = np.repeat(mfp[:, None], line_count, axis=1)
+    buildup = np.ones_like(grid)
+    for table in tables:
+        if table is not None:
+            buildup = np.maximum(buildup, table(grid))
+    return np.log(buildup)
+
+
+def optimize_stack(energies, intensities, target_transmission, layers: List[Layer], objective="mass",
+                   max_layers=3, workers=None, chunk_size=20_000) -> Optional[StackResult]:
+    """Empilement de couches atteignant la transmission cible au moindre coût.
+
+    Tous les sous-ensembles (1 à ``max_layers`` couches) des ``layers``
+    candidates sont essayés ; l'ordre des couches est sans effet sur le
+    modèle (voir ``_stack_buildup``), une seule disposition est évaluée. ``objective`` vaut "mass" (masse
+    surfacique Σ ρ·x) ou "thickness" (épaisseur totale). ``workers`` fixe la
+    taille du pool de processus (1 pour tout calculer sur place). Retourne
+    None si aucune combinaison n'atteint la cible.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Objectif inconnu : {objective}")
+    if len({layer.material for layer in layers}) != len(layers):
+        raise ValueError("Un matériau ne peut apparaître qu'une fois dans les couches candidates")
+
+    energies = np.asarray(energies, dtype=float)
+    weights = line_weights(energies, intensities)
+    if target_transmission >= 1 or not weights.any():
+        return StackResult((), (), 0.0, 0.0, 1.0)
+
+    # Données par matériau calculées une seule fois, transmises aux processus
+    data = {}
+    for layer in layers:
+        material = attenuation_library.get(layer.material)
+        if material is None:
+            raise ValueError(f"Matériau inconnu : {layer.material}")
+        # Sous la table G-P, μ et B sont ceux de sa première énergie (majorant)
+        shield_energies = buildup_library.shielding_energies(layer.material, energies)
+        data[layer.material] = (attenuation_library.mu(layer.material, shield_energies), material.density,
+                                buildup_library.table(layer.material, shield_energies), layer.grid())
+
+    stacks = [stack for size in range(1, min(max_layers, len(layers)) + 1)
+              for stack in combinations([layer.material for layer in layers], size)]
+    tasks = []
+    for stack in stacks:
+        mu, densities, buildups, grids = zip(*(data[name] for name in stack))
+        tasks.append((list(grids), np.array(mu), np.array(densities), _stack_buildup(buildups, len(weights)),
+                      weights, target_transmission, objective, chunk_size))
+
+    if any(len(layer.grid()) == 0 for layer in layers):
+        raise ValueError("Bornes d'épaisseur sans valeur strictement positive")
+    grid_size = sum(int(np.prod([len(g) for g in task[0]])) for task in tasks)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and grid_size >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_evaluate_stack, tasks))
+    else:
+        results = [_evaluate_stack(task) for task in tasks]
+
+    best = None
+    for stack, result in zip(stacks, results):
+        if result is not None and (best is None or result[0] < best[1][0]):
+            best = (stack, result)
+    if best is None:
+        return None
+
+    stack, (_, thicknesses, transmission) = best
+    densities = [data[name][1] for name in stack]
+    return StackResult(
+        materials=stack,
+        thicknesses=thicknesses,
+        total_thickness=sum(thicknesses),
+        areal_mass=sum(t * rho for t, rho in zip(thicknesses, densities)),
+        transmission=transmission
+    )
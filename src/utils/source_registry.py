@@ -0,0 +1,224 @@
+"""
+Registre des sources scellées pour EasyCMIR
+Conserve les sources (isotope, activité et date de référence) dans un fichier
+JSON local et calcule la décroissance de toutes les sources en un seul passage
+vectorisé.
+"""
+
+import json
+import os
+import uuid
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Dict, List, Optional
+import numpy as np
+from .config_manager import config_manager
+from .isotope_catalog import isotope_catalog
+
+SECONDS = np.timedelta64(1, 's')
+
+
+@dataclass
+class SealedSource:
+    """Source scellée suivie dans le registre"""
+    isotope: str
+    reference_activity: float           # Activité de référence (Bq)
+    reference_date: str                 # Date de référence ISO (AAAA-MM-JJ[THH:MM:SS])
+    label: str = ""                     # Désignation / numéro de série
+    location: str = ""
+    half_life: Optional[float] = None   # Période (s), sinon celle du catalogue
+    exemption_threshold: Optional[float] = None  # Seuil (Bq), sinon celui du fichier
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+
+
+def load_exemption_thresholds(path=None) -> Dict[str, float]:
+    """Charge les seuils d'exemption (Bq) par isotope depuis le fichier texte"""
+    path = path or config_manager.get_exemption_thresholds_path()
+    thresholds = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('//') or line.startswith('#'):
+                    continue
+                name, _, value = line.partition(';')
+                try:
+                    thresholds[name.strip()] = float(value)
+                except ValueError:
+                    print(f"Seuil d'exemption ignoré: {line}")
+    except FileNotFoundError:
+        print(f"Fichier des seuils d'exemption non trouvé: {path}")
+    return thresholds
+
+
+def to_datetime64(value):
+    """Convertit une date (datetime, chaîne ISO, datetime64 ou tableau) en datetime64[s]"""
+    if isinstance(value, datetime):
+        return np.datetime64(value.replace(tzinfo=None), 's')
+    return np.asarray(value, dtype='datetime64[s]')
+
+
+class SourceRegistry:
+    """Registre persistant des sources scellées avec calcul de décroissance par lot"""
+
+    def __init__(self, path=None):
+        self._fixed_path = path
+        self.sources: List[SealedSource] = []
+        self._columns = None
+        self._thresholds = None
+        self.load()
+
+    @property
+    def path(self):
+        """Chemin du fichier JSON du registre"""
+        return self._fixed_path or config_manager.get_sources_path()
+
+    def load(self):
+        """Charge le registre depuis le fichier JSON"""
+        self.sources = []
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.sources = [SealedSource(**item) for item in json.load(f)]
+        except Exception as e:
+            print(f"Erreur lors du chargement du registre des sources: {e}")
+        self._invalidate()
+
+    def save(self):
+        """Sauvegarde le registre dans le fichier JSON"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump([asdict(s) for s in self.sources], f, indent=2, ensure_ascii=False)
+            return True
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde du registre des sources: {e}")
+            return False
+
+    def _invalidate(self):
+        """Invalide les colonnes NumPy après une modification"""
+        self._columns = None
+
+    def add(self, source: SealedSource) -> SealedSource:
+        """Ajoute une source (la période doit être connue du catalogue ou fournie)"""
+        if source.half_life is None and source.isotope not in isotope_catalog:
+            raise ValueError(f"Isotope inconnu et période non renseignée : {source.isotope}")
+        to_datetime64(source.reference_date)  # Vérifie le format de la date
+        self.sources.append(source)
+        self._invalidate()
+        return source
+
+    def remove(self, source_id: str) -> bool:
+        """Supprime une source par son identifiant"""
+        before = len(self.sources)
+        self.sources = [s for s in self.sources if s.id != source_id]
+        self._invalidate()
+        return len(self.sources) != before
+
+    def get(self, source_id: str) -> Optional[SealedSource]:
+        """Retourne une source par son identifiant"""
+        return next((s for s in self.sources if s.id == source_id), None)
+
+    def __len__(self):
+        return len(self.sources)
+
+    def __iter__(self):
+        return iter(self.sources)
+
+    def _get_columns(self):
+        """Colonnes NumPy (activité, date, λ, seuil) reconstruites à la demande"""
+        if self._columns is not None and self._columns['catalog_version'] == isotope_catalog.version:
+            return self._columns
+
+        if self._thresholds is None:
+            self._thresholds = load_exemption_thresholds()
+
+        half_lives = []
+        thresholds = []
+        for source in self.sources:
+            half_life = source.half_life
+            if half_life is None:
+                isotope = isotope_catalog.get(source.isotope)
+                half_life = isotope.half_life if isotope is not None else 0.0
+            half_lives.append(half_life)
+            threshold = source.exemption_threshold
+            if threshold is None:
+                threshold = self._thresholds.get(source.isotope, np.nan)
+            thresholds.append(threshold)
+
+        half_lives = np.array(half_lives, dtype=float)
+        with np.errstate(divide='ignore'):
+            decay_constant = np.where(half_lives > 0, np.log(2) / half_lives, 0.0)
+
+        self._columns = {
+            'catalog_version': isotope_catalog.version,
+            'ids': np.array([s.id for s in self.sources], dtype=object),
+            'reference_activity': np.array([s.reference_activity for s in self.sources], dtype=float),
+            'reference_date': np.array([s.reference_date for s in self.sources], dtype='datetime64[s]'),
+            'decay_constant': decay_constant,
+            'threshold': np.array(thresholds, dtype=float)
+        }
+        return self._columns
+
+    def activities_at(self, dates=None):
+        """Activité (Bq) de toutes les sources à une ou plusieurs dates.
+
+        Une date unique donne un tableau (n_sources,), un tableau de k dates
+        donne une table (k, n_sources). Sans date, l'instant présent est utilisé.
+        """
+        columns = self._get_columns()
+        dates = to_datetime64(datetime.now() if dates is None else dates)
+        elapsed = (dates[..., None] - columns['reference_date']) / SECONDS
+        return columns['reference_activity'] * np.exp(-columns['decay_constant'] * elapsed)
+
+    def exemption_dates(self):
+        """Date à partir de laquelle chaque source n'excède plus son seuil d'exemption.
+
+        NaT si le seuil est inconnu ou si la source est stable ; la date de
+        référence si la source n'excède déjà pas le seuil. La date est arrondie
+        à la seconde supérieure : ``exempt_by`` la confirme.
+        """
+        columns = self._get_columns()
+        activity = columns['reference_activity']
+        threshold = columns['threshold']
+        lam = columns['decay_constant']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            seconds = np.log(activity / threshold) / lam
+        seconds = np.where(activity <= threshold, 0.0, seconds)
+        valid = np.isfinite(seconds)
+        dates = np.full(len(seconds), np.datetime64('NaT'), dtype='datetime64[s]')
+        dates[valid] = columns['reference_date'][valid] + np.ceil(seconds[valid]).astype('timedelta64[s]')
+        return dates
+
+    def decay_table(self, date=None, projection_date=None):
+        """Table de décroissance de toutes les sources.
+
+        Retourne un tableau structuré : identifiant, activité à la date demandée,
+        activité projetée, seuil d'exemption et indicateur « n'excède pas le
+        seuil » à la date de projection (par défaut la date demandée).
+        """
+        columns = self._get_columns()
+        date = to_datetime64(datetime.now() if date is None else date)
+        projection_date = date if projection_date is None else to_datetime64(projection_date)
+        activities = self.activities_at(np.array([date, projection_date]))
+
+        table = np.empty(len(self.sources), dtype=[
+            ('id', object), ('activity_bq', float), ('projected_activity_bq', float),
+            ('threshold_bq', float), ('exempt', bool)
+        ])
+        table['id'] = columns['ids']
+        table['activity_bq'] = activities[0]
+        table['projected_activity_bq'] = activities[1]
+        table['threshold_bq'] = columns['threshold']
+        table['exempt'] = activities[1] <= columns['threshold']
+        return table
+
+    def exempt_by(self, date) -> List[SealedSource]:
+        """Sources dont l'activité n'excède pas le seuil d'exemption à la date donnée"""
+        columns = self._get_columns()
+        exempt = self.activities_at(date) <= columns['threshold']
+        return [s for s, flag in zip(self.sources, exempt) if flag]
+
+
+# Instance globale du registre des sources
+source_registry = SourceRegistry()
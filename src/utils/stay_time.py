@@ -0,0 +1,88 @@
+"""
+Dose intégrée et durée de séjour pour EasyCMIR
+Intègre en forme close le débit de dose d'une source ponctuelle qui décroît
+(Ḋ(t) = Ḋ1m / d² × e^(-λt)) sur la durée d'un séjour, et inverse la relation
+pour obtenir la durée maximale compatible avec un budget de dose. Toutes les
+fonctions sont vectorisées par broadcasting (agents × positions × durées).
+"""
+
+import numpy as np
+
+SECONDS_PER_HOUR = 3600.0
+
+
+def decay_constant_per_hour(half_life_seconds):
+    """Constante de décroissance λ (h⁻¹) ; 0 pour une période nulle ou infinie (pas de décroissance)"""
+    half_life = np.asarray(half_life_seconds, dtype=float)
+    with np.errstate(divide='ignore'):
+        return np.where((half_life > 0) & np.isfinite(half_life),
+                        np.log(2) * SECONDS_PER_HOUR / half_life, 0.0)
+
+
+def _decay_integral(decay_constant, start, duration):
+    """∫ e^(-λt) dt de ``start`` à ``start + duration`` (h), limite ``duration`` pour λ = 0"""
+    decay_constant, start, duration = np.broadcast_arrays(
+        np.asarray(decay_constant, dtype=float), np.asarray(start, dtype=float),
+        np.asarray(duration, dtype=float))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        decaying = np.exp(-decay_constant * start) * -np.expm1(-decay_constant * duration) / decay_constant
+    return np.where(decay_constant > 0, decaying, duration)
+
+
+def integrated_dose(dose_rate_1m, distance, duration, half_life=0.0, start=0.0):
+    """Dose reçue (unité de ``dose_rate_1m`` × h) pendant un séjour.
+
+    ``dose_rate_1m`` est le débit à 1 m à l'instant 0, ``distance`` en m,
+    ``start`` (début du séjour) et ``duration`` en heures, ``half_life`` en
+    secondes (période du catalogue ; 0 = source sans décroissance).
+    D = Ḋ1m / d² × e^(-λ t0) × (1 - e^(-λT)) / λ.
+    """
+    distance = np.asarray(distance, dtype=float)
+    rate = np.asarray(dose_rate_1m, dtype=float) / (distance * distance)
+    return rate * _decay_integral(decay_constant_per_hour(half_life), start, duration)
+
+
+def max_stay_time(dose_budget, dose_rate_1m, distance, half_life=0.0, start=0.0):
+    """Durée de séjour (h) à partir de ``start`` pour laquelle la dose atteint ``dose_budget``.
+
+    Inverse de ``integrated_dose`` : T = -ln(1 - B λ e^(λ t0) / Ḋ) / λ. Retourne
+    inf quand la décroissance empêche d'atteindre le budget (ou débit nul).
+    """
+    distance = np.asarray(distance, dtype=float)
+    rate = np.asarray(dose_rate_1m, dtype=float) / (distance * distance)
+    budget = np.asarray(dose_budget, dtype=float)
+    decay_constant = decay_constant_per_hour(half_life)
+    start = np.asarray(start, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Fraction de la dose restante jusqu'à extinction (t → ∞) consommée par le budget
+        fraction = budget * decay_constant * np.exp(decay_constant * start) / rate
+        decaying = np.where(fraction < 1, -np.log1p(-np.minimum(fraction, 1)) / decay_constant, np.inf)
+        constant = budget / rate
+    stay = np.where(decay_constant > 0, decaying, constant)
+    return np.where(rate > 0, np.maximum(stay, 0.0), np.inf)
+
+
+def schedule_dose(dose_rate_1m, distances, durations, half_life=0.0, start=0.0):
+    """Dose cumulée par agent sur une suite de postes (distance, durée).
+
+    ``distances`` et ``durations`` (h) sont de forme (..., postes) ; les postes
+    s'enchaînent à partir de ``start`` (h). Retourne les doses par poste
+    (même forme) : leur somme sur le dernier axe est la dose de l'agent.
+    """
+    durations = np.asarray(durations, dtype=float)
+    starts = np.asarray(start, dtype=float)[..., None] + np.cumsum(durations, axis=-1) - durations
+    return integrated_dose(dose_rate_1m, distances, durations, half_life, starts)
+
+
+def rotation_schedule(agent_count, dose_budget, dose_rate_1m, distance, half_life=0.0, start=0.0):
+    """Relève d'agents au même poste, chacun restant jusqu'à son budget de dose.
+
+    L'agent k (0..n-1) sort quand la dose cumulée depuis ``start`` atteint
+    (k + 1) × budget : les instants de relève sont donnés en forme close, sans
+    itération. Retourne (entrées, sorties) en heures ; inf quand le budget ne
+    peut plus être atteint (la relève suivante devient inutile).
+    """
+    cumulative = dose_budget * np.arange(1, agent_count + 1)
+    ends = start + max_stay_time(cumulative, dose_rate_1m, distance, half_life, start)
+    starts = np.concatenate([[start], ends[:-1]])
+    return starts, ends
@@ -0,0 +1,398 @@
+"""
+Télémétrie des dosimètres électroniques pour EasyCMIR
+Reçoit les mesures (débit de dose et dose) émises par les dosimètres des
+agents engagés, via un transport interchangeable : liaison série, datagrammes
+UDP ou fichier suivi en continu (rejeu, essais). Chaque ligne reçue décrit une
+mesure :
+
+    agent;horodatage;débit (µSv/h)[;dose (µSv)[;x (m);y (m)]]
+
+L'horodatage est en secondes (epoch) ou au format ISO 8601 ; la virgule est
+admise comme séparateur décimal. La réception tourne dans un thread dédié ; les
+mesures sont rangées par agent dans des tampons circulaires NumPy de taille
+fixe et la dose intégrée est mise à jour à chaque lot, sans jamais relire
+l'historique. L'interface n'a plus qu'à lire ``TelemetryStore.snapshot()``.
+Un enregistreur (``recording.TelemetryRecorder``) peut être branché sur le
+magasin pour conserver toutes les mesures et positions reçues.
+"""
+
+import math
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+import numpy as np
+
+SECONDS_PER_HOUR = 3600.0
+# 1 h de mesures à 10 Hz par agent
+DEFAULT_CAPACITY = 36_000
+DEFAULT_UDP_PORT = 5005
+DEFAULT_BAUDRATE = 9600
+FIELD_SEPARATOR = ";"
+# Durée maximale d'attente d'un transport avant de rendre la main au thread
+READ_TIMEOUT = 0.1
+
+
+def agent_key(name):
+    """Identifiant normalisé d'un agent (nom saisi ou numéro du dosimètre)"""
+    return " ".join(str(name).split()).casefold()
+
+
+def _timestamp(text):
+    try:
+        return float(text.replace(",", "."))
+    except ValueError:
+        return datetime.fromisoformat(text).timestamp()
+
+
+def _optional_number(fields, index):
+    if len(fields) > index and fields[index]:
+        return float(fields[index].replace(",", "."))
+    return math.nan
+
+
+def parse_reading(line):
+    """Décode une ligne de mesure en (agent, horodatage, débit, dose, x, y).
+
+    La dose et la position valent NaN lorsque le dosimètre ne les transmet pas.
+    Lève ValueError pour une ligne mal formée ou une valeur non finie ou négative.
+    """
+    fields = [field.strip() for field in line.split(FIELD_SEPARATOR)]
+    if len(fields) not in (3, 4, 6) or not fields[0]:
+        raise ValueError(f"Mesure mal formée : {line!r}")
+    timestamp = _timestamp(fields[1])
+    dose_rate = float(fields[2].replace(",", "."))
+    dose = _optional_number(fields, 3)
+    x, y = _optional_number(fields, 4), _optional_number(fields, 5)
+    if not (math.isfinite(timestamp) and math.isfinite(dose_rate)) or dose_rate < 0 or dose < 0:
+        raise ValueError(f"Valeur invalide : {line!r}")
+    if math.isinf(x) or math.isinf(y):
+        raise ValueError(f"Position invalide : {line!r}")
+    return agent_key(fields[0]), timestamp, dose_rate, dose, x, y
+
+
+class AgentTelemetry:
+    """Tampon circulaire des mesures d'un agent et dose intégrée incrémentale.
+
+    ``integrated_dose`` (µSv) intègre le débit par la méthode des trapèzes entre
+    mesures successives ; ``reported_dose`` (µSv) cumule les incréments de la dose
+    transmise par le dosimètre (une remise à zéro de l'appareil repart de la
+    nouvelle valeur). Les mesures plus anciennes que la dernière reçue sont
+    ignorées.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.times = np.zeros(capacity)
+        self.dose_rates = np.zeros(capacity, dtype=np.float32)
+        self.doses = np.full(capacity, np.nan, dtype=np.float32)
+        self.count = 0
+        self.dropped = 0
+        self.integrated_dose = 0.0
+        self.reported_dose = 0.0
+        self.max_dose_rate = 0.0
+        self.last_time = -math.inf
+        self.last_rate = 0.0
+        self.last_reported = math.nan
+
+    def append(self, times, dose_rates, doses):
+        """Ajoute un lot de mesures (tableaux de même longueur)"""
+        times = np.asarray(times, dtype=float)
+        dose_rates = np.asarray(dose_rates, dtype=float)
+        doses = np.asarray(doses, dtype=float)
+
+        # Mesures hors d'ordre : strictement postérieures à toutes les précédentes
+        previous = np.maximum.accumulate(np.concatenate(([self.last_time], times[:-1])))
+        keep = times > previous
+        self.dropped += int(keep.size - np.count_nonzero(keep))
+        if not keep.all():
+            times, dose_rates, doses = times[keep], dose_rates[keep], doses[keep]
+        n = times.size
+        if not n:
+            return
+
+        # Dose intégrée : trapèzes depuis la dernière mesure du lot précédent
+        if math.isfinite(self.last_time):
+            all_times = np.concatenate(([self.last_time], times))
+            all_rates = np.concatenate(([self.last_rate], dose_rates))
+        else:
+            all_times, all_rates = times, dose_rates
+        self.integrated_dose += float(
+            np.dot(all_rates[1:] + all_rates[:-1], np.diff(all_times))) / (2 * SECONDS_PER_HOUR)
+
+        # Dose transmise : somme des incréments, une baisse signale une remise à zéro
+        reported = doses[~np.isnan(doses)]
+        if reported.size:
+            if math.isnan(self.last_reported):
+                current, previous = reported[1:], reported[:-1]
+            else:
+                current, previous = reported, np.concatenate(([self.last_reported], reported[:-1]))
+            steps = current - previous
+            self.reported_dose += float(np.where(steps >= 0, steps, current).sum())
+            self.last_reported = float(reported[-1])
+
+        self.max_dose_rate = max(self.max_dose_rate, float(dose_rates.max()))
+        self.last_time = float(times[-1])
+        self.last_rate = float(dose_rates[-1])
+
+        # Écriture circulaire : seules les ``capacity`` dernières mesures sont conservées
+        if n > self.capacity:
+            times, dose_rates, doses = times[-self.capacity:], dose_rates[-self.capacity:], doses[-self.capacity:]
+        index = (self.count + np.arange(times.size) + (n - times.size)) % self.capacity
+        self.times[index] = times
+        self.dose_rates[index] = dose_rates
+        self.doses[index] = doses
+        self.count += n
+
+    @property
+    def dose(self):
+        """Dose de l'agent (µSv) : celle du dosimètre si transmise, sinon le débit intégré"""
+        return self.reported_dose if not math.isnan(self.last_reported) else self.integrated_dose
+
+    def history(self):
+        """Mesures conservées dans l'ordre chronologique (copies) : temps, débits, doses"""
+        size = min(self.count, self.capacity)
+        order = (self.count - size + np.arange(size)) % self.capacity
+        return self.times[order], self.dose_rates[order], self.doses[order]
+
+
+class TelemetryStore:
+    """Mesures de tous les agents, partagées entre le thread de réception et l'interface"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, recorder=None):
+        self.capacity = capacity
+        self.agents = {}
+        self.rejected = 0
+        self.recorder = recorder
+        self._lock = threading.Lock()
+
+    def ingest_lines(self, lines):
+        """Décode et range un lot de lignes ; retourne le nombre de mesures acceptées"""
+        names = []
+        values = []
+        rejected = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                agent, *reading = parse_reading(line)
+            except ValueError:
+                rejected += 1
+                continue
+            names.append(agent)
+            values.append(reading)
+        if not values:
+            with self._lock:
+                self.rejected += rejected
+            return 0
+
+        # Colonnes : temps, débit, dose, x, y
+        columns = np.array(values, dtype=float)
+        grouped = {}
+        for row, agent in enumerate(names):
+            grouped.setdefault(agent, []).append(row)
+
+        with self._lock:
+            self.rejected += rejected
+            for agent, rows in grouped.items():
+                telemetry = self.agents.get(agent)
+                if telemetry is None:
+                    telemetry = self.agents[agent] = AgentTelemetry(self.capacity)
+                selected = columns[rows]
+                telemetry.append(selected[:, 0], selected[:, 1], selected[:, 2])
+
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record_readings(names, *columns.T)
+        return len(values)
+
+    def snapshot(self):
+        """Résumé par agent : débit courant et maximal (µSv/h), dose (µSv), dernière mesure"""
+        with self._lock:
+            return {
+                agent: {
+                    "dose_rate": telemetry.last_rate,
+                    "max_dose_rate": telemetry.max_dose_rate,
+                    "dose": telemetry.dose,
+                    "last_time": telemetry.last_time,
+                    "count": telemetry.count
+                }
+                for agent, telemetry in self.agents.items()
+            }
+
+    def history(self, agent):
+        """Mesures conservées pour un agent (tableaux vides s'il est inconnu)"""
+        with self._lock:
+            telemetry = self.agents.get(agent_key(agent))
+            if telemetry is None:
+                return np.zeros(0), np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+            return telemetry.history()
+
+    def clear(self):
+        with self._lock:
+            self.agents.clear()
+            self.rejected = 0
+
+
+class Transport:
+    """Source de lignes de mesure ; les sous-classes fournissent ``_receive``"""
+
+    def __init__(self):
+        self._pending = b""
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def _receive(self, timeout):
+        """Octets disponibles, en attendant au plus ``timeout`` secondes"""
+        raise NotImplementedError
+
+    def read(self, timeout=READ_TIMEOUT):
+        """Lignes complètes reçues (une ligne incomplète attend la suite)"""
+        data = self._receive(timeout)
+        if not data:
+            return []
+        *lines, self._pending = (self._pending + data).split(b"\n")
+        return [line.decode("utf-8", errors="replace") for line in lines]
+
+
+class UdpTransport(Transport):
+    """Datagrammes UDP, chacun portant une ou plusieurs lignes de mesure"""
+
+    def __init__(self, port=DEFAULT_UDP_PORT, host="0.0.0.0"):
+        super().__init__()
+        self.address = (host, port)
+        self.sock = None
+
+    def open(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Tampon de réception large : 50 agents à 10 Hz sans perte si le thread est en retard
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self.sock.bind(self.address)
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def _receive(self, timeout):
+        self.sock.settimeout(timeout)
+        try:
+            chunks = [self.sock.recv(65535)]
+        except socket.timeout:
+            return b""
+        # Vider sans attendre les datagrammes déjà arrivés
+        self.sock.setblocking(False)
+        try:
+            while True:
+                chunks.append(self.sock.recv(65535))
+        except BlockingIOError:
+            pass
+        # Un datagramme est une mesure complète, même sans fin de ligne
+        return b"".join(chunk if chunk.endswith(b"\n") else chunk + b"\n" for chunk in chunks)
+
+
+class SerialTransport(Transport):
+    """Liaison série (port COM du récepteur des dosimètres), via pyserial"""
+
+    def __init__(self, port, baudrate=DEFAULT_BAUDRATE):
+        super().__init__()
+        self.port = port
+        self.baudrate = baudrate
+        self.serial = None
+
+    def open(self):
+        try:
+            import serial
+        except ImportError:
+            raise RuntimeError("Le module pyserial est requis pour la liaison série (pip install pyserial)")
+        self.serial = serial.Serial(self.port, self.baudrate, timeout=READ_TIMEOUT)
+
+    def close(self):
+        if self.serial is not None:
+            self.serial.close()
+            self.serial = None
+
+    def _receive(self, timeout):
+        self.serial.timeout = timeout
+        return self.serial.read(max(self.serial.in_waiting, 1))
+
+
+class FileTransport(Transport):
+    """Fichier de mesures lu depuis le début puis suivi au fil de son écriture"""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.file = None
+
+    def open(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Fichier de mesures introuvable : {self.path}")
+        self.file = open(self.path, "rb")
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _receive(self, timeout):
+        data = self.file.read()
+        if not data:
+            time.sleep(timeout)
+        return data
+
+
+def create_transport(kind, target):
+    """Transport à partir du choix de l'interface : "UDP" (port), "Série" (port COM) ou "Fichier" (chemin)"""
+    if kind == "UDP":
+        return UdpTransport(int(target) if str(target).strip() else DEFAULT_UDP_PORT)
+    if kind == "Série":
+        return SerialTransport(target)
+    if kind == "Fichier":
+        return FileTransport(target)
+    raise ValueError(f"Transport inconnu : {kind}")
+
+
+class TelemetryReceiver:
+    """Thread de réception : lit le transport par lots et alimente le magasin de mesures"""
+
+    def __init__(self, transport, store):
+        self.transport = transport
+        self.store = store
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Ouvre le transport (les erreurs d'ouverture remontent à l'appelant) et lance le thread"""
+        self.transport.open()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetrie", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while not self._stop.is_set():
+                lines = self.transport.read(READ_TIMEOUT)
+                if lines:
+                    self.store.ingest_lines(lines)
+        except OSError as e:
+            # Conservée pour l'interface, qui l'affiche au prochain rafraîchissement
+            self.error = e
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2 * READ_TIMEOUT + 1)
+            self._thread = None
+        self.transport.close()